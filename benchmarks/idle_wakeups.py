@@ -0,0 +1,113 @@
+"""Verifica que a toolbar parada não acorda a CPU além de um limite.
+
+Abre a toolbar sem janela visível, espera a inicialização assentar e conta
+os despertares do laço de eventos, os timers, as pinturas e as trocas de
+estilo. Termina com código 1 se passar do limite de despertares por minuto.
+
+A espera padrão cobre a primeira pré-leitura (10 s) e o QPixmapCache do Qt,
+que envelhece as pixmaps da inicialização a cada 10-30 s por cerca de dois
+minutos e depois para.
+
+Uso:
+    QT_QPA_PLATFORM=offscreen python benchmarks/idle_wakeups.py [--settle 150] [--seconds 60] [--budget 2]
+"""
+import os
+import sys
+import json
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5 import QtWidgets, QtCore  # noqa: E402
+from floating_toolbar import FloatingToolbar  # noqa: E402
+from wakeup_audit import WakeupAuditor  # noqa: E402
+
+STOP_TIMER = "fimDaEspera"  # timer do próprio script, descontado do relatório
+# Despertares do próprio script em cada espera: a entrada no laço e o timer de parada
+HARNESS_WAKEUPS = 2
+
+
+def make_config():
+    """Configuração típica: alguns atalhos diretos e categorias com menus"""
+    return {
+        "quick_shortcuts": [
+            {"name": f"Atalho {i}", "exe": "/bin/true", "args": [], "tooltip": f"Atalho {i}"}
+            for i in range(8)
+        ],
+        "categories": {
+            f"Categoria {i}": [
+                {"name": f"Projeto {j}", "exe": "/bin/true", "args": [f"projeto{j}"]} for j in range(5)
+            ]
+            for i in range(4)
+        },
+        "settings": {
+            "position": "top-left",
+            "autostart": False
+        }
+    }
+
+
+def run_for(seconds):
+    """Roda o laço de eventos (bloqueando de verdade quando não há nada a fazer)"""
+    loop = QtCore.QEventLoop()
+    timer = QtCore.QTimer()
+    timer.setObjectName(STOP_TIMER)
+    timer.setSingleShot(True)
+    timer.timeout.connect(loop.quit)
+    timer.start(int(seconds * 1000))
+    loop.exec_()
+
+
+def audit_idle(settle, seconds):
+    """Abre a toolbar sem janela visível, espera `settle` s e audita `seconds` s parada.
+
+    Retorna o WakeupAuditor, já sem os despertares e o timer do script.
+    Exige uma QApplication criada.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        config_path = os.path.join(work_dir, "toolbar_config.json")
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(make_config(), f)
+
+        toolbar = FloatingToolbar(config_path)
+        toolbar.show()
+        run_for(settle)
+
+        auditor = WakeupAuditor()
+        auditor.start()
+        run_for(seconds)
+        auditor.stop()
+        auditor.wakeups = max(0, auditor.wakeups - HARNESS_WAKEUPS)
+        auditor.timers.pop(f"QTimer#{STOP_TIMER}", None)
+
+        toolbar.icon_pipeline.wait_for_done()
+        toolbar.prefetcher.wait_for_done()
+        if toolbar.launch_history is not None:
+            toolbar.launch_history.close()
+        toolbar.deleteLater()
+    return auditor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--settle", type=float, default=150,
+                        help="segundos de espera antes de auditar (trabalho da inicialização)")
+    parser.add_argument("--seconds", type=float, default=60, help="duração da auditoria")
+    parser.add_argument("--budget", type=float, default=2, help="despertares por minuto permitidos")
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv)  # noqa: F841
+    auditor = audit_idle(args.settle, args.seconds)
+    for line in auditor.report():
+        print(line)
+
+    wakeups = auditor.totals()["wakeups"]
+    if wakeups > args.budget:
+        print(f"FALHOU: {wakeups:.1f} despertares/min com a toolbar parada (limite {args.budget:g})")
+        sys.exit(1)
+    print(f"OK: {wakeups:.1f} despertares/min (limite {args.budget:g})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+"""Mede como os caminhos principais da toolbar escalam com o tamanho da configuração.
+
+Gera configurações sintéticas (de 10 a 10.000 atalhos, de 1 a 500 categorias,
+nos formatos de categoria antigo e novo), mede sem janela visível a leitura
+da configuração, a criação dos botões, a criação de um botão de categoria, a
+abertura do diálogo de configurações e a atualização da lista de categorias,
+e compara com a linha de base gravada.
+
+Uso:
+    QT_QPA_PLATFORM=offscreen python benchmarks/scaling.py                  # compara com a linha de base
+    QT_QPA_PLATFORM=offscreen python benchmarks/scaling.py --save-baseline  # grava uma nova linha de base
+
+A linha de base vale só para a máquina em que foi gravada (sistema, Python e
+Qt): em outra, a comparação é pulada com um aviso, a não ser com --force. Na
+integração contínua, grave uma linha de base em cada executor (--baseline
+com um caminho por executor) em vez de usar a do repositório.
+"""
+import os
+import gc
+import sys
+import json
+import math
+import time
+import platform
+import tempfile
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5 import QtWidgets, QtCore  # noqa: E402
+from floating_toolbar import FloatingToolbar, ConfigDialog  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "scaling.json")
+
+# (atalhos, categorias): metade dos atalhos é direta, a outra metade fica nas categorias
+SIZES = [(10, 1), (100, 10), (1000, 50), (10000, 500)]
+FORMATS = ("list", "dict")
+
+PATHS = ("load_config", "create_toolbar_buttons", "create_category_button",
+         "ConfigDialog.__init__", "update_categories_list")
+
+DEFAULT_REPEAT = 7
+DEFAULT_WARMUP = 1
+# A diferença só conta como regressão acima de NOISE_FACTOR vezes o ruído medido no caso
+NOISE_FACTOR = 3
+
+
+def make_config(shortcuts, categories, category_format):
+    """Configuração sintética com `shortcuts` atalhos e `categories` categorias"""
+    def shortcut(name):
+        return {"name": name, "exe": "/bin/true", "args": ["--projeto", name], "tooltip": name}
+
+    quick_count = shortcuts // 2
+    in_categories = shortcuts - quick_count
+    config = {
+        "quick_shortcuts": [shortcut(f"Atalho {i}") for i in range(quick_count)],
+        "categories": {},
+        "settings": {
+            "position": "top-left",
+            "opacity": 80,
+            "autostart": False,
+            "launch_history": False,
+            "prefetch_top_n": 0
+        }
+    }
+    for i in range(categories):
+        name = f"Categoria {i}"
+        # Distribui o resto dos atalhos por igual entre as categorias
+        count = in_categories // categories + (1 if i < in_categories % categories else 0)
+        items = [shortcut(f"Projeto {i}.{j}") for j in range(count)]
+        if category_format == "dict":
+            config["categories"][name] = {"name": name, "icon": "", "shortcuts": items}
+        else:
+            config["categories"][name] = items
+    return config
+
+
+def case_name(category_format, shortcuts, categories):
+    return f"{category_format}/{shortcuts}x{categories}"
+
+
+def flush(app):
+    """Processa eventos pendentes, inclusive os deleteLater"""
+    app.processEvents()
+    app.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+    app.processEvents()
+
+
+def timed(app, function, repeat, warmup, setup=None, teardown=None):
+    """(mínimo, ruído) em ms de `repeat` execuções, após `warmup` execuções descartadas.
+
+    O mínimo é o tempo menos afetado pela carga da máquina; o ruído é a
+    distância da mediana ao mínimo. Preparo e limpeza ficam fora da medição,
+    e o coletor de lixo fica desligado durante cada execução.
+    """
+    samples = []
+    for index in range(warmup + repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = function()
+            flush(app)
+            elapsed = (time.perf_counter() - start) * 1000
+        finally:
+            gc.enable()
+        if index >= warmup:
+            samples.append(elapsed)
+        if teardown is not None:
+            teardown(result)
+            flush(app)
+    best = min(samples)
+    return best, statistics.median(samples) - best
+
+
+def calibrate(app, repeat, warmup):
+    """Tempo (ms) de uma carga fixa, que não depende do código da toolbar.
+
+    A velocidade da mesma máquina varia com a carga (máquinas virtuais,
+    escala de frequência): a razão entre esta medida agora e a da linha de
+    base corrige os tempos esperados antes da comparação.
+    """
+    config = make_config(1000, 50, "dict")
+
+    def workload():
+        json.loads(json.dumps(config))
+        widget = QtWidgets.QWidget()
+        layout = QtWidgets.QHBoxLayout(widget)
+        for index in range(200):
+            btn = QtWidgets.QPushButton(f"Botão {index}")
+            btn.setToolTip(f"Botão {index}")
+            layout.addWidget(btn)
+        widget.show()
+        return widget
+    return timed(app, workload, repeat, warmup, teardown=lambda widget: widget.deleteLater())[0]
+
+
+def clear_toolbar(toolbar):
+    """Remove todos os botões: a próxima atualização cria tudo do zero"""
+    for item in list(toolbar.shortcut_buttons.values()) + list(toolbar.category_buttons.values()):
+        toolbar.remove_toolbar_item(item)
+    toolbar.shortcut_buttons = {}
+    toolbar.category_buttons = {}
+
+
+def run_case(app, work_dir, shortcuts, categories, category_format, repeat, warmup):
+    """(tempo, ruído) em ms de cada caminho para uma configuração sintética"""
+    config_path = os.path.join(work_dir, f"config_{category_format}_{shortcuts}_{categories}.json")
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(make_config(shortcuts, categories, category_format), f, indent=4)
+
+    toolbar = FloatingToolbar(config_path)
+    toolbar.show()
+    toolbar.icon_pipeline.wait_for_done()
+    flush(app)
+
+    results = {}
+    results["load_config"] = timed(app, toolbar.load_config, repeat, warmup)
+    results["create_toolbar_buttons"] = timed(
+        app, toolbar.create_toolbar_buttons, repeat, warmup,
+        setup=lambda: (clear_toolbar(toolbar), flush(app)))
+
+    # Um botão por categoria, como na criação da toolbar (média por botão)
+    category_keys = list(toolbar.config["categories"])
+
+    def create_buttons():
+        return [toolbar.create_category_button(key) for key in category_keys]
+
+    def delete_buttons(buttons):
+        for btn in buttons:
+            btn.deleteLater()
+    total, noise = timed(app, create_buttons, repeat, warmup, teardown=delete_buttons)
+    results["create_category_button"] = (total / len(category_keys), noise / len(category_keys))
+
+    results["ConfigDialog.__init__"] = timed(
+        app, lambda: ConfigDialog(toolbar.config, toolbar), repeat, warmup,
+        teardown=lambda dialog: dialog.deleteLater())
+
+    dialog = ConfigDialog(toolbar.config, toolbar)
+    results["update_categories_list"] = timed(app, dialog.update_categories_list, repeat, warmup)
+    dialog.deleteLater()
+
+    toolbar.icon_pipeline.wait_for_done()
+    toolbar.launcher.wait_for_done()
+    toolbar.metrics.stop()
+    toolbar.close()
+    toolbar.deleteLater()
+    flush(app)
+    return results
+
+
+def scaling_exponent(cases, path, category_format):
+    """Expoente k de tempo ~ atalhos^k entre o menor e o maior caso (1 = linear)"""
+    points = sorted((case["shortcuts"], case["results"][path][0]) for case in cases
+                    if case["format"] == category_format)
+    (small_n, small_ms), (large_n, large_ms) = points[0], points[-1]
+    if large_n == small_n or small_ms <= 0 or large_ms <= 0:
+        return None
+    return math.log(large_ms / small_ms) / math.log(large_n / small_n)
+
+
+def compare(cases, baseline, tolerance, min_ms, speed=1.0):
+    """Lista de regressões: caminhos mais lentos que a linha de base além da tolerância.
+
+    Além da tolerância relativa, a diferença precisa passar do piso do caso:
+    NOISE_FACTOR vezes o maior ruído medido (na linha de base ou agora), e
+    nunca menos que `min_ms`. `speed` é a razão da calibração (agora / linha
+    de base) e escala os tempos esperados.
+    """
+    regressions = []
+    for case in cases:
+        reference = baseline["cases"].get(case["name"])
+        if reference is None:
+            continue
+        for path, (ms, noise) in case["results"].items():
+            expected = reference.get(path)
+            if expected is None:
+                continue
+            expected_ms = expected["ms"] * speed
+            floor = max(min_ms, NOISE_FACTOR * max(noise, expected["noise"] * speed))
+            if ms > expected_ms * (1 + tolerance) and ms - expected_ms > floor:
+                regressions.append((case["name"], path, expected_ms, ms, floor))
+    return regressions
+
+
+def remeasure(app, case, repeat, warmup):
+    """Segunda rodada de um caso; cada caminho fica com o menor tempo das duas"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = run_case(app, work_dir, case["shortcuts"], case["categories"], case["format"],
+                           repeat, warmup)
+    for path, (ms, noise) in results.items():
+        first_ms, first_noise = case["results"][path]
+        case["results"][path] = (min(ms, first_ms), max(noise, first_noise))
+
+
+def machine():
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "qt": QtCore.QT_VERSION_STR,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=[f"{s}x{c}" for s, c in SIZES],
+                        help="casos no formato ATALHOSxCATEGORIAS (ex. 1000x50)")
+    parser.add_argument("--repeat", type=int,
+                        help=f"execuções medidas por caminho, usa o mínimo (padrão: o da linha de base "
+                             f"ou {DEFAULT_REPEAT})")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP,
+                        help="execuções descartadas antes de medir")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="grava os resultados como linha de base")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="lentidão aceita sobre a linha de base (0.5 = 50%%)")
+    parser.add_argument("--min-ms", type=float, default=0.5,
+                        help="diferença mínima em ms para contar como regressão")
+    parser.add_argument("--force", action="store_true",
+                        help="compara mesmo com linha de base gravada em outra máquina")
+    args = parser.parse_args()
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    # Compara nas mesmas condições em que a linha de base foi gravada
+    if args.repeat is None:
+        args.repeat = baseline["repeat"] if baseline is not None else DEFAULT_REPEAT
+    elif baseline is not None and args.repeat != baseline["repeat"]:
+        print(f"Aviso: linha de base gravada com --repeat {baseline['repeat']}")
+
+    sizes = []
+    for size in args.sizes:
+        shortcuts, categories = (int(value) for value in size.lower().split("x"))
+        sizes.append((shortcuts, max(1, categories)))
+
+    app = QtWidgets.QApplication(sys.argv)
+
+    # Calibração no início e no fim: vale a menor
+    calibration = calibrate(app, args.repeat, args.warmup)
+    cases = []
+    header = f"{'caso':<18}" + "".join(f"{path:>24}" for path in PATHS)
+    print(header)
+    with tempfile.TemporaryDirectory() as work_dir:
+        for category_format in FORMATS:
+            for shortcuts, categories in sizes:
+                results = run_case(app, work_dir, shortcuts, categories, category_format,
+                                   args.repeat, args.warmup)
+                name = case_name(category_format, shortcuts, categories)
+                cases.append({"name": name, "format": category_format, "shortcuts": shortcuts,
+                              "categories": categories, "results": results})
+                print(f"{name:<18}" + "".join(f"{results[path][0]:>21.3f} ms" for path in PATHS))
+
+    calibration = min(calibration, calibrate(app, args.repeat, args.warmup))
+
+    if len(sizes) > 1:
+        print("\nEscala (expoente de tempo ~ atalhos^k; 1 = linear):")
+        for category_format in FORMATS:
+            exponents = [scaling_exponent(cases, path, category_format) for path in PATHS]
+            print(f"{category_format:<18}" + "".join(
+                f"{'-' if k is None else f'{k:.2f}':>24}" for k in exponents))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({"machine": machine(), "repeat": args.repeat, "warmup": args.warmup,
+                       "calibration_ms": round(calibration, 3),
+                       "cases": {case["name"]: {path: {"ms": round(ms, 3), "noise": round(noise, 3)}
+                                                for path, (ms, noise) in case["results"].items()}
+                                 for case in cases}}, f, indent=4)
+        print(f"\nLinha de base gravada em {args.baseline}")
+        return
+
+    if baseline is None:
+        print(f"\nSem linha de base em {args.baseline} (use --save-baseline)")
+        return
+    if baseline.get("machine") != machine():
+        print(f"\nAviso: linha de base gravada em outra máquina ({baseline.get('machine')}; "
+              f"esta: {machine()})")
+        if not args.force:
+            # Tempos de outro hardware não dizem nada sobre regressão
+            print("Comparação pulada: grave uma linha de base nesta máquina com --save-baseline "
+                  "(ou use --force)")
+            return
+
+    speed = calibration / baseline["calibration_ms"]
+    print(f"\nCalibração: {calibration:.3f} ms (linha de base {baseline['calibration_ms']:.3f} ms); "
+          f"tempos esperados multiplicados por {speed:.2f}")
+    regressions = compare(cases, baseline, args.tolerance, args.min_ms, speed)
+    if regressions:
+        # Confirma os casos acusados: uma interferência passageira (outro processo
+        # disputando a CPU) dificilmente se repete nas duas rodadas
+        suspects = {name for name, *_ in regressions}
+        print(f"\nConfirmando {len(suspects)} caso(s) acima da tolerância...")
+        for case in cases:
+            if case["name"] in suspects:
+                remeasure(app, case, args.repeat, args.warmup)
+        regressions = compare(cases, baseline, args.tolerance, args.min_ms, speed)
+    if regressions:
+        print(f"\nREGRESSÃO: {len(regressions)} medição(ões) acima de "
+              f"{args.tolerance:.0%} da linha de base:")
+        for name, path, expected, ms, floor in regressions:
+            print(f"  {name:<18} {path:<24} {expected:>10.3f} ms -> {ms:>10.3f} ms "
+                  f"({ms / expected - 1:+.0%}, piso de ruído {floor:.3f} ms)")
+        sys.exit(1)
+    print(f"\nOK: nenhuma medição acima de {args.tolerance:.0%} da linha de base")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Compara a latência de criação de processos: Popen, posix_spawn direto e o auxiliar.
+
+O auxiliar é iniciado antes de a memória extra ser alocada, como na toolbar
+(onde ele é criado antes de carregar o Qt). Para cada tamanho, o processo
+principal aloca e toca a memória indicada e cria `--runs` processos com cada
+método. Somente POSIX.
+
+Uso:
+    python benchmarks/spawn_helper_vs_popen.py [--rss-mb 0 256 1024] [--runs 50]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spawn_helper  # noqa: E402
+
+COMMAND = "/bin/true"
+
+
+def rss_mb():
+    """Memória residente do processo atual em MB"""
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def time_popen(runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.Popen([COMMAND])
+        times.append(time.perf_counter() - start)
+        process.wait()
+    return times
+
+
+def time_posix_spawn(runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        pid = os.posix_spawn(COMMAND, [COMMAND], os.environ)
+        times.append(time.perf_counter() - start)
+        os.waitpid(pid, 0)
+    return times
+
+
+def time_helper(helper, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = helper.spawn(COMMAND, [])
+        times.append(time.perf_counter() - start)
+        while process.poll() is None:
+            time.sleep(0.005)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rss-mb", type=int, nargs="+", default=[0, 256, 1024])
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    helper = spawn_helper.start()
+    if helper is None:
+        sys.exit("O auxiliar de execução só funciona em sistemas POSIX")
+
+    print(f"{'RSS MB':>8} {'Popen ms':>10} {'posix_spawn ms':>15} {'auxiliar ms':>12}")
+    ballast = []
+    allocated = 0
+    for target in sorted(args.rss_mb):
+        # Bytes não nulos: as páginas são realmente tocadas e entram na RSS
+        ballast.append(b"\x01" * ((target - allocated) * 1024 * 1024))
+        allocated = target
+
+        results = [statistics.median(times) * 1000 for times in (
+            time_popen(args.runs), time_posix_spawn(args.runs), time_helper(helper, args.runs))]
+        print(f"{rss_mb():>8.0f} {results[0]:>10.3f} {results[1]:>15.3f} {results[2]:>12.3f}")
+
+    helper.close()
+
+
+if __name__ == '__main__':
+    main()
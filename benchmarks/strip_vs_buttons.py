@@ -0,0 +1,108 @@
+"""Compara o modo de um QPushButton por atalho com a faixa única desenhada.
+
+Uso:
+    QT_QPA_PLATFORM=offscreen python benchmarks/strip_vs_buttons.py [--sizes 100 1000 5000]
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5 import QtWidgets, QtCore  # noqa: E402
+from floating_toolbar import FloatingToolbar  # noqa: E402
+
+
+def make_config(count, renderer):
+    """Configuração sintética com `count` atalhos diretos e algumas categorias"""
+    return {
+        "quick_shortcuts": [
+            {"name": f"Atalho {i}", "exe": "/bin/true", "args": [], "tooltip": f"Atalho {i}"}
+            for i in range(count)
+        ],
+        "categories": {
+            f"Categoria {i}": [
+                {"name": f"Projeto {j}", "exe": "/bin/true", "args": []} for j in range(10)
+            ]
+            for i in range(5)
+        },
+        "settings": {
+            "position": "top-left",
+            "opacity": 80,
+            "autostart": False,
+            "renderer": renderer
+        }
+    }
+
+
+def flush(app):
+    """Processa eventos pendentes, inclusive os deleteLater"""
+    app.processEvents()
+    app.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+    app.processEvents()
+
+
+def run(app, count, renderer, work_dir):
+    """Mede criação, reconstrução completa e pintura para um modo de renderização"""
+    config_path = os.path.join(work_dir, f"config_{renderer}_{count}.json")
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(make_config(count, renderer), f)
+
+    start = time.perf_counter()
+    toolbar = FloatingToolbar(config_path)
+    toolbar.show()
+    flush(app)
+    create_time = time.perf_counter() - start
+
+    # Todos os atalhos mudam: pior caso para a reconciliação
+    for shortcut in toolbar.config["quick_shortcuts"]:
+        shortcut["tooltip"] += " (editado)"
+    start = time.perf_counter()
+    toolbar.create_toolbar_buttons()
+    flush(app)
+    update_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    toolbar.repaint()
+    paint_time = time.perf_counter() - start
+
+    widgets = len(toolbar.findChildren(QtWidgets.QWidget))
+
+    toolbar.icon_pipeline.wait_for_done()
+    toolbar.close()
+    toolbar.deleteLater()
+    flush(app)
+
+    return {
+        "renderer": renderer,
+        "shortcuts": count,
+        "create_ms": create_time * 1000,
+        "update_all_ms": update_time * 1000,
+        "repaint_ms": paint_time * 1000,
+        "widgets": widgets
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv)
+
+    print(f"{'modo':<8} {'atalhos':>8} {'criação ms':>11} {'atualizar ms':>13} "
+          f"{'pintura ms':>11} {'widgets':>8}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for count in args.sizes:
+            for renderer in ("buttons", "strip"):
+                result = run(app, count, renderer, work_dir)
+                print(f"{result['renderer']:<8} {result['shortcuts']:>8} "
+                      f"{result['create_ms']:>11.1f} {result['update_all_ms']:>13.1f} "
+                      f"{result['repaint_ms']:>11.1f} {result['widgets']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+"""Modelo da configuração editada: atalhos e categorias normalizados uma só vez, com índices.
+
+As categorias aparecem em dois formatos no toolbar_config.json: o antigo
+(a chave é o nome e o valor é a lista de atalhos) e o novo (dicionário com
+nome, ícone e atalhos). O modelo lê os dois, mantém índices do nome exibido
+para a chave e do id para o registro, e grava de volta no formato de
+origem, com a ordem das chaves e as chaves desconhecidas preservadas.
+"""
+import itertools
+
+# Ids só existem em memória (não são gravados no JSON)
+_ids = itertools.count(1)
+
+
+def ordered_json(order, values, extra):
+    """Dicionário JSON com as chaves na ordem original e as novas no fim.
+
+    `values` são os campos conhecidos (None = ausente no JSON); `extra`, as
+    chaves desconhecidas, copiadas como estão.
+    """
+    data = {}
+    for key in order:
+        if key in values:
+            if values[key] is not None:
+                data[key] = values[key]
+        elif key in extra:
+            data[key] = extra[key]
+    for key, value in values.items():
+        if value is not None and key not in data:
+            data[key] = value
+    for key, value in extra.items():
+        if key not in data:
+            data[key] = value
+    return data
+
+
+class Shortcut:
+    """Um atalho (direto ou de categoria); campos ausentes no JSON ficam None"""
+
+    FIELDS = ("name", "exe", "args", "icon", "tooltip", "capture_output")
+    FIELD_SET = frozenset(FIELDS)
+
+    __slots__ = ("id",) + FIELDS + ("extra", "order")
+
+    def __init__(self, name=None, exe=None, args=None, icon=None, tooltip=None, capture_output=None):
+        self.id = next(_ids)
+        self.name = name
+        self.exe = exe
+        self.args = args
+        self.icon = icon
+        self.tooltip = tooltip
+        self.capture_output = capture_output
+        self.extra = {}  # chaves que o modelo não conhece (ex. "order", "env")
+        self.order = ()  # ordem original das chaves
+
+    @classmethod
+    def from_json(cls, data):
+        args = data.get("args")
+        shortcut = cls(data.get("name"), data.get("exe"), list(args) if isinstance(args, list) else args,
+                       data.get("icon"), data.get("tooltip"), data.get("capture_output"))
+        if not data.keys() <= cls.FIELD_SET:
+            shortcut.extra = {key: value for key, value in data.items() if key not in cls.FIELD_SET}
+        shortcut.order = tuple(data)
+        return shortcut
+
+    def to_json(self):
+        values = {field: getattr(self, field) for field in self.FIELDS}
+        if isinstance(values["args"], list):
+            values["args"] = list(values["args"])
+        return ordered_json(self.order, values, self.extra)
+
+    def update(self, **fields):
+        """Aplica os valores de um diálogo de edição; as chaves extras são mantidas.
+
+        Texto vazio ou False em um campo ausente não cria a chave, e
+        capture_output desmarcado remove a chave (só é gravada quando True).
+        """
+        for field, value in fields.items():
+            if field == "capture_output":
+                value = True if value else None
+            elif value == "" and getattr(self, field) is None:
+                continue
+            setattr(self, field, value)
+
+
+class Category:
+    """Uma categoria, em qualquer um dos dois formatos"""
+
+    __slots__ = ("id", "key", "name", "icon", "shortcuts", "legacy", "extra", "order")
+
+    def __init__(self, key, name, icon=None, shortcuts=None, legacy=False):
+        self.id = next(_ids)
+        self.key = key  # chave no JSON (estável: não muda ao renomear)
+        self.name = name  # nome exibido
+        self.icon = icon
+        self.shortcuts = shortcuts if shortcuts is not None else []
+        self.legacy = legacy  # formato antigo: só a lista de atalhos
+        self.extra = {}
+        self.order = ()
+
+    @classmethod
+    def from_json(cls, key, data):
+        if isinstance(data, dict):
+            category = cls(key, data.get("name", key), data.get("icon"),
+                           [Shortcut.from_json(shortcut) for shortcut in data.get("shortcuts", [])])
+            category.extra = {name: value for name, value in data.items()
+                              if name not in ("name", "icon", "shortcuts")}
+            category.order = tuple(data)
+            return category
+        return cls(key, key, shortcuts=[Shortcut.from_json(shortcut) for shortcut in data], legacy=True)
+
+    def to_json(self):
+        shortcuts = [shortcut.to_json() for shortcut in self.shortcuts]
+        if self.legacy:
+            return shortcuts
+        # Nome e lista ausentes no arquivo continuam ausentes enquanto não mudarem
+        name = self.name if "name" in self.order or self.name != self.key else None
+        if not shortcuts and "shortcuts" not in self.order:
+            shortcuts = None
+        return ordered_json(self.order, {"name": name, "icon": self.icon, "shortcuts": shortcuts},
+                            self.extra)
+
+
+class ConfigModel:
+    """Atalhos diretos e categorias da configuração, com índices para as edições.
+
+    `categories` guarda a ordem (chave -> categoria); `by_name` leva do nome
+    exibido à lista de chaves (nomes repetidos são possíveis em arquivos
+    editados à mão) e `by_id` do id a qualquer registro, então localizar,
+    renomear e remover não percorrem as categorias.
+    """
+
+    def __init__(self):
+        self.quick_shortcuts = []
+        self.categories = {}
+        self.by_name = {}
+        self.by_id = {}
+
+    @classmethod
+    def from_config(cls, config):
+        model = cls()
+        for data in config.get("quick_shortcuts", []):
+            shortcut = Shortcut.from_json(data)
+            model.quick_shortcuts.append(shortcut)
+            model.by_id[shortcut.id] = shortcut
+        for key, data in config.get("categories", {}).items():
+            model.index_category(Category.from_json(key, data))
+        return model
+
+    def to_config(self, config):
+        """Cópia de `config` com os atalhos e as categorias do modelo"""
+        result = dict(config)
+        result["quick_shortcuts"] = [shortcut.to_json() for shortcut in self.quick_shortcuts]
+        result["categories"] = {key: category.to_json() for key, category in self.categories.items()}
+        return result
+
+    def index_category(self, category):
+        self.categories[category.key] = category
+        self.by_name.setdefault(category.name, []).append(category.key)
+        self.by_id[category.id] = category
+        for shortcut in category.shortcuts:
+            self.by_id[shortcut.id] = shortcut
+
+    def category_named(self, name):
+        """Categoria com o nome exibido (com nomes repetidos, a primeira indexada)"""
+        keys = self.by_name.get(name)
+        return self.categories[keys[0]] if keys else None
+
+    def unindex_name(self, category):
+        keys = self.by_name[category.name]
+        keys.remove(category.key)
+        if not keys:
+            del self.by_name[category.name]
+
+    def add_quick_shortcut(self, shortcut):
+        self.quick_shortcuts.append(shortcut)
+        self.by_id[shortcut.id] = shortcut
+
+    def remove_quick_shortcut(self, index):
+        shortcut = self.quick_shortcuts.pop(index)
+        self.by_id.pop(shortcut.id, None)
+
+    def move_quick_shortcut(self, index, new_index):
+        """Troca um atalho direto de posição com o vizinho"""
+        shortcuts = self.quick_shortcuts
+        shortcuts[index], shortcuts[new_index] = shortcuts[new_index], shortcuts[index]
+
+    def add_category(self, name, icon=""):
+        """Nova categoria no formato novo; a chave é o nome (ou uma variação livre)"""
+        key = name
+        suffix = 2
+        while key in self.categories:
+            key = f"{name} ({suffix})"
+            suffix += 1
+        category = Category(key, name, icon)
+        category.order = ("name", "icon", "shortcuts")
+        self.index_category(category)
+        return category
+
+    def rename_category(self, category, name, icon):
+        """Renomeia e troca o ícone; categorias no formato antigo passam ao novo.
+
+        A chave não muda: a categoria mantém a posição e o botão da toolbar.
+        """
+        self.unindex_name(category)
+        if category.legacy:
+            category.order = ("name", "icon", "shortcuts")
+        category.name = name
+        # Ícone vazio em uma categoria sem a chave "icon" não cria a chave
+        if icon or category.icon is not None:
+            category.icon = icon
+        category.legacy = False
+        self.by_name.setdefault(name, []).append(category.key)
+
+    def remove_category(self, category):
+        del self.categories[category.key]
+        self.unindex_name(category)
+        self.by_id.pop(category.id, None)
+        for shortcut in category.shortcuts:
+            self.by_id.pop(shortcut.id, None)
+
+    def add_shortcut(self, category, shortcut):
+        category.shortcuts.append(shortcut)
+        self.by_id[shortcut.id] = shortcut
+
+    def remove_shortcut(self, category, index):
+        shortcut = category.shortcuts.pop(index)
+        self.by_id.pop(shortcut.id, None)
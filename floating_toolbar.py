@@ -1,12 +1,44 @@
 import sys
 import os
 import json
-from PyQt5 import QtWidgets, QtCore, QtGui
-import subprocess
+import time
+import spawn_helper
+import tracer
+
+if __name__ == "__main__":
+    # O auxiliar de execução é criado antes de carregar o Qt, com um processo ainda pequeno,
+    # e só quando ativado nas configurações
+    if spawn_helper.enabled_in(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                            'toolbar_config.json')):
+        spawn_helper.start()
+
+from PyQt5 import QtWidgets, QtCore, QtGui, sip
+from icon_cache import IconCache
+from icon_pipeline import IconPipeline
+from launcher import Launcher
+from supervisor import ProcessSupervisor
+from workspace import WorkspaceRun
+from prefetch import UsageStats, Prefetcher
+from process_index import ProcessIndex
+from resource_sampler import ResourceSampler
+from output_console import OutputCapture, OutputConsole
+from launch_history import LaunchHistory
+from config_model import ConfigModel, Shortcut
+from metrics import Metrics, EventLoopLagProbe, resident_memory
+from watchdog import StallWatchdog
+import memory_report
+from shortcut_strip import ShortcutStrip, StripCell
+import themes
+from themes import OpacityFrame
+import pe_icons
 
 
 class FloatingToolbar(QtWidgets.QWidget):
-    def __init__(self):
+    # Nova configuração aplicada pelo diálogo de configurações
+    config_applied = QtCore.pyqtSignal(object)
+
+    @tracer.traced()
+    def __init__(self, config_path=None):
         super().__init__()
 
         # Configurações de janela para ficar sempre visível e sem bordas
@@ -18,9 +50,113 @@ class FloatingToolbar(QtWidgets.QWidget):
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground)
 
         # Carrega configurações
-        self.config_path = os.path.join(os.path.dirname(
+        self.config_path = config_path or os.path.join(os.path.dirname(
             os.path.abspath(__file__)), 'toolbar_config.json')
+        load_start = time.perf_counter()
         self.config = self.load_config()
+        load_time = time.perf_counter() - load_start
+
+        # Métricas OpenMetrics (opcional): aqui só se enfileiram eventos, o servidor roda em outra thread
+        self.metrics = Metrics(self.config["settings"]["metrics_listen"])
+        self.metrics.observe("toolbar_config_load_seconds", load_time)
+
+        # Folha de estilos única (compilada e em cache) do tema, aplicada antes de criar os widgets
+        themes.apply_theme(self.config["settings"]["theme"])
+
+        # Cache persistente dos ícones rasterizados, ao lado do arquivo de configuração
+        self.icon_cache = IconCache(
+            os.path.join(os.path.dirname(self.config_path), 'icon_cache'),
+            self.config["settings"]["icon_cache_mb"] * 1024 * 1024)
+
+        # Ícones pré-rasterizados para o DPR de cada tela, com arquivos decodificados em segundo plano
+        self.icon_pipeline = IconPipeline(self.icon_cache, self)
+        self.icon_pipeline.file_icon_ready.connect(self.on_file_icon_ready)
+        self.icon_pipeline.file_icon_failed.connect(self.on_file_icon_failed)
+        self.pending_icon_buttons = {}  # caminho -> botões aguardando o ícone
+
+        # Agrupa as gravações do índice do cache em uma só
+        self.cache_save_timer = QtCore.QTimer(self)
+        self.cache_save_timer.setSingleShot(True)
+        self.cache_save_timer.setInterval(2000)
+        self.cache_save_timer.timeout.connect(self.icon_cache.save_index)
+        self.metrics.gauge("toolbar_icon_cache_hit_ratio", self.icon_cache.hit_ratio)
+        self.metrics.gauge("toolbar_resident_memory_bytes", resident_memory)
+        if self.metrics.enabled:
+            self.metrics.start()
+            self.lag_probe = EventLoopLagProbe(self.metrics, parent=self)
+            self.lag_probe.start()
+
+        # Vigia de travamentos da interface (opcional): registra a pilha de quem bloqueou o laço de eventos
+        self.stall_watchdog = None
+        if self.config["settings"]["stall_watchdog_ms"] > 0:
+            self.stall_watchdog = StallWatchdog(self.config["settings"]["stall_watchdog_ms"], parent=self)
+            self.stall_watchdog.start()
+
+        # Execução dos atalhos em segundo plano, com o resultado informado por sinais
+        helper = spawn_helper.client() if self.config["settings"]["spawn_helper"] else None
+        self.launcher = Launcher(self.config["settings"]["launch_coalesce_ms"],
+                                 helper.spawn if helper is not None else None, self)
+        self.launcher.launch_failed.connect(self.on_launch_failed)
+
+        # Processos iniciados pela toolbar, recolhidos quando terminam (sem zumbis)
+        self.supervisor = ProcessSupervisor(parent=self)
+        self.launcher.launched.connect(self.on_launched)
+        self.process_dialog = None
+        self.memory_snapshot = None  # Último diagnóstico de memória (base da comparação)
+
+        # Aberturas em lote ("Abrir todos" e espaços de trabalho) em andamento
+        self.workspace_runs = set()
+
+        # Saída dos atalhos com "capture_output", vista em uma janela criada só quando aberta
+        self.output_capture = OutputCapture(self.config["settings"]["output_buffer_kb"] * 1024, parent=self)
+        self.output_capture.process_started.connect(self.on_captured_started)
+        self.output_capture.process_failed.connect(self.on_captured_failed)
+        self.output_capture.process_first_output.connect(self.on_captured_first_output)
+        self.output_console = None
+
+        # Histórico das execuções em SQLite (gravado em lotes por uma thread própria)
+        self.launch_history = None
+        if self.config["settings"]["launch_history"]:
+            try:
+                self.launch_history = LaunchHistory(
+                    os.path.join(os.path.dirname(self.config_path), 'launch_history.sqlite3'))
+            except Exception as e:
+                print(f"Erro ao abrir o histórico de execuções: {e}")
+        self.history_ids = {}  # pid -> id no histórico
+        self.supervisor.process_exited.connect(self.on_process_exited)
+
+        # CPU e memória dos processos iniciados (Linux), mostradas nas dicas dos atalhos
+        self.resource_sampler = ResourceSampler(self.supervisor, parent=self)
+        self.resource_sampler.sampled.connect(self.on_resources_sampled)
+        self.resource_usage = {}  # (exe, args) -> (CPU %, RSS em bytes)
+
+        # Índice dos processos em execução (Linux), para marcar e tratar atalhos já abertos.
+        # Só é atualizado periodicamente com o ponteiro sobre a toolbar: parada, ela não acorda a CPU
+        self.process_index = ProcessIndex()
+        self.running_timer = QtCore.QTimer(self)
+        self.running_timer.setInterval(5000)
+        self.running_timer.timeout.connect(self.refresh_running)
+        if self.process_index.supported():
+            self.supervisor.process_exited.connect(self.refresh_running)
+            QtCore.QTimer.singleShot(0, self.refresh_running)
+
+        # Pré-aquecimento dos executáveis mais usados enquanto a toolbar está ociosa
+        self.usage_stats = UsageStats(
+            os.path.join(os.path.dirname(self.config_path), 'usage_stats.json'))
+        self.prefetcher = Prefetcher(self.usage_stats,
+                                     self.config["settings"]["prefetch_top_n"],
+                                     self.config["settings"]["prefetch_budget_mb"], parent=self)
+        self.prefetcher.shortcut_source = self.all_shortcuts
+        self.prefetcher.is_idle = lambda: not self.launcher.in_flight and not self.workspace_runs
+        if self.config["settings"]["prefetch_top_n"] > 0:
+            self.prefetcher.start()
+
+        # Refaz os ícones quando uma tela com outro DPR é conectada ou removida
+        self.watched_screens = set()
+        self.watch_screens()
+        app = QtWidgets.QApplication.instance()
+        app.screenAdded.connect(self.on_screens_changed)
+        app.screenRemoved.connect(self.on_screens_changed)
 
         # Cria o layout principal
         self.main_layout = QtWidgets.QVBoxLayout()
@@ -31,40 +167,31 @@ class FloatingToolbar(QtWidgets.QWidget):
         self.toolbar_layout = QtWidgets.QHBoxLayout()
         self.toolbar_layout.setSpacing(2)
 
-        # Adiciona botões diretos e botões de categoria
+        # Pré-montagem dos menus de categoria quando o ponteiro para sobre o botão
+        self.prefetch_button = None
+        self.menu_prefetch_timer = QtCore.QTimer(self)
+        self.menu_prefetch_timer.setSingleShot(True)
+        self.menu_prefetch_timer.setInterval(120)
+        self.menu_prefetch_timer.timeout.connect(self.prefetch_category_menu)
+
+        # Botões de controle (criados uma vez) e botões de atalhos/categorias
+        self.shortcut_buttons = {}  # identidade do atalho -> botão (ou célula da faixa)
+        self.category_buttons = {}  # chave da categoria -> botão (ou célula da faixa)
+        self.strip = None  # Faixa única usada no modo de renderização "strip"
+        self.create_control_buttons()
         self.create_toolbar_buttons()
 
         # Adiciona o layout da toolbar ao layout principal
         self.main_layout.addLayout(self.toolbar_layout)
 
-        # Cria um frame visual para a toolbar
-        self.frame = QtWidgets.QFrame()
+        # Cria um frame visual para a toolbar (o fundo é pintado pelo próprio frame)
+        self.frame = OpacityFrame()
         self.frame.setObjectName("toolbarFrame")
         self.frame.setLayout(self.main_layout)
 
-        # Aplica o estilo com a opacidade salva nas configurações
-        opacity_percentage = self.config["settings"]["opacity"]
-        opacity_value = int(opacity_percentage * 255 / 100)
-
-        self.frame.setStyleSheet(f"""
-            #toolbarFrame {{
-                background-color: rgba(50, 50, 50, {opacity_value});
-                border-radius: 10px;
-                border: 1px solid rgba(100, 100, 100, 200);
-            }}
-            QPushButton {{
-                border: none;
-                border-radius: 5px;
-                padding: 5px;
-                background-color: rgba(70, 70, 70, 200);
-            }}
-            QPushButton:hover {{
-                background-color: rgba(90, 90, 90, 200);
-            }}
-            QPushButton:pressed {{
-                background-color: rgba(120, 120, 120, 200);
-            }}
-        """)
+        # Aplica as cores do tema e a opacidade salva nas configurações
+        self.apply_theme_colors()
+        self.frame.set_opacity(self.config["settings"]["opacity"])
 
         # Define o layout principal do widget
         layout = QtWidgets.QVBoxLayout(self)
@@ -81,6 +208,7 @@ class FloatingToolbar(QtWidgets.QWidget):
         self.dragging = False
         self.drag_position = None
 
+    @tracer.traced()
     def load_config(self):
         """Carrega as configurações do arquivo"""
         default_config = {
@@ -118,7 +246,27 @@ class FloatingToolbar(QtWidgets.QWidget):
                 # Valores: bottom-center, top-center, bottom-left, bottom-right, top-left, top-right
                 "position": "top-right",
                 "opacity": 20,  # Porcentagem de opacidade (0-100)
-                "autostart": True  # Iniciar com o Windows
+                "autostart": True,  # Iniciar com o Windows
+                "icon_cache_mb": 32,  # Tamanho máximo do cache de ícones em disco
+                # Valores: buttons (um botão por atalho), strip (faixa única para muitos atalhos)
+                "renderer": "buttons",
+                "launch_coalesce_ms": 500,  # Janela para ignorar cliques repetidos no mesmo atalho
+                # Atalho já em execução: launch (abre outra cópia), skip (ignora) ou confirm (pergunta)
+                "running_policy": "launch",
+                "launch_history": True,  # Grava cada execução em launch_history.sqlite3
+                "output_buffer_kb": 256,  # Saída guardada por processo com "capture_output"
+                "spawn_helper": False,  # Linux/macOS: cria os processos por um auxiliar leve (posix_spawn)
+                "workspace_concurrency": 2,  # Atalhos abertos ao mesmo tempo em "Abrir todos"
+                "workspace_stagger_ms": 0,  # Intervalo entre um início e o próximo em "Abrir todos"
+                # Tempo máximo que um atalho ocupa a vaga depois de criado (libera antes se terminar
+                # ou, com "capture_output", ao escrever a primeira saída)
+                "workspace_settle_ms": 1500,
+                "prefetch_top_n": 3,  # Atalhos mais usados pré-aquecidos no cache de disco (0 desativa)
+                "prefetch_budget_mb": 256,  # Limite de leitura antecipada por ciclo
+                "theme": "dark",  # Valores: dark, light
+                # Métricas OpenMetrics: "127.0.0.1:9464" ou "unix:/caminho/do/socket" (vazio desativa)
+                "metrics_listen": "",
+                "stall_watchdog_ms": 0  # Registra travamentos da interface acima deste tempo (0 desativa)
             }
         }
 
@@ -147,11 +295,13 @@ class FloatingToolbar(QtWidgets.QWidget):
 
     def save_config(self):
         """Salva as configurações no arquivo"""
+        save_start = time.perf_counter()
         try:
             with open(self.config_path, 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, indent=4)
         except Exception as e:
             print(f"Erro ao salvar configurações: {e}")
+        self.metrics.observe("toolbar_config_save_seconds", time.perf_counter() - save_start)
 
     def apply_saved_position(self):
         """Aplica a posição salva nas configurações"""
@@ -199,54 +349,27 @@ class FloatingToolbar(QtWidgets.QWidget):
 
         self.move(x, y)
 
-    def create_toolbar_buttons(self):
-        """Cria os botões da toolbar baseados na configuração"""
-        # Limpa todos os botões existentes
-        for i in reversed(range(self.toolbar_layout.count())):
-            item = self.toolbar_layout.itemAt(i)
-            if item.widget():
-                item.widget().deleteLater()
-
-        # Adiciona botões diretos
-        for shortcut in self.config["quick_shortcuts"]:
-            btn = self.create_shortcut_button(shortcut)
-            self.toolbar_layout.addWidget(btn)
-
-        # Separador visual
-        if self.config["quick_shortcuts"] and self.config["categories"]:
-            separator = QtWidgets.QFrame()
-            separator.setFrameShape(QtWidgets.QFrame.VLine)
-            separator.setFrameShadow(QtWidgets.QFrame.Sunken)
-            separator.setStyleSheet(
-                "background-color: rgba(100, 100, 100, 150);")
-            separator.setMaximumWidth(1)
-            separator.setMinimumWidth(1)
-            self.toolbar_layout.addWidget(separator)
-
-        # Adiciona botões de categoria
-        for category_key in self.config["categories"]:
-            btn = self.create_category_button(category_key)
-            self.toolbar_layout.addWidget(btn)
-
-        # Adiciona os botões de controle diretamente aqui em vez de chamar add_control_buttons()
-        # Separador
-        separator = QtWidgets.QFrame()
-        separator.setFrameShape(QtWidgets.QFrame.VLine)
-        separator.setFrameShadow(QtWidgets.QFrame.Sunken)
-        separator.setStyleSheet("background-color: rgba(100, 100, 100, 150);")
-        separator.setMaximumWidth(1)
-        separator.setMinimumWidth(1)
-        self.toolbar_layout.addWidget(separator)
+    def create_control_buttons(self):
+        """Cria uma única vez os separadores e os botões de controle da toolbar"""
+        # Separador entre atalhos diretos e categorias (visível só quando há ambos)
+        self.category_separator = self.create_separator()
+        self.toolbar_layout.addWidget(self.category_separator)
+
+        # Separador antes dos botões de controle
+        self.toolbar_layout.addWidget(self.create_separator())
 
         # Botão para configurações
         config_btn = QtWidgets.QPushButton()
-        config_btn.setIcon(self.get_settings_icon())
+        config_btn.setIcon(self.settings_icon())
         config_btn.setIconSize(QtCore.QSize(20, 20))
         config_btn.setMinimumSize(36, 36)
         config_btn.setMaximumSize(36, 36)
-        config_btn.setToolTip("Configurações")
+        config_btn.setToolTip("Configurações (botão direito: processos iniciados)")
         config_btn.clicked.connect(self.open_config_dialog)
+        config_btn.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        config_btn.customContextMenuRequested.connect(self.show_control_menu)
         self.toolbar_layout.addWidget(config_btn)
+        self.config_btn = config_btn
 
         # Botão para movimento (simulando uma "alça" de arrasto)
         move_btn = QtWidgets.QPushButton("≡")
@@ -256,246 +379,441 @@ class FloatingToolbar(QtWidgets.QWidget):
         # Instala filtro de eventos para detectar arrasto
         move_btn.installEventFilter(self)
         move_btn.setObjectName("moveBtn")
-        move_btn.setStyleSheet("""
-            #moveBtn {
-                color: rgba(200, 200, 200, 200);
-                font-size: 16px;
-                font-weight: bold;
-            }
-        """)
         self.toolbar_layout.addWidget(move_btn)
 
         # Adiciona separador
-        separator2 = QtWidgets.QFrame()
-        separator2.setFrameShape(QtWidgets.QFrame.VLine)
-        separator2.setFrameShadow(QtWidgets.QFrame.Sunken)
-        separator2.setStyleSheet("background-color: rgba(100, 100, 100, 150);")
-        separator2.setMaximumWidth(1)
-        separator2.setMinimumWidth(1)
-        self.toolbar_layout.addWidget(separator2)
+        self.toolbar_layout.addWidget(self.create_separator())
 
         # Adiciona botão de fechar
         close_btn = QtWidgets.QPushButton("✕")
         close_btn.setObjectName("closeButton")
-        close_btn.setStyleSheet("""
-            #closeButton {
-                background-color: transparent;
-                color: #aaaaaa;
-                font-weight: bold;
-                border: none;
-                padding: 0px;
-                min-width: 20px;
-                max-width: 20px;
-                min-height: 36px;
-                max-height: 36px;
-            }
-            #closeButton:hover {
-                background-color: #ff4d4d;
-                color: white;
-                border-radius: 5px;
-            }
-        """)
         close_btn.setToolTip("Fechar Toolbar")
         close_btn.clicked.connect(self.close_application)
         self.toolbar_layout.addWidget(close_btn)
 
-    def create_shortcut_button(self, shortcut):
-        """Cria um botão para um atalho direto"""
-        btn = QtWidgets.QPushButton(shortcut.get(
-            "name", "")[0])  # Primeira letra como texto do botão
-
-        # Tenta usar um ícone se especificado
-        if shortcut.get("icon") and os.path.exists(shortcut["icon"]):
-            btn.setIcon(QtGui.QIcon(shortcut["icon"]))
-            btn.setText("")  # Remove o texto se tiver ícone
+    def settings_icon(self):
+        """Ícone de engrenagem na cor do tema"""
+        colors = themes.theme_colors(self.config["settings"]["theme"])
+        return self.icon_pipeline.settings_icon(color=colors["gear"])
+
+    def apply_theme(self):
+        """Aplica o tema configurado (folha de estilos em cache e cores pintadas)"""
+        themes.apply_theme(self.config["settings"]["theme"])
+        self.apply_theme_colors()
+        self.config_btn.setIcon(self.settings_icon())
+
+    def apply_theme_colors(self):
+        """Repassa as cores do tema aos widgets que pintam o próprio conteúdo"""
+        colors = themes.theme_colors(self.config["settings"]["theme"])
+        self.frame.set_colors(colors["frame"], colors["border"])
+        if self.strip is not None:
+            self.strip.set_colors(colors)
+
+    def create_separator(self):
+        """Cria um separador vertical"""
+        separator = QtWidgets.QFrame()
+        separator.setFrameShape(QtWidgets.QFrame.VLine)
+        separator.setFrameShadow(QtWidgets.QFrame.Sunken)
+        separator.setObjectName("toolbarSeparator")
+        separator.setMaximumWidth(1)
+        separator.setMinimumWidth(1)
+        return separator
+
+    @staticmethod
+    def fingerprint(data):
+        """Representação estável de um atalho/categoria para detectar mudanças"""
+        return json.dumps(data, sort_keys=True)
+
+    @staticmethod
+    def shortcut_identities(shortcuts):
+        """Identidades estáveis dos atalhos diretos (nome + executável + ocorrência)"""
+        seen = {}
+        identities = []
+        for shortcut in shortcuts:
+            base = (shortcut.get("name", ""), shortcut.get("exe", ""))
+            occurrence = seen.get(base, 0)
+            seen[base] = occurrence + 1
+            identities.append(base + (occurrence,))
+        return identities
+
+    @tracer.traced()
+    def create_toolbar_buttons(self):
+        """Sincroniza os botões da toolbar com a configuração.
+
+        Compara a configuração com os botões existentes pela identidade estável
+        de cada atalho/categoria e só cria, atualiza, reordena ou remove os
+        widgets que mudaram; os demais são mantidos como estão.
+        """
+        rebuild_start = time.perf_counter()
+        strip_mode = self.config["settings"]["renderer"] == "strip"
+        if strip_mode != (self.strip is not None):
+            self.switch_renderer(strip_mode)
+
+        # Atalhos diretos
+        shortcuts = self.config["quick_shortcuts"]
+        identities = self.shortcut_identities(shortcuts)
+        quick_widgets = []
+        remaining = dict(self.shortcut_buttons)
+        for identity, shortcut in zip(identities, shortcuts):
+            btn = remaining.pop(identity, None)
+            if btn is None:
+                if strip_mode:
+                    btn = self.create_shortcut_cell(shortcut)
+                else:
+                    btn = self.create_shortcut_button(shortcut)
+            elif btn.fingerprint != self.fingerprint(shortcut):
+                self.update_shortcut_button(btn, shortcut)
+            quick_widgets.append(btn)
+        for btn in remaining.values():
+            self.remove_toolbar_item(btn)
+        self.shortcut_buttons = dict(zip(identities, quick_widgets))
+
+        # Categorias
+        category_widgets = []
+        remaining = dict(self.category_buttons)
+        for category_key, category_data in self.config["categories"].items():
+            btn = remaining.pop(category_key, None)
+            if btn is None:
+                if strip_mode:
+                    btn = self.create_category_cell(category_key)
+                else:
+                    btn = self.create_category_button(category_key)
+            elif btn.fingerprint != self.fingerprint(category_data):
+                self.update_category_button(btn, category_key)
+            category_widgets.append(btn)
+        for btn in remaining.values():
+            self.remove_toolbar_item(btn)
+        self.category_buttons = dict(zip(self.config["categories"], category_widgets))
+
+        if strip_mode:
+            # A faixa desenha as células e o separador por conta própria
+            self.category_separator.setVisible(False)
+            self.strip.set_cells(quick_widgets + category_widgets, len(quick_widgets))
+            ordered = [self.strip]
         else:
-            # Cria um ícone colorido com a primeira letra se não tiver ícone
-            pixmap = QtGui.QPixmap(32, 32)
-            pixmap.fill(QtCore.Qt.transparent)
-
-            painter = QtGui.QPainter(pixmap)
-            painter.setRenderHint(QtGui.QPainter.Antialiasing)
-
-            # Cor de fundo aleatória mas consistente baseada no nome
-            import hashlib
-            name_hash = int(hashlib.md5(
-                shortcut["name"].encode()).hexdigest(), 16)
-            color = QtGui.QColor(name_hash % 200 + 55, (name_hash // 256) %
-                                 200 + 55, (name_hash // 65536) % 200 + 55)
-
-            painter.setBrush(QtGui.QBrush(color))
-            painter.setPen(QtCore.Qt.NoPen)
-            painter.drawEllipse(2, 2, 28, 28)
-
-            painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255)))
-            painter.setFont(QtGui.QFont("Arial", 14, QtGui.QFont.Bold))
-            painter.drawText(pixmap.rect(), QtCore.Qt.AlignCenter,
-                             shortcut["name"][0].upper())
+            self.category_separator.setVisible(bool(quick_widgets and category_widgets))
+            ordered = quick_widgets + [self.category_separator] + category_widgets
+
+        # Coloca cada widget na posição certa, mexendo só nos que estão fora de ordem
+        for index, widget in enumerate(ordered):
+            item = self.toolbar_layout.itemAt(index)
+            if item is None or item.widget() is not widget:
+                self.toolbar_layout.removeWidget(widget)
+                self.toolbar_layout.insertWidget(index, widget)
+
+        # Persiste o índice do cache para que a próxima inicialização o aproveite
+        self.cache_save_timer.start()
+        self.metrics.observe("toolbar_rebuild_seconds", time.perf_counter() - rebuild_start)
+
+    def remove_toolbar_item(self, item):
+        """Remove um botão (ou uma célula da faixa) da toolbar"""
+        if isinstance(item, StripCell):
+            item.release()
+        else:
+            self.toolbar_layout.removeWidget(item)
+            item.deleteLater()
+
+    def switch_renderer(self, strip_mode):
+        """Alterna entre um botão por atalho e a faixa única desenhada"""
+        for item in list(self.shortcut_buttons.values()) + list(self.category_buttons.values()):
+            self.remove_toolbar_item(item)
+        self.shortcut_buttons = {}
+        self.category_buttons = {}
+
+        if strip_mode:
+            self.strip = ShortcutStrip(self.create_category_menu)
+            self.strip.set_colors(themes.theme_colors(self.config["settings"]["theme"]))
+            self.strip.cell_clicked.connect(self.on_strip_cell_clicked)
+            self.strip.cell_hovered.connect(self.on_strip_cell_hovered)
+            # Reserva espaço para os botões de controle; o restante é paginado
+            screen = QtWidgets.QDesktopWidget().availableGeometry()
+            self.strip.set_max_width(screen.width() - 150)
+            self.toolbar_layout.insertWidget(0, self.strip)
+        else:
+            self.toolbar_layout.removeWidget(self.strip)
+            self.strip.deleteLater()
+            self.strip = None
+
+    def create_shortcut_cell(self, shortcut):
+        """Cria uma célula da faixa para um atalho direto"""
+        cell = self.strip.create_cell("shortcut")
+        self.update_shortcut_button(cell, shortcut)
+        return cell
+
+    def create_category_cell(self, category_key):
+        """Cria uma célula da faixa para uma categoria"""
+        cell = self.strip.create_cell("category")
+        self.update_category_button(cell, category_key)
+        return cell
+
+    def on_strip_cell_clicked(self, cell, menu_pos):
+        """Lança o atalho ou abre o menu da categoria clicada na faixa"""
+        if cell.kind == "shortcut":
+            self.launch_shortcut(cell.shortcut_data)
+        else:
+            self.build_category_menu(cell)
+            cell.menu().popup(menu_pos)
+
+    def on_strip_cell_hovered(self, cell):
+        """Pré-monta o menu da categoria sob o ponteiro na faixa"""
+        if cell.kind == "category" and not cell.menu_built:
+            self.prefetch_button = cell
+            self.menu_prefetch_timer.start()
+        else:
+            self.menu_prefetch_timer.stop()
+            self.prefetch_button = None
 
-            painter.end()
+    @staticmethod
+    def is_alive(target):
+        """Indica se um botão (ou célula da faixa) ainda existe"""
+        return isinstance(target, StripCell) or not sip.isdeleted(target)
 
-            btn.setIcon(QtGui.QIcon(pixmap))
-            btn.setText("")  # Remove o texto
+    def create_shortcut_button(self, shortcut):
+        """Cria um botão para um atalho direto"""
+        btn = QtWidgets.QPushButton()
 
         # Configura o botão
         btn.setIconSize(QtCore.QSize(24, 24))
         btn.setMinimumSize(36, 36)
         btn.setMaximumSize(36, 36)
 
-        if shortcut.get("tooltip"):
-            btn.setToolTip(shortcut["tooltip"])
-        else:
-            btn.setToolTip(shortcut["name"])
+        self.update_shortcut_button(btn, shortcut)
 
-        # Conecta a função de lançamento
-        btn.clicked.connect(lambda: self.launch_app(
-            shortcut["exe"], shortcut["args"]))
+        # Conecta a função de lançamento (lê o atalho atual do botão)
+        btn.clicked.connect(lambda checked=False, b=btn: self.launch_shortcut(b.shortcut_data))
 
         return btn
 
-    def create_category_button(self, category_key):
-        """Cria um botão que abre um menu com os atalhos de uma categoria"""
-        # Obtém os dados da categoria
-        category_data = self.config["categories"][category_key]
-
-        # Determina o nome e ícone da categoria
-        category_name = category_key
-        category_icon = ""
-
+    def update_shortcut_button(self, btn, shortcut):
+        """Aplica os dados de um atalho (ícone e dica) a um botão existente"""
+        btn.shortcut_data = shortcut
+        btn.fingerprint = self.fingerprint(shortcut)
+
+        # Mostra o ícone colorido com a primeira letra imediatamente
+        btn.setIcon(self.icon_pipeline.letter_icon(shortcut["name"], "circle"))
+
+        # O ícone especificado (ou o embutido no executável) é decodificado em
+        # segundo plano e substitui o provisório
+        icon_source = shortcut.get("icon")
+        if not icon_source and pe_icons.is_pe_path(shortcut.get("exe", "")):
+            icon_source = shortcut["exe"]
+        self.request_file_icon(btn, icon_source)
+
+        btn.setToolTip(self.shortcut_tooltip(shortcut))
+
+        self.set_running_mark(btn, self.process_index.is_running(shortcut["exe"], shortcut["args"]))
+
+    def shortcut_tooltip(self, shortcut):
+        """Dica do atalho, com o uso de CPU e memória quando ele foi aberto pela toolbar"""
+        tooltip = shortcut.get("tooltip") or shortcut["name"]
+        usage = self.resource_usage.get((shortcut["exe"], tuple(shortcut["args"])))
+        if usage is not None:
+            cpu, rss = usage
+            tooltip += f"\nCPU {cpu:.0f}% · Memória {rss / (1024 * 1024):.0f} MB"
+        return tooltip
+
+    def on_resources_sampled(self, histories):
+        """Soma o uso por atalho e atualiza só as dicas que mudaram"""
+        usage = {}
+        for pid, history in histories.items():
+            child = self.supervisor.running.get(pid)
+            latest = history.latest()
+            if child is None or latest is None:
+                continue
+            key = (child.exe, child.args)
+            cpu, rss = usage.get(key, (0.0, 0))
+            usage[key] = (cpu + latest[0], rss + latest[1])
+
+        changed = {key for key in usage.keys() | self.resource_usage.keys()
+                   if usage.get(key) != self.resource_usage.get(key)}
+        self.resource_usage = usage
+        if not changed:
+            return
+
+        for btn in self.shortcut_buttons.values():
+            if (btn.shortcut_data["exe"], tuple(btn.shortcut_data["args"])) in changed:
+                btn.setToolTip(self.shortcut_tooltip(btn.shortcut_data))
+        for btn in self.category_buttons.values():
+            if not btn.menu_built:
+                continue
+            for action in btn.menu().actions():
+                shortcut = action.data()
+                if shortcut and (shortcut["exe"], tuple(shortcut["args"])) in changed:
+                    action.setToolTip(self.shortcut_tooltip(shortcut))
+        if self.process_dialog is not None:
+            self.process_dialog.refresh()
+
+    def set_running_mark(self, btn, running):
+        """Marca (ou desmarca) o botão de um atalho que está em execução"""
+        if getattr(btn, "running", False) == running:
+            return
+        btn.running = running
+        if isinstance(btn, StripCell):
+            btn.strip.update_cell(btn)
+        else:
+            # Propriedade dinâmica usada pela folha do tema; repole só este botão
+            btn.setProperty("running", running)
+            btn.style().unpolish(btn)
+            btn.style().polish(btn)
+
+    def refresh_running(self):
+        """Atualiza o índice de processos e as marcas dos atalhos em execução"""
+        if self.process_index.refresh():
+            self.update_running_marks()
+
+    def index_started_process(self, pid):
+        """Indexa um processo que a toolbar acabou de criar, sem reler o /proc inteiro"""
+        if self.process_index.supported():
+            self.process_index.add_pid(pid)
+            self.update_running_marks()
+
+    def update_running_marks(self):
+        for btn in self.shortcut_buttons.values():
+            shortcut = btn.shortcut_data
+            self.set_running_mark(btn, self.process_index.is_running(shortcut["exe"], shortcut["args"]))
+
+    @staticmethod
+    def category_info(category_key, category_data):
+        """Retorna (nome, ícone, atalhos) de uma categoria em qualquer formato"""
         # Verifica se a categoria é um dicionário (novo formato com metadados)
         if isinstance(category_data, dict) and "name" in category_data:
-            category_name = category_data["name"]
-            category_icon = category_data.get("icon", "")
-            category_shortcuts = category_data.get("shortcuts", [])
-        else:
-            # Formato antigo: a chave é o nome e o valor é a lista de atalhos
-            category_shortcuts = category_data
-
-        # Primeira letra como texto do botão
-        btn = QtWidgets.QPushButton(category_name[0])
-
-        # Tenta usar um ícone se especificado
-        if category_icon and os.path.exists(category_icon):
-            btn.setIcon(QtGui.QIcon(category_icon))
-            btn.setText("")  # Remove o texto se tiver ícone
-        else:
-            # Cria um ícone colorido para a categoria
-            pixmap = QtGui.QPixmap(32, 32)
-            pixmap.fill(QtCore.Qt.transparent)
-
-            painter = QtGui.QPainter(pixmap)
-            painter.setRenderHint(QtGui.QPainter.Antialiasing)
-
-            # Cor consistente baseada no nome da categoria
-            import hashlib
-            name_hash = int(hashlib.md5(
-                category_name.encode()).hexdigest(), 16)
-            color = QtGui.QColor(name_hash % 200 + 55, (name_hash // 256) %
-                                 200 + 55, (name_hash // 65536) % 200 + 55)
-
-            painter.setBrush(QtGui.QBrush(color))
-            painter.setPen(QtCore.Qt.NoPen)
-            painter.drawRect(2, 2, 28, 28)
-
-            painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255)))
-            painter.setFont(QtGui.QFont("Arial", 14, QtGui.QFont.Bold))
-            painter.drawText(pixmap.rect(), QtCore.Qt.AlignCenter,
-                             category_name[0].upper())
-
-            painter.end()
-
-            btn.setIcon(QtGui.QIcon(pixmap))
-            btn.setText("")  # Remove o texto
+            return (category_data["name"], category_data.get("icon", ""),
+                    category_data.get("shortcuts", []))
+        # Formato antigo: a chave é o nome e o valor é a lista de atalhos
+        return category_key, "", category_data
 
+    def create_category_button(self, category_key):
+        """Cria um botão que abre um menu com os atalhos de uma categoria"""
+        btn = QtWidgets.QPushButton()
         btn.setIconSize(QtCore.QSize(24, 24))
         btn.setMinimumSize(36, 36)
         btn.setMaximumSize(36, 36)
-        btn.setToolTip(f"Projetos {category_name}")
-
-        # Cria e conecta o menu
-        menu = QtWidgets.QMenu(self)
-        menu.setStyleSheet("""
-            QMenu {
-                background-color: rgba(60, 60, 60, 230);
-                border: 1px solid rgba(100, 100, 100, 200);
-                border-radius: 5px;
-                padding: 5px;
-            }
-            QMenu::item {
-                background-color: transparent;
-                padding: 5px 20px 5px 20px;
-                border-radius: 3px;
-                color: rgba(230, 230, 230, 255);
-            }
-            QMenu::item:selected {
-                background-color: rgba(100, 100, 100, 200);
-            }
-            QMenu::indicator {
-                width: 0px;
-                height: 0px;
-            }
-            QMenu::right-arrow {
-                width: 0px;
-                height: 0px;
-                padding: 0px;
-                margin: 0px;
-            }
-        """)
-
-        for shortcut in category_shortcuts:
-            action = menu.addAction(shortcut["name"])
-            action.triggered.connect(
-                lambda checked, e=shortcut["exe"], a=shortcut["args"]: self.launch_app(
-                    e, a)
-            )
 
+        # Cria o menu vazio; os itens só são criados na primeira abertura
+        # (ou antes, quando o ponteiro para sobre o botão)
+        menu = self.create_category_menu()
         btn.setMenu(menu)
+        menu.aboutToShow.connect(lambda b=btn: self.build_category_menu(b))
 
-        # Estilo do botão para esconder a seta
-        btn.setStyleSheet("""
-            QPushButton::menu-indicator {
-                width: 0px;
-                image: none;
-                subcontrol-position: right center;
-                subcontrol-origin: padding;
-                left: -2px;
-            }
-        """)
-
-        return btn
+        # Detecta a passagem do ponteiro para pré-montar o menu
+        # (o nome do objeto também aplica o estilo do tema que esconde a seta)
+        btn.setObjectName("categoryButton")
+        btn.installEventFilter(self)
 
-    def get_settings_icon(self):
-        """Cria um ícone para o botão de configurações"""
-        import math
+        self.update_category_button(btn, category_key)
 
-        pixmap = QtGui.QPixmap(32, 32)
-        pixmap.fill(QtCore.Qt.transparent)
+        return btn
 
-        painter = QtGui.QPainter(pixmap)
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    def create_category_menu(self):
+        """Cria o menu (vazio) estilizado de uma categoria"""
+        menu = QtWidgets.QMenu(self)
+        menu.setObjectName("categoryMenu")  # Estilizado pela folha do tema
+        menu.setToolTipsVisible(True)  # Mostra CPU e memória dos atalhos abertos
+        return menu
 
-        # Desenha uma engrenagem simples
-        painter.setPen(QtGui.QPen(QtGui.QColor(200, 200, 200), 2))
-        painter.setBrush(QtCore.Qt.NoBrush)
+    def update_category_button(self, btn, category_key):
+        """Aplica os dados de uma categoria (ícone, dica e menu) a um botão existente"""
+        category_data = self.config["categories"][category_key]
+        btn.category_key = category_key
+        btn.fingerprint = self.fingerprint(category_data)
+        category_name, category_icon, category_shortcuts = self.category_info(
+            category_key, category_data)
 
-        painter.drawEllipse(8, 8, 16, 16)
+        # Cria um ícone colorido provisório para a categoria
+        btn.setIcon(self.icon_pipeline.letter_icon(category_name, "square"))
 
-        # Desenha os "dentes" da engrenagem
-        for i in range(8):
-            angle = i * 45 * math.pi / 180
-            x1 = 16 + 8 * math.cos(angle)
-            y1 = 16 + 8 * math.sin(angle)
-            x2 = 16 + 12 * math.cos(angle)
-            y2 = 16 + 12 * math.sin(angle)
-            painter.drawLine(int(x1), int(y1), int(x2), int(y2))
+        # Troca pelo ícone especificado quando a decodificação terminar
+        self.request_file_icon(btn, category_icon)
 
-        painter.end()
+        btn.setToolTip(f"Projetos {category_name}")
 
-        return QtGui.QIcon(pixmap)
+        # O conteúdo mudou: descarta o menu montado; ele será refeito sob demanda
+        if getattr(btn, "menu_built", False):
+            btn.menu().clear()
+        btn.menu_built = False
+
+    @tracer.traced()
+    def build_category_menu(self, btn):
+        """Monta os itens do menu da categoria, se ainda não estiverem montados"""
+        if btn.menu_built or btn.category_key not in self.config["categories"]:
+            return
+        _, _, category_shortcuts = self.category_info(
+            btn.category_key, self.config["categories"][btn.category_key])
+
+        menu = btn.menu()
+        if len(category_shortcuts) > 1:
+            name, _, _ = self.category_info(btn.category_key, self.config["categories"][btn.category_key])
+            menu.addAction("Abrir todos").triggered.connect(
+                lambda checked, n=name, s=category_shortcuts: self.launch_workspace(n, s))
+            menu.addSeparator()
+        for shortcut in category_shortcuts:
+            action = menu.addAction(shortcut["name"])
+            action.setData(shortcut)
+            action.setToolTip(self.shortcut_tooltip(shortcut))
+            action.triggered.connect(
+                lambda checked, s=shortcut: self.launch_shortcut(s)
+            )
+        btn.menu_built = True
+
+    def prefetch_category_menu(self):
+        """Monta o menu da categoria sob o ponteiro enquanto a interface está ociosa"""
+        btn = self.prefetch_button
+        self.prefetch_button = None
+        if btn is not None and self.is_alive(btn):
+            self.build_category_menu(btn)
+
+    def request_file_icon(self, btn, path):
+        """Aplica um ícone de arquivo ao botão, agora (se pronto) ou quando carregar"""
+        btn.icon_source = path
+        if not path:
+            return
+        icon = self.icon_pipeline.file_icon(path)
+        if icon is not None:
+            btn.setIcon(icon)
+        else:
+            self.pending_icon_buttons.setdefault(path, []).append(btn)
+
+    def on_file_icon_ready(self, path, icon):
+        """Substitui o ícone provisório dos botões que aguardavam este arquivo"""
+        for btn in self.pending_icon_buttons.pop(path, []):
+            # Ignora botões removidos ou que mudaram de ícone enquanto aguardavam
+            if self.is_alive(btn) and btn.icon_source == path:
+                btn.setIcon(icon)
+        self.cache_save_timer.start()
+
+    def on_file_icon_failed(self, path):
+        """Mantém o ícone provisório quando o arquivo não pôde ser carregado"""
+        self.pending_icon_buttons.pop(path, None)
+
+    def on_screens_changed(self, *args):
+        """Refaz as variantes dos ícones somente se o DPR das telas mudou"""
+        self.watch_screens()
+        if self.icon_pipeline.update_dprs():
+            self.config_btn.setIcon(self.settings_icon())
+            for btn in self.shortcut_buttons.values():
+                self.update_shortcut_button(btn, btn.shortcut_data)
+            for category_key, btn in self.category_buttons.items():
+                self.update_category_button(btn, category_key)
+
+    def watch_screens(self):
+        """Monitora mudanças de DPI em todas as telas conectadas"""
+        for screen in QtGui.QGuiApplication.screens():
+            if screen not in self.watched_screens:
+                self.watched_screens.add(screen)
+                screen.logicalDotsPerInchChanged.connect(self.on_screens_changed)
 
     def eventFilter(self, obj, event):
         """Filtro de eventos para detectar arrasto do botão de movimento"""
-        if obj.objectName() == "moveBtn":
+        if obj.objectName() == "categoryButton":
+            # Pré-monta o menu se o ponteiro parar sobre o botão da categoria
+            if event.type() == QtCore.QEvent.Enter and not obj.menu_built:
+                self.prefetch_button = obj
+                self.menu_prefetch_timer.start()
+            elif event.type() == QtCore.QEvent.Leave:
+                self.menu_prefetch_timer.stop()
+                self.prefetch_button = None
+
+        elif obj.objectName() == "moveBtn":
             if event.type() == QtCore.QEvent.MouseButtonPress:
                 if event.button() == QtCore.Qt.LeftButton:
                     self.dragging = True
@@ -561,23 +879,258 @@ class FloatingToolbar(QtWidgets.QWidget):
         self.dragging = False
         super().mouseReleaseEvent(event)
 
-    def launch_app(self, exe, args):
-        """Lança um aplicativo com os argumentos especificados"""
-        try:
-            cmd = [exe] + args
-            subprocess.Popen(cmd)
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(
-                self, "Erro", f"Não foi possível iniciar:\n{e}")
+    def enterEvent(self, event):
+        """Ponteiro sobre a toolbar: atualiza as marcas e dicas enquanto ele estiver ali"""
+        if self.process_index.supported():
+            self.refresh_running()
+            self.running_timer.start()
+        self.update_watched()
+        super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        self.running_timer.stop()
+        self.update_watched()
+        super().leaveEvent(event)
+
+    def update_watched(self):
+        """Amostra CPU e memória só enquanto as dicas ou a janela de processos podem ser vistas"""
+        self.resource_sampler.set_watched(self.underMouse() or self.process_dialog is not None)
+
+    def launch_shortcut(self, shortcut):
+        """Lança um atalho da configuração"""
+        self.launch_app(shortcut["exe"], shortcut["args"], shortcut["name"],
+                        shortcut.get("capture_output", False))
+
+    def launch_app(self, exe, args, name=None, capture_output=False):
+        """Lança um aplicativo com os argumentos especificados (sem bloquear a interface)"""
+        # Só consulta o índice: ele é atualizado com o ponteiro sobre a toolbar
+        # (enterEvent e running_timer) e recebe direto os processos criados por ela
+        policy = self.config["settings"]["running_policy"]
+        if policy != "launch" and self.process_index.is_running(exe, args):
+            if policy == "skip":
+                print(f"{name or exe} já está em execução")
+                return
+            reply = QtWidgets.QMessageBox.question(
+                self, 'Já em execução',
+                f"{name or exe} já está aberto. Deseja abrir outra cópia?",
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                QtWidgets.QMessageBox.No
+            )
+            if reply != QtWidgets.QMessageBox.Yes:
+                return
+        if capture_output:
+            # QProcess: stdout/stderr lidos pelo laço de eventos, sem threads nem bloqueio
+            self.output_capture.start(name or exe, exe, args)
+            return
+        self.launcher.launch(exe, args, name)
+
+    def launch_workspace(self, name, shortcuts, concurrency=None, stagger_ms=None, settle_ms=None):
+        """Abre vários atalhos com limite de simultaneidade e intervalo entre os inícios"""
+        settings = self.config["settings"]
+        if concurrency is None:
+            concurrency = settings["workspace_concurrency"]
+        if stagger_ms is None:
+            stagger_ms = settings["workspace_stagger_ms"]
+        if settle_ms is None:
+            settle_ms = settings["workspace_settle_ms"]
+        if settings["running_policy"] != "launch":
+            # Em lote não há confirmação: os atalhos já abertos são ignorados
+            shortcuts = [shortcut for shortcut in shortcuts
+                         if not self.process_index.is_running(shortcut["exe"], shortcut["args"])]
+        run = WorkspaceRun(name, shortcuts, self.launcher, self.output_capture, self.supervisor,
+                           concurrency, stagger_ms, settle_ms, self)
+        run.finished.connect(self.on_workspace_finished)
+        self.workspace_runs.add(run)
+        run.start()
+        return run
+
+    def on_workspace_finished(self, run):
+        """Mostra o tempo de cada atalho e o total da abertura em lote"""
+        print(run.report())
+        self.workspace_runs.discard(run)
+        run.deleteLater()
+
+    def on_captured_started(self, captured):
+        """Processo com saída capturada iniciado: passa a ser supervisionado"""
+        self.supervisor.adopt(captured, captured.name, captured.exe, captured.args)
+        # O código de saída do QProcess só existe após o sinal finished: recolhe nesse momento
+        captured.process.finished.connect(self.supervisor.sweep)
+        self.record_launch_metrics(captured.name, "ok", captured.spawn_time)
+        if self.launch_history is not None:
+            self.history_ids[captured.pid] = self.launch_history.record_launch(
+                captured.name, captured.exe, captured.args, 0.0, captured.spawn_time, captured.pid)
+            # A primeira saída pode chegar antes do aviso de início
+            if captured.first_output_time is not None:
+                self.on_captured_first_output(captured)
+        self.resource_sampler.start()
+        self.index_started_process(captured.pid)
+
+    def on_captured_failed(self, captured, error):
+        self.record_launch_metrics(captured.name, "error")
+        if self.launch_history is not None:
+            self.launch_history.record_launch(captured.name, captured.exe, captured.args, 0.0,
+                                              time.perf_counter() - captured.launch_clock,
+                                              error=error)
+        self.show_launch_error(captured.exe, error)
+
+    def on_captured_first_output(self, captured):
+        """Tempo até a primeira saída do processo capturado"""
+        launch_id = self.history_ids.get(captured.pid)
+        if launch_id is not None:
+            self.launch_history.record_first_output(launch_id, captured.first_output_time)
+
+    def on_process_exited(self, child):
+        """Completa o histórico com o código de saída e o tempo de execução"""
+        launch_id = self.history_ids.pop(child.pid, None)
+        if launch_id is not None:
+            self.launch_history.record_exit(launch_id, child.exit_code, child.runtime)
+
+    def open_output_console(self):
+        """Mostra a saída dos processos capturados (a janela é criada na primeira vez)"""
+        if self.output_console is None:
+            self.output_console = OutputConsole(self.output_capture, self)
+        self.output_console.show()
+        self.output_console.raise_()
+
+    def all_shortcuts(self):
+        """Todos os atalhos da configuração (diretos e de categorias)"""
+        shortcuts = list(self.config["quick_shortcuts"])
+        for category_key, category_data in self.config["categories"].items():
+            shortcuts.extend(self.category_info(category_key, category_data)[2])
+        return shortcuts
+
+    def on_launched(self, record):
+        """Entrega o processo criado ao supervisor, que passa a ser o dono do Popen"""
+        self.prefetcher.record_launch(record)
+        self.record_launch_metrics(record.name, "ok", record.queue_time + record.spawn_time)
+        # O Popen só retorna depois do exec; se o processo ainda trocar de
+        # imagem, a próxima atualização do índice relê o link exe dele
+        self.index_started_process(record.pid)
+        self.supervisor.adopt(record.process, record.name, record.exe, record.args)
+        record.process = None
+        if self.launch_history is not None:
+            self.history_ids[record.pid] = self.launch_history.record_launch(
+                record.name, record.exe, record.args, record.queue_time, record.spawn_time, record.pid)
+        self.resource_sampler.start()
+        if self.process_dialog is not None:
+            self.process_dialog.refresh()
+
+    def show_control_menu(self, pos):
+        """Menu de contexto do botão de configurações"""
+        menu = QtWidgets.QMenu(self)
+        menu.setObjectName("categoryMenu")
+        menu.addAction("Processos iniciados...", self.open_process_dialog)
+        menu.addAction("Saída dos processos...", self.open_output_console)
+        menu.addAction("Diagnóstico de memória...", self.show_memory_report)
+        menu.addAction("Devolver memória livre", self.release_free_memory)
+        if self.stall_watchdog is not None:
+            menu.addAction("Travamentos da interface...", self.show_stall_summary)
+        if tracer.enabled:
+            menu.addAction("Salvar rastreamento", self.save_trace)
+
+        # Espaços de trabalho nomeados (config["workspaces"])
+        workspaces = self.config.get("workspaces", {})
+        if workspaces:
+            workspace_menu = menu.addMenu("Espaços de trabalho")
+            workspace_menu.setObjectName("categoryMenu")
+            for name, workspace in workspaces.items():
+                workspace_menu.addAction(name).triggered.connect(
+                    lambda checked, n=name, w=workspace: self.launch_workspace(
+                        n, w["shortcuts"], w.get("concurrency"), w.get("stagger_ms"), w.get("settle_ms")))
+        menu.exec_(self.config_btn.mapToGlobal(pos))
+
+    def show_memory_report(self):
+        """Relatório de memória e a diferença desde o diagnóstico anterior"""
+        snapshot = memory_report.MemorySnapshot(self)
+        lines = snapshot.report()
+        if self.memory_snapshot is not None:
+            lines += ["", "Diferença desde o diagnóstico anterior:"] + snapshot.diff(self.memory_snapshot)
+        self.memory_snapshot = snapshot
+        print("\n".join(lines))
+
+        message = QtWidgets.QMessageBox(
+            QtWidgets.QMessageBox.Information, "Diagnóstico de Memória", lines[0],
+            QtWidgets.QMessageBox.Ok, self)
+        message.setDetailedText("\n".join(lines))
+        message.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        message.setModal(False)
+        message.show()
+
+    def release_free_memory(self):
+        """Devolve ao sistema a memória livre do processo (malloc_trim) e mostra o efeito"""
+        lines = memory_report.trim_report()
+        print("\n".join(lines))
+        QtWidgets.QMessageBox.information(self, "Memória Livre", "\n".join(lines))
+
+    def show_stall_summary(self):
+        """Resumo dos trechos que mais travaram a interface"""
+        lines = self.stall_watchdog.summary()
+        QtWidgets.QMessageBox.information(
+            self, "Travamentos da Interface",
+            "\n".join(lines) if lines else "Nenhum travamento registrado.")
+
+    def save_trace(self):
+        """Grava o rastreamento até agora (o arquivo é regravado ao sair)"""
+        path = tracer.dump()
+        if path:
+            print(f"Rastreamento salvo em {path}")
+
+    def open_process_dialog(self):
+        """Mostra a tabela de processos iniciados pela toolbar (janela não modal)"""
+        if self.process_dialog is None:
+            self.process_dialog = ProcessTableDialog(self.supervisor, self.prefetcher,
+                                                     self.resource_sampler, self)
+            self.process_dialog.finished.connect(self.on_process_dialog_closed)
+        self.process_dialog.refresh()
+        self.process_dialog.show()
+        self.process_dialog.raise_()
+        self.update_watched()
+
+    def on_process_dialog_closed(self):
+        self.process_dialog.deleteLater()
+        self.process_dialog = None
+        self.update_watched()
+
+    def on_launch_failed(self, record):
+        """Avisa a falha de uma execução sem bloquear a toolbar"""
+        self.record_launch_metrics(record.name, "error")
+        if self.launch_history is not None:
+            self.launch_history.record_launch(record.name, record.exe, record.args, record.queue_time,
+                                              record.spawn_time, error=record.error)
+        self.show_launch_error(record.exe, record.error)
+
+    def record_launch_metrics(self, name, result, latency=None):
+        """Contagem de execuções e histograma de latência por atalho"""
+        self.metrics.inc("toolbar_launches", (("shortcut", name), ("result", result)))
+        if latency is not None:
+            self.metrics.observe("toolbar_launch_latency_seconds", latency, (("shortcut", name),))
+
+    def show_launch_error(self, exe, error):
+        """Mensagem de erro não modal"""
+        print(f"Erro ao iniciar {exe}: {error}")
+        message = QtWidgets.QMessageBox(
+            QtWidgets.QMessageBox.Critical, "Erro",
+            f"Não foi possível iniciar:\n{error}",
+            QtWidgets.QMessageBox.Ok, self)
+        message.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        message.setModal(False)
+        message.show()
 
     def open_config_dialog(self):
         """Abre o diálogo de configuração geral"""
         dialog = ConfigDialog(self.config, self)
         if dialog.exec_():
-            self.config = dialog.get_config()
-            self.save_config()
-            # Recria todos os botões, incluindo os botões de controle
-            self.create_toolbar_buttons()
+            self.apply_config(dialog.get_config())
+
+    def apply_config(self, config):
+        """Salva e aplica uma configuração editada"""
+        self.config = config
+        self.save_config()
+        self.apply_theme()
+        self.launcher.set_coalesce_ms(self.config["settings"]["launch_coalesce_ms"])
+        # Atualiza só os botões que mudaram
+        self.create_toolbar_buttons()
+        self.config_applied.emit(config)
 
     def close_application(self):
         """Fecha a aplicação após confirmação"""
@@ -591,15 +1144,98 @@ class FloatingToolbar(QtWidgets.QWidget):
         if reply == QtWidgets.QMessageBox.Yes:
             # Salva todas as configurações antes de fechar
             self.save_config()
+            self.icon_pipeline.wait_for_done(2000)
+            self.launcher.wait_for_done(2000)
+            self.prefetcher.wait_for_done(2000)
+            self.usage_stats.save()
+            if self.launch_history is not None:
+                self.launch_history.close()
+            if spawn_helper.client() is not None:
+                spawn_helper.client().close()
+            self.metrics.stop()
+            if self.stall_watchdog is not None:
+                self.stall_watchdog.stop()
+            self.icon_cache.save_index()
             QtWidgets.QApplication.quit()
 
 
+class ProcessTableDialog(QtWidgets.QDialog):
+    """Tabela dos processos iniciados pela toolbar"""
+
+    COLUMNS = ["PID", "Atalho", "Início", "Código de saída", "Tempo", "CPU", "Memória"]
+
+    def __init__(self, supervisor, prefetcher, resource_sampler, parent=None):
+        super().__init__(parent)
+        self.supervisor = supervisor
+        self.prefetcher = prefetcher
+        self.resource_sampler = resource_sampler
+        self.setWindowTitle("Processos Iniciados")
+        self.resize(680, 320)
+
+        layout = QtWidgets.QVBoxLayout(self)
+
+        self.table = QtWidgets.QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        # Tempo até criar o processo com o executável pré-aquecido ou frio
+        self.prefetch_label = QtWidgets.QLabel()
+        layout.addWidget(self.prefetch_label)
+
+        refresh_btn = QtWidgets.QPushButton("Atualizar")
+        refresh_btn.clicked.connect(self.refresh)
+        layout.addWidget(refresh_btn)
+
+        # Atualiza a tabela quando um processo termina
+        self.supervisor.process_exited.connect(self.refresh)
+
+    def refresh(self):
+        """Preenche a tabela com o estado atual do supervisor"""
+        rows = self.supervisor.table()
+        self.table.setRowCount(len(rows))
+        for row, child in enumerate(rows):
+            exit_code = "em execução" if child.running() else str(child.exit_code)
+            values = [
+                str(child.pid),
+                child.name,
+                QtCore.QDateTime.fromSecsSinceEpoch(int(child.started)).toString("dd/MM HH:mm:ss"),
+                exit_code,
+                f"{child.elapsed():.1f} s",
+                "",
+                ""
+            ]
+            history = self.resource_sampler.histories.get(child.pid) if child.running() else None
+            latest = history.latest() if history is not None else None
+            if latest is not None:
+                values[5] = f"{latest[0]:.0f}%"
+                values[6] = f"{latest[1] / (1024 * 1024):.0f} MB"
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QtWidgets.QTableWidgetItem(value))
+
+        parts = []
+        for label, summary in (("aquecidos", self.prefetcher.stats()["warm"]),
+                               ("frios", self.prefetcher.stats()["cold"])):
+            median = "-" if summary["median_ms"] is None else f"{summary['median_ms']:.1f} ms"
+            parts.append(f"{label}: {median} ({summary['launches']} execuções)")
+        sampler = self.resource_sampler.stats()
+        self.prefetch_label.setText(
+            "Tempo até criar o processo (mediana) — " + ", ".join(parts) +
+            f"\nAmostragem de CPU/memória: {sampler['average_cost_ms']:.2f} ms "
+            f"a cada {sampler['interval_ms'] / 1000:.0f} s")
+
+
 class ConfigDialog(QtWidgets.QDialog):
     """Diálogo para configuração geral da toolbar"""
 
+    @tracer.traced()
     def __init__(self, config, parent=None):
         super().__init__(parent)
         self.config = config.copy()
+        # Atalhos e categorias normalizados uma vez; as edições são feitas no modelo
+        self.model = ConfigModel.from_config(config)
 
         self.setWindowTitle("Configurações da Toolbar")
         self.resize(700, 500)
@@ -777,6 +1413,43 @@ class ConfigDialog(QtWidgets.QDialog):
         position_layout.addWidget(self.position_combo)
         position_layout.addWidget(apply_position_btn)
 
+        # Opção para o modo de exibição dos atalhos
+        renderer_group = QtWidgets.QGroupBox("Exibição dos Atalhos")
+        renderer_layout = QtWidgets.QVBoxLayout(renderer_group)
+
+        self.renderer_combo = QtWidgets.QComboBox()
+        self.renderer_combo.addItems(["Um botão por atalho", "Faixa única (muitos atalhos)"])
+        if self.config["settings"]["renderer"] == "strip":
+            self.renderer_combo.setCurrentIndex(1)
+
+        renderer_layout.addWidget(self.renderer_combo)
+
+        # Opção para o tema de cores
+        theme_group = QtWidgets.QGroupBox("Tema")
+        theme_layout = QtWidgets.QVBoxLayout(theme_group)
+
+        self.theme_combo = QtWidgets.QComboBox()
+        for theme_name, label in themes.THEME_LABELS.items():
+            self.theme_combo.addItem(label, theme_name)
+        theme_index = self.theme_combo.findData(self.config["settings"]["theme"])
+        self.theme_combo.setCurrentIndex(max(theme_index, 0))
+        self.theme_combo.currentIndexChanged.connect(self.update_theme_preview)
+
+        theme_layout.addWidget(self.theme_combo)
+
+        # Opção para atalhos que já estão em execução
+        running_group = QtWidgets.QGroupBox("Atalho Já Aberto")
+        running_layout = QtWidgets.QVBoxLayout(running_group)
+
+        self.running_combo = QtWidgets.QComboBox()
+        self.running_combo.addItem("Abrir outra cópia", "launch")
+        self.running_combo.addItem("Perguntar", "confirm")
+        self.running_combo.addItem("Não abrir", "skip")
+        running_index = self.running_combo.findData(self.config["settings"]["running_policy"])
+        self.running_combo.setCurrentIndex(max(running_index, 0))
+
+        running_layout.addWidget(self.running_combo)
+
         # Opção para transparência
         transparency_group = QtWidgets.QGroupBox("Transparência")
         transparency_layout = QtWidgets.QVBoxLayout(transparency_group)
@@ -793,14 +1466,12 @@ class ConfigDialog(QtWidgets.QDialog):
         self.transparency_label = QtWidgets.QLabel(
             f"Opacidade: {current_opacity}%")
 
-        # Cria uma prévia da transparência
-        self.preview_frame = QtWidgets.QFrame()
+        # Cria uma prévia da transparência (pintada com as cores do tema)
+        self.preview_frame = OpacityFrame(radius=5)
         self.preview_frame.setMinimumHeight(40)
-        self.preview_frame.setStyleSheet(f"""
-            background-color: rgba(50, 50, 50, {int(current_opacity * 255 / 100)});
-            border-radius: 5px;
-            border: 1px solid rgba(100, 100, 100, 200);
-        """)
+        preview_colors = themes.theme_colors(self.config["settings"]["theme"])
+        self.preview_frame.set_colors(preview_colors["frame"], preview_colors["border"])
+        self.preview_frame.set_opacity(current_opacity)
 
         apply_transparency_btn = QtWidgets.QPushButton("Aplicar Transparência")
         apply_transparency_btn.clicked.connect(self.apply_transparency)
@@ -812,17 +1483,22 @@ class ConfigDialog(QtWidgets.QDialog):
 
         layout.addWidget(self.startup_check)
         layout.addWidget(position_group)
+        layout.addWidget(renderer_group)
+        layout.addWidget(theme_group)
+        layout.addWidget(running_group)
         layout.addWidget(transparency_group)
         layout.addStretch()
 
     def update_transparency_preview(self, value):
         """Atualiza a prévia de transparência ao mover o slider"""
         self.transparency_label.setText(f"Opacidade: {value}%")
-        self.preview_frame.setStyleSheet(f"""
-            background-color: rgba(50, 50, 50, {int(value * 255 / 100)});
-            border-radius: 5px;
-            border: 1px solid rgba(100, 100, 100, 200);
-        """)
+        # Só repinta a prévia; nenhuma folha de estilos é reprocessada
+        self.preview_frame.set_opacity(value)
+
+    def update_theme_preview(self, index):
+        """Mostra as cores do tema selecionado na prévia de transparência"""
+        colors = themes.theme_colors(self.theme_combo.itemData(index))
+        self.preview_frame.set_colors(colors["frame"], colors["border"])
 
     def apply_position(self):
         """Aplica a posição selecionada à toolbar"""
@@ -873,49 +1549,9 @@ class ConfigDialog(QtWidgets.QDialog):
     def apply_transparency(self):
         """Aplica a transparência selecionada à toolbar"""
         opacity = self.transparency_slider.value()
-        alpha_value = int(opacity * 255 / 100)
-
-        # Obtém o styleSheet atual da toolbar
-        current_style = self.parent().frame.styleSheet()
-
-        # Substitui o valor de transparência no background-color
-        new_style = ""
-        for line in current_style.split("}"):
-            if "#toolbarFrame" in line and "background-color" in line:
-                # Substitui o valor RGBA mantendo a cor
-                parts = line.split("background-color:")
-                prefix = parts[0]
-
-                # Extrai os valores RGB do RGBA atual
-                rgba_part = parts[1].split(";")[0].strip()
-                try:
-                    rgba_values = rgba_part.split(
-                        "rgba(")[1].split(")")[0].split(",")
-                    r = rgba_values[0].strip()
-                    g = rgba_values[1].strip()
-                    b = rgba_values[2].strip()
-
-                    # Reconstrói com o novo valor alpha
-                    new_line = f"{prefix}background-color: rgba({r}, {g}, {b}, {alpha_value});"
-
-                    # Adiciona o resto das propriedades
-                    for prop in parts[1].split(";")[1:]:
-                        if prop.strip():
-                            new_line += f" {prop.strip()};"
-
-                    new_style += new_line + "}"
-                except:
-                    # Se falhar na extração, mantém a linha original
-                    new_style += line + "}"
-            else:
-                new_style += line + "}" if line.strip() else ""
 
-        # Remove o último caractere } extra
-        if new_style.endswith("}"):
-            new_style = new_style[:-1]
-
-        # Aplica o novo estilo
-        self.parent().frame.setStyleSheet(new_style)
+        # Muda só a propriedade de opacidade do frame (repinta sem reprocessar estilos)
+        self.parent().frame.set_opacity(opacity)
 
         # Salva a opacidade na configuração
         self.config["settings"]["opacity"] = opacity
@@ -927,83 +1563,66 @@ class ConfigDialog(QtWidgets.QDialog):
     def update_quick_list(self):
         """Atualiza a lista de atalhos rápidos"""
         self.quick_list.clear()
-        for shortcut in self.config["quick_shortcuts"]:
-            self.quick_list.addItem(shortcut["name"])
+        for shortcut in self.model.quick_shortcuts:
+            self.quick_list.addItem(shortcut.name)
 
     def update_categories_list(self):
-        """Atualiza a lista de categorias"""
+        """Atualiza a lista de categorias (cada item guarda o id da categoria)"""
         self.categories_list.clear()
-        for category_key in self.config["categories"]:
-            # Se a categoria for um dicionário, usar o nome do dicionário
-            if isinstance(self.config["categories"][category_key], dict) and "name" in self.config["categories"][category_key]:
-                self.categories_list.addItem(
-                    self.config["categories"][category_key]["name"])
-            else:
-                # Caso contrário, usar a chave (formato antigo)
-                self.categories_list.addItem(category_key)
+        self.category_items = {}  # id da categoria -> item da lista
+        for category in self.model.categories.values():
+            item = QtWidgets.QListWidgetItem(category.name)
+            item.setData(QtCore.Qt.UserRole, category.id)
+            self.categories_list.addItem(item)
+            self.category_items[category.id] = item
+
+    def current_category(self):
+        """Categoria selecionada na lista, ou None"""
+        item = self.categories_list.currentItem()
+        if item is None:
+            return None
+        return self.model.by_id.get(item.data(QtCore.Qt.UserRole))
+
+    def select_category(self, category):
+        """Seleciona uma categoria na lista"""
+        self.categories_list.setCurrentItem(self.category_items[category.id])
 
     def category_selected(self, current, previous):
         """Atualiza a lista de atalhos quando uma categoria é selecionada"""
         self.shortcuts_list.clear()
-        if current:
-            category_name = current.text()
-
-            # Busca a chave da categoria pelo nome exibido
-            category_key = category_name
-            for key in self.config["categories"]:
-                if (isinstance(self.config["categories"][key], dict) and
-                        self.config["categories"][key].get("name") == category_name):
-                    category_key = key
-                    break
-
-            # Obtém os atalhos da categoria
-            category_data = self.config["categories"][category_key]
-            shortcuts = []
-
-            if isinstance(category_data, dict) and "shortcuts" in category_data:
-                shortcuts = category_data["shortcuts"]
-            else:
-                shortcuts = category_data
-
-            for shortcut in shortcuts:
-                self.shortcuts_list.addItem(shortcut["name"])
+        category = self.current_category() if current else None
+        if category is not None:
+            for shortcut in category.shortcuts:
+                self.shortcuts_list.addItem(shortcut.name)
 
     def add_quick_shortcut(self):
         """Adiciona um novo atalho rápido"""
         dialog = QuickShortcutDialog(self)
         if dialog.exec_():
-            name, exe, args, icon, tooltip = dialog.get_values()
-            self.config["quick_shortcuts"].append({
-                "name": name,
-                "exe": exe,
-                "args": args,
-                "icon": icon,
-                "tooltip": tooltip
-            })
+            name, exe, args, icon, tooltip, capture_output = dialog.get_values()
+            self.model.add_quick_shortcut(
+                Shortcut(name, exe, args, icon, tooltip, True if capture_output else None))
             self.update_quick_list()
 
     def edit_quick_shortcut(self):
         """Edita um atalho rápido existente"""
         current_row = self.quick_list.currentRow()
         if current_row >= 0:
-            shortcut = self.config["quick_shortcuts"][current_row]
+            shortcut = self.model.quick_shortcuts[current_row]
             dialog = QuickShortcutDialog(
                 self,
-                shortcut["name"],
-                shortcut["exe"],
-                shortcut["args"],
-                shortcut.get("icon", ""),
-                shortcut.get("tooltip", "")
+                shortcut.name or "",
+                shortcut.exe or "",
+                shortcut.args,
+                shortcut.icon or "",
+                shortcut.tooltip or "",
+                bool(shortcut.capture_output)
             )
             if dialog.exec_():
-                name, exe, args, icon, tooltip = dialog.get_values()
-                self.config["quick_shortcuts"][current_row] = {
-                    "name": name,
-                    "exe": exe,
-                    "args": args,
-                    "icon": icon,
-                    "tooltip": tooltip
-                }
+                name, exe, args, icon, tooltip, capture_output = dialog.get_values()
+                # Atualiza o registro: as chaves que o diálogo não mostra são mantidas
+                shortcut.update(name=name, exe=exe, args=args, icon=icon, tooltip=tooltip,
+                                capture_output=capture_output)
                 self.update_quick_list()
 
     def remove_quick_shortcut(self):
@@ -1017,17 +1636,14 @@ class ConfigDialog(QtWidgets.QDialog):
                 QtWidgets.QMessageBox.No
             )
             if reply == QtWidgets.QMessageBox.Yes:
-                del self.config["quick_shortcuts"][current_row]
+                self.model.remove_quick_shortcut(current_row)
                 self.update_quick_list()
 
     def move_quick_up(self):
         """Move um atalho rápido para cima na lista"""
         current_row = self.quick_list.currentRow()
         if current_row > 0:
-            # Troca a posição no config
-            self.config["quick_shortcuts"][current_row], self.config["quick_shortcuts"][current_row-1] = \
-                self.config["quick_shortcuts"][current_row -
-                                               1], self.config["quick_shortcuts"][current_row]
+            self.model.move_quick_shortcut(current_row, current_row - 1)
 
             # Atualiza a lista e seleciona o item movido
             self.update_quick_list()
@@ -1036,11 +1652,8 @@ class ConfigDialog(QtWidgets.QDialog):
     def move_quick_down(self):
         """Move um atalho rápido para baixo na lista"""
         current_row = self.quick_list.currentRow()
-        if current_row >= 0 and current_row < len(self.config["quick_shortcuts"]) - 1:
-            # Troca a posição no config
-            self.config["quick_shortcuts"][current_row], self.config["quick_shortcuts"][current_row+1] = \
-                self.config["quick_shortcuts"][current_row +
-                                               1], self.config["quick_shortcuts"][current_row]
+        if current_row >= 0 and current_row < len(self.model.quick_shortcuts) - 1:
+            self.model.move_quick_shortcut(current_row, current_row + 1)
 
             # Atualiza a lista e seleciona o item movido
             self.update_quick_list()
@@ -1093,56 +1706,25 @@ class ConfigDialog(QtWidgets.QDialog):
                 return
 
             # Verifica se já existe uma categoria com esse nome
-            for key in self.config["categories"]:
-                category_name = key
-                if isinstance(self.config["categories"][key], dict) and "name" in self.config["categories"][key]:
-                    category_name = self.config["categories"][key]["name"]
-
-                if category_name == name:
-                    QtWidgets.QMessageBox.warning(
-                        self, 'Aviso', 'Esta categoria já existe.')
-                    return
+            if self.model.category_named(name) is not None:
+                QtWidgets.QMessageBox.warning(
+                    self, 'Aviso', 'Esta categoria já existe.')
+                return
 
             # Cria a categoria no formato novo com ícone
-            self.config["categories"][name] = {
-                "name": name,
-                "icon": icon_path,
-                "shortcuts": []
-            }
+            category = self.model.add_category(name, icon_path)
 
             self.update_categories_list()
 
             # Seleciona a nova categoria
-            items = self.categories_list.findItems(
-                name, QtCore.Qt.MatchExactly)
-            if items:
-                self.categories_list.setCurrentItem(items[0])
+            self.select_category(category)
 
     def edit_category(self):
         """Edita uma categoria existente (renomeia e configura ícone)"""
-        current_item = self.categories_list.currentItem()
-        if current_item:
-            old_name = current_item.text()
-
-            # Encontra a chave da categoria pelo nome exibido
-            category_key = None
-            for key in self.config["categories"]:
-                category_name = key
-                if isinstance(self.config["categories"][key], dict) and "name" in self.config["categories"][key]:
-                    category_name = self.config["categories"][key]["name"]
-
-                if category_name == old_name:
-                    category_key = key
-                    break
-
-            if not category_key:
-                return
-
-            # Recupera os dados da categoria atual
-            category_data = self.config["categories"][category_key]
-            current_icon = ""
-            if isinstance(category_data, dict) and "icon" in category_data:
-                current_icon = category_data["icon"]
+        category = self.current_category()
+        if category is not None:
+            old_name = category.name
+            current_icon = category.icon or ""
 
             # Cria um diálogo para editar a categoria
             dialog = QtWidgets.QDialog(self)
@@ -1189,192 +1771,79 @@ class ConfigDialog(QtWidgets.QDialog):
                     return
 
                 # Verifica se já existe outra categoria com esse nome
-                if new_name != old_name:
-                    for key in self.config["categories"]:
-                        if key == category_key:
-                            continue  # Ignora a categoria atual
-
-                        cat_name = key
-                        if isinstance(self.config["categories"][key], dict) and "name" in self.config["categories"][key]:
-                            cat_name = self.config["categories"][key]["name"]
-
-                        if cat_name == new_name:
-                            QtWidgets.QMessageBox.warning(
-                                self, 'Aviso', 'Esta categoria já existe.')
-                            return
-
-                # Atualiza os dados da categoria
-                if isinstance(category_data, dict):
-                    # Se já está no formato novo, atualizamos os campos
-                    category_data["name"] = new_name
-                    category_data["icon"] = icon_path
-                else:
-                    # Se está no formato antigo, convertemos para o novo formato
-                    shortcuts = category_data
-                    self.config["categories"][category_key] = {
-                        "name": new_name,
-                        "icon": icon_path,
-                        "shortcuts": shortcuts
-                    }
+                existing = self.model.category_named(new_name)
+                if existing is not None and existing is not category:
+                    QtWidgets.QMessageBox.warning(
+                        self, 'Aviso', 'Esta categoria já existe.')
+                    return
 
-                # Se o nome mudou, atualizar também a chave do dicionário
-                if new_name != old_name and category_key == old_name:
-                    # Cria nova entrada com o novo nome
-                    self.config["categories"][new_name] = self.config["categories"][category_key]
-                    # Remove entrada antiga
-                    del self.config["categories"][category_key]
+                # Atualiza os dados (no formato antigo, converte para o novo)
+                self.model.rename_category(category, new_name, icon_path)
 
                 self.update_categories_list()
 
                 # Seleciona a categoria editada
-                items = self.categories_list.findItems(
-                    new_name, QtCore.Qt.MatchExactly)
-                if items:
-                    self.categories_list.setCurrentItem(items[0])
+                self.select_category(category)
 
     def remove_category(self):
         """Remove uma categoria existente"""
-        current_item = self.categories_list.currentItem()
-        if current_item:
-            category_name = current_item.text()
-
+        category = self.current_category()
+        if category is not None:
             reply = QtWidgets.QMessageBox.question(
                 self, 'Confirmação',
-                f"Deseja remover a categoria '{category_name}' e todos os seus atalhos?",
+                f"Deseja remover a categoria '{category.name}' e todos os seus atalhos?",
                 QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
                 QtWidgets.QMessageBox.No
             )
 
             if reply == QtWidgets.QMessageBox.Yes:
-                # Encontra a chave da categoria pelo nome exibido
-                for key in list(self.config["categories"].keys()):
-                    cat_name = key
-                    if isinstance(self.config["categories"][key], dict) and "name" in self.config["categories"][key]:
-                        cat_name = self.config["categories"][key]["name"]
-
-                    if cat_name == category_name:
-                        del self.config["categories"][key]
-                        break
+                self.model.remove_category(category)
 
                 self.update_categories_list()
                 self.shortcuts_list.clear()
 
     def add_category_shortcut(self):
         """Adiciona um atalho a uma categoria"""
-        current_category = self.categories_list.currentItem()
-        if current_category:
-            category_name = current_category.text()
-
-            # Encontra a chave da categoria pelo nome exibido
-            category_key = None
-            for key in self.config["categories"]:
-                cat_name = key
-                if isinstance(self.config["categories"][key], dict) and "name" in self.config["categories"][key]:
-                    cat_name = self.config["categories"][key]["name"]
-
-                if cat_name == category_name:
-                    category_key = key
-                    break
-
-            if not category_key:
-                return
-
+        category = self.current_category()
+        if category is not None:
             dialog = ShortcutDialog(self)
             if dialog.exec_():
-                name, exe, args = dialog.get_values()
-                new_shortcut = {
-                    "name": name,
-                    "exe": exe,
-                    "args": args
-                }
-
-                # Adiciona o atalho à categoria (considerando o formato)
-                if isinstance(self.config["categories"][category_key], dict) and "shortcuts" in self.config["categories"][category_key]:
-                    self.config["categories"][category_key]["shortcuts"].append(
-                        new_shortcut)
-                else:
-                    # Formato antigo: a chave é o nome e o valor é a lista
-                    self.config["categories"][category_key].append(
-                        new_shortcut)
+                name, exe, args, capture_output = dialog.get_values()
+                self.model.add_shortcut(
+                    category, Shortcut(name, exe, args, capture_output=True if capture_output else None))
 
                 # Atualiza a lista de atalhos
                 self.shortcuts_list.addItem(name)
 
     def edit_category_shortcut(self):
         """Edita um atalho em uma categoria"""
-        current_category = self.categories_list.currentItem()
+        category = self.current_category()
         current_shortcut = self.shortcuts_list.currentRow()
 
-        if current_category and current_shortcut >= 0:
-            category_name = current_category.text()
-
-            # Encontra a chave da categoria pelo nome exibido
-            category_key = None
-            for key in self.config["categories"]:
-                cat_name = key
-                if isinstance(self.config["categories"][key], dict) and "name" in self.config["categories"][key]:
-                    cat_name = self.config["categories"][key]["name"]
-
-                if cat_name == category_name:
-                    category_key = key
-                    break
-
-            if not category_key:
-                return
-
-            # Obtém o atalho atual
-            shortcut = None
-            if isinstance(self.config["categories"][category_key], dict) and "shortcuts" in self.config["categories"][category_key]:
-                shortcut = self.config["categories"][category_key]["shortcuts"][current_shortcut]
-            else:
-                shortcut = self.config["categories"][category_key][current_shortcut]
-
+        if category is not None and current_shortcut >= 0:
+            shortcut = category.shortcuts[current_shortcut]
             dialog = ShortcutDialog(
                 self,
-                shortcut["name"],
-                shortcut["exe"],
-                shortcut["args"]
+                shortcut.name or "",
+                shortcut.exe or "",
+                shortcut.args,
+                bool(shortcut.capture_output)
             )
 
             if dialog.exec_():
-                name, exe, args = dialog.get_values()
-                updated_shortcut = {
-                    "name": name,
-                    "exe": exe,
-                    "args": args
-                }
-
-                # Atualiza o atalho na categoria
-                if isinstance(self.config["categories"][category_key], dict) and "shortcuts" in self.config["categories"][category_key]:
-                    self.config["categories"][category_key]["shortcuts"][current_shortcut] = updated_shortcut
-                else:
-                    self.config["categories"][category_key][current_shortcut] = updated_shortcut
+                name, exe, args, capture_output = dialog.get_values()
+                # Atualiza o registro: ícone, dica e demais chaves do atalho são mantidos
+                shortcut.update(name=name, exe=exe, args=args, capture_output=capture_output)
 
                 # Atualiza o item na lista
                 self.shortcuts_list.item(current_shortcut).setText(name)
 
     def remove_category_shortcut(self):
         """Remove um atalho de uma categoria"""
-        current_category = self.categories_list.currentItem()
+        category = self.current_category()
         current_shortcut = self.shortcuts_list.currentRow()
 
-        if current_category and current_shortcut >= 0:
-            category_name = current_category.text()
-
-            # Encontra a chave da categoria pelo nome exibido
-            category_key = None
-            for key in self.config["categories"]:
-                cat_name = key
-                if isinstance(self.config["categories"][key], dict) and "name" in self.config["categories"][key]:
-                    cat_name = self.config["categories"][key]["name"]
-
-                if cat_name == category_name:
-                    category_key = key
-                    break
-
-            if not category_key:
-                return
-
+        if category is not None and current_shortcut >= 0:
             reply = QtWidgets.QMessageBox.question(
                 self, 'Confirmação',
                 "Deseja remover este atalho?",
@@ -1383,12 +1852,7 @@ class ConfigDialog(QtWidgets.QDialog):
             )
 
             if reply == QtWidgets.QMessageBox.Yes:
-                # Remove o atalho da categoria
-                if isinstance(self.config["categories"][category_key], dict) and "shortcuts" in self.config["categories"][category_key]:
-                    del self.config["categories"][category_key]["shortcuts"][current_shortcut]
-                else:
-                    del self.config["categories"][category_key][current_shortcut]
-
+                self.model.remove_shortcut(category, current_shortcut)
                 self.shortcuts_list.takeItem(current_shortcut)
 
     def is_in_startup(self):
@@ -1436,6 +1900,18 @@ class ConfigDialog(QtWidgets.QDialog):
 
     def accept(self):
         """Salva as configurações ao aceitar o diálogo"""
+        # Modo de exibição dos atalhos
+        if self.renderer_combo.currentIndex() == 1:
+            self.config["settings"]["renderer"] = "strip"
+        else:
+            self.config["settings"]["renderer"] = "buttons"
+
+        # Tema de cores
+        self.config["settings"]["theme"] = self.theme_combo.currentData()
+
+        # Comportamento com atalhos já em execução
+        self.config["settings"]["running_policy"] = self.running_combo.currentData()
+
         # Configura inicialização com Windows
         try:
             autostart = self.startup_check.isChecked()
@@ -1454,13 +1930,14 @@ class ConfigDialog(QtWidgets.QDialog):
 
     def get_config(self):
         """Retorna a configuração atualizada"""
-        return self.config
+        return self.model.to_config(self.config)
 
 
 class QuickShortcutDialog(QtWidgets.QDialog):
     """Diálogo para adicionar ou editar um atalho rápido"""
 
-    def __init__(self, parent=None, name="", exe="", args=None, icon="", tooltip=""):
+    def __init__(self, parent=None, name="", exe="", args=None, icon="", tooltip="",
+                 capture_output=False):
         super().__init__(parent)
         self.setWindowTitle("Configurar Atalho Rápido")
         self.resize(500, 300)
@@ -1478,6 +1955,8 @@ class QuickShortcutDialog(QtWidgets.QDialog):
             " ".join(args) if isinstance(args, list) else args)
         self.icon_input = QtWidgets.QLineEdit(icon)
         self.tooltip_input = QtWidgets.QLineEdit(tooltip)
+        self.capture_check = QtWidgets.QCheckBox("Capturar a saída (ver em \"Saída dos processos\")")
+        self.capture_check.setChecked(capture_output)
 
         browse_exe_btn = QtWidgets.QPushButton("Procurar...")
         browse_exe_btn.clicked.connect(self.browse_exe)
@@ -1498,6 +1977,7 @@ class QuickShortcutDialog(QtWidgets.QDialog):
         form_layout.addRow("Argumentos:", self.args_input)
         form_layout.addRow("Ícone (opcional):", icon_layout)
         form_layout.addRow("Dica de Ferramenta:", self.tooltip_input)
+        form_layout.addRow("", self.capture_check)
 
         buttons = QtWidgets.QDialogButtonBox(
             QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel,
@@ -1529,13 +2009,14 @@ class QuickShortcutDialog(QtWidgets.QDialog):
         args = self.args_input.text().strip().split()
         icon = self.icon_input.text().strip()
         tooltip = self.tooltip_input.text().strip()
-        return name, exe, args, icon, tooltip
+        capture_output = self.capture_check.isChecked()
+        return name, exe, args, icon, tooltip, capture_output
 
 
 class ShortcutDialog(QtWidgets.QDialog):
     """Diálogo para adicionar ou editar um atalho"""
 
-    def __init__(self, parent=None, name="", exe="", args=None):
+    def __init__(self, parent=None, name="", exe="", args=None, capture_output=False):
         super().__init__(parent)
         self.setWindowTitle("Configurar Atalho")
         self.resize(500, 200)
@@ -1551,6 +2032,8 @@ class ShortcutDialog(QtWidgets.QDialog):
         self.exe_input = QtWidgets.QLineEdit(exe)
         self.args_input = QtWidgets.QLineEdit(
             " ".join(args) if isinstance(args, list) else args)
+        self.capture_check = QtWidgets.QCheckBox("Capturar a saída (ver em \"Saída dos processos\")")
+        self.capture_check.setChecked(capture_output)
 
         browse_btn = QtWidgets.QPushButton("Procurar...")
         browse_btn.clicked.connect(self.browse_exe)
@@ -1562,6 +2045,7 @@ class ShortcutDialog(QtWidgets.QDialog):
         form_layout.addRow("Nome:", self.name_input)
         form_layout.addRow("Executável:", exe_layout)
         form_layout.addRow("Argumentos:", self.args_input)
+        form_layout.addRow("", self.capture_check)
 
         buttons = QtWidgets.QDialogButtonBox(
             QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel,
@@ -1584,11 +2068,38 @@ class ShortcutDialog(QtWidgets.QDialog):
         name = self.name_input.text().strip()
         exe = self.exe_input.text().strip()
         args = self.args_input.text().strip().split()
-        return name, exe, args
+        capture_output = self.capture_check.isChecked()
+        return name, exe, args, capture_output
 
 
 if __name__ == "__main__":
-    app = QtWidgets.QApplication(sys.argv)
+    # Ícones nítidos em telas HiDPI (os ícones trazem variantes por DPR)
+    QtWidgets.QApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling)
+    QtWidgets.QApplication.setAttribute(QtCore.Qt.AA_UseHighDpiPixmaps)
+    # Rastreamento opcional (TOOLBAR_TRACE ou --trace): mede também o despacho dos eventos do Qt
+    if tracer.enable_from_environment(sys.argv):
+        app = tracer.tracing_application_class()(sys.argv)
+    else:
+        app = QtWidgets.QApplication(sys.argv)
     toolbar = FloatingToolbar()
     toolbar.show()
+
+    # Auditoria dos despertares com a toolbar parada: relatório no console a cada minuto
+    if "--audit-wakeups" in sys.argv:
+        from wakeup_audit import WakeupAuditor
+        auditor = WakeupAuditor()
+        auditor.start()
+        audit_timer = QtCore.QTimer()
+        audit_timer.timeout.connect(lambda: (print("\n".join(auditor.report())), auditor.reset()))
+        audit_timer.start(60000)
+
+    # Gravação das interações para reprodução com interaction_replay.py (salva ao sair)
+    if "--record" in sys.argv:
+        from interaction_replay import Recorder
+        index = sys.argv.index("--record")
+        record_path = sys.argv[index + 1] if index + 1 < len(sys.argv) else os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "toolbar_session.json")
+        recorder = Recorder(toolbar)
+        recorder.start()
+        app.aboutToQuit.connect(lambda: recorder.save(record_path))
     sys.exit(app.exec_())
@@ -0,0 +1,200 @@
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from PyQt5 import QtGui
+
+
+class IconCache:
+    """Cache persistente em disco (PNG) para os ícones de arquivo decodificados.
+
+    Só os ícones caros de obter (imagens e executáveis PE) vão para o disco;
+    os ícones gerados (letra, engrenagem) são desenhados mais rápido do que
+    um PNG é lido e ficam só em memória. Os PNGs são gravados pelas tarefas
+    de decodificação, fora da thread da interface.
+    """
+
+    INDEX_FILE = "index.json"
+    # Versão 2: sem os ícones gerados (o índice antigo é descartado uma vez)
+    INDEX_VERSION = 2
+
+    def __init__(self, cache_dir, max_bytes=32 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+        # Contadores de acertos e falhas do cache
+        self.hits = 0
+        self.misses = 0
+
+        # chave -> tamanho do arquivo em bytes (a ordem do dicionário é a ordem LRU)
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+
+        # Chaves de arquivos sem ícone utilizável (ex.: executável sem recursos de ícone)
+        self.missing = set()
+
+        # Imagens já lidas nesta sessão (evita reler o disco a cada reconstrução)
+        self.memory = {}
+
+        self.dirty = False
+        self.load_index()
+
+    @staticmethod
+    def file_key(path, size):
+        """Chave para um ícone de arquivo: caminho + mtime + tamanho do arquivo"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        raw = f"file|{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{size}"
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    def entry_path(self, key):
+        """Caminho do PNG de uma entrada do cache"""
+        return os.path.join(self.cache_dir, key + ".png")
+
+    def load_index(self):
+        """Carrega o índice do cache; um índice inválido descarta o cache inteiro"""
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get("version") != self.INDEX_VERSION:
+                raise ValueError("versão de índice incompatível")
+            for key, size in index["entries"]:
+                self.entries[key] = size
+                self.total_bytes += size
+            self.missing.update(index.get("missing", []))
+        except FileNotFoundError:
+            self.clear()
+        except Exception as e:
+            print(f"Erro ao carregar o cache de ícones: {e}")
+            self.clear()
+
+    def save_index(self):
+        """Grava o índice do cache se houve alterações"""
+        if not self.dirty:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+            tmp_path = index_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "version": self.INDEX_VERSION,
+                    "entries": [[key, size] for key, size in self.entries.items()],
+                    "missing": sorted(self.missing)
+                }, f)
+            os.replace(tmp_path, index_path)
+            self.dirty = False
+        except Exception as e:
+            print(f"Erro ao salvar o cache de ícones: {e}")
+
+    def clear(self):
+        """Remove todas as entradas (e os PNGs órfãos) do cache"""
+        self.entries.clear()
+        self.missing.clear()
+        self.memory.clear()
+        self.total_bytes = 0
+        self.dirty = True
+        if os.path.isdir(self.cache_dir):
+            for file_name in os.listdir(self.cache_dir):
+                if file_name.endswith(".png"):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, file_name))
+                    except OSError:
+                        pass
+
+    def mark_missing(self, key):
+        """Registra que o arquivo da chave não tem ícone (evita novas tentativas)"""
+        if key not in self.missing:
+            self.missing.add(key)
+            self.dirty = True
+
+    def is_missing(self, key):
+        """Indica se o arquivo da chave já foi registrado como sem ícone"""
+        return key in self.missing
+
+    def get_image(self, key):
+        """Retorna a QImage em cache para a chave, ou None se não existir"""
+        if key is None or key not in self.entries:
+            self.misses += 1
+            return None
+
+        image = self.memory.get(key)
+        if image is None:
+            image = QtGui.QImage(self.entry_path(key))
+            if image.isNull():
+                # Arquivo apagado ou corrompido: descarta a entrada
+                self.discard(key)
+                self.misses += 1
+                return None
+            self.memory[key] = image
+
+        # A ordem LRU só vai para o disco junto com a próxima inserção ou despejo
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return image
+
+    def write_image(self, key, image):
+        """Grava o PNG de uma entrada; retorna o tamanho em bytes ou None.
+
+        Só faz E/S (não mexe no índice): é chamado pelas tarefas de
+        decodificação, fora da thread da interface.
+        """
+        if key is None or image.isNull():
+            return None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self.entry_path(key)
+            if not image.save(path, "PNG"):
+                return None
+            return os.path.getsize(path)
+        except OSError as e:
+            print(f"Erro ao gravar ícone no cache: {e}")
+            return None
+
+    def add_entry(self, key, size, image):
+        """Registra no índice um PNG já gravado por write_image (thread da interface)"""
+        if key in self.entries:
+            self.total_bytes -= self.entries[key]
+        self.entries[key] = size
+        self.entries.move_to_end(key)
+        self.total_bytes += size
+        self.memory[key] = image
+        self.dirty = True
+        self.evict()
+
+    def discard(self, key):
+        """Remove uma entrada do cache"""
+        size = self.entries.pop(key, None)
+        if size is None:
+            return
+        self.total_bytes -= size
+        self.memory.pop(key, None)
+        self.dirty = True
+        try:
+            os.remove(self.entry_path(key))
+        except OSError:
+            pass
+
+    def evict(self):
+        """Despeja as entradas menos usadas até respeitar o limite de tamanho"""
+        while self.entries and self.total_bytes > self.max_bytes:
+            oldest_key = next(iter(self.entries))
+            self.discard(oldest_key)
+
+    def hit_ratio(self):
+        """Proporção de acertos do cache nesta sessão"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """Resumo do estado do cache"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes
+        }
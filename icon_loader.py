@@ -0,0 +1,161 @@
+from PyQt5 import QtCore, QtGui
+from icon_cache import IconCache
+import pe_icons
+
+
+class IconLoadSignals(QtCore.QObject):
+    """Sinais emitidos pelas tarefas de decodificação (QRunnable não é QObject)"""
+
+    # caminho de origem, lista de (tamanho, chave do cache, imagem, veio do cache?, bytes gravados)
+    loaded = QtCore.pyqtSignal(str, object)
+    # caminho de origem, chave do arquivo sem ícone utilizável (ou "")
+    failed = QtCore.pyqtSignal(str, str)
+
+
+class IconLoadTask(QtCore.QRunnable):
+    """Decodifica um ícone (imagem ou executável PE) fora da thread da interface"""
+
+    def __init__(self, path, sizes, cache, signals):
+        super().__init__()
+        self.path = path
+        self.sizes = sizes
+        self.cache = cache
+        self.signals = signals
+
+    def run(self):
+        # O stat também pode bloquear (ex.: compartilhamento de rede), por isso fica aqui
+        source_key = IconCache.file_key(self.path, 0)
+        if source_key is None:
+            self.signals.failed.emit(self.path, "")
+            return
+
+        # Arquivo já conhecido por não ter ícone: não decodifica de novo
+        # (consultar o cache é atômico com o GIL; a escrita fica na thread da interface)
+        if self.cache.is_missing(source_key):
+            self.signals.failed.emit(self.path, "")
+            return
+
+        results = []
+        missing_sizes = []
+        for size in self.sizes:
+            key = IconCache.file_key(self.path, size)
+            if key is not None and key in self.cache.entries:
+                # Acerto no cache: lê o PNG já rasterizado em vez do arquivo original
+                image = QtGui.QImage(self.cache.entry_path(key))
+                if not image.isNull():
+                    results.append((size, key, image, True, None))
+                    continue
+            missing_sizes.append((size, key))
+
+        if missing_sizes:
+            # Decodifica a origem uma única vez no maior tamanho e reduz para os demais
+            largest = max(size for size, _ in missing_sizes)
+            image = self.decode(largest)
+            if image is None or image.isNull():
+                self.signals.failed.emit(self.path, source_key)
+                return
+
+            for size, key in missing_sizes:
+                variant = image
+                if image.width() > size or image.height() > size:
+                    variant = image.scaled(size, size, QtCore.Qt.KeepAspectRatio,
+                                           QtCore.Qt.SmoothTransformation)
+                # A codificação e a gravação do PNG também ficam fora da thread da interface
+                results.append((size, key, variant, False, self.cache.write_image(key, variant)))
+
+        self.signals.loaded.emit(self.path, results)
+
+    def decode(self, size):
+        """Decodifica a origem já no tamanho desejado quando o formato permite"""
+        if pe_icons.is_pe_path(self.path):
+            extracted = pe_icons.extract_icon(self.path, size)
+            if extracted is None:
+                return None
+            data, image_format = extracted
+            buffer = QtCore.QBuffer()
+            buffer.setData(QtCore.QByteArray(data))
+            buffer.open(QtCore.QIODevice.ReadOnly)
+            reader = QtGui.QImageReader(buffer, image_format.encode())
+        else:
+            reader = QtGui.QImageReader(self.path)
+            reader.setAutoTransform(True)
+
+        original_size = reader.size()
+        if original_size.isValid() and (original_size.width() > size or
+                                        original_size.height() > size):
+            reader.setScaledSize(original_size.scaled(
+                size, size, QtCore.Qt.KeepAspectRatio))
+        return reader.read()
+
+
+class IconLoader(QtCore.QObject):
+    """Carrega ícones de arquivo em um QThreadPool e avisa quando estiverem prontos"""
+
+    # caminho, {tamanho em pixels: QImage}
+    icon_loaded = QtCore.pyqtSignal(str, object)
+    icon_failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, icon_cache, parent=None):
+        super().__init__(parent)
+        self.icon_cache = icon_cache
+
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+
+        # Caminhos com decodificação em andamento
+        self.pending = set()
+
+        # (caminho, tamanho) -> chave do cache já resolvida nesta sessão
+        self.resolved = {}
+
+        self.signals = IconLoadSignals()
+        self.signals.loaded.connect(self.on_loaded)
+        self.signals.failed.connect(self.on_failed)
+
+    def request(self, path, sizes):
+        """Retorna {tamanho: QImage} se já estiver em memória; senão agenda a decodificação"""
+        images = {}
+        for size in sizes:
+            key = self.resolved.get((path, size))
+            image = self.icon_cache.memory.get(key) if key is not None else None
+            if image is None:
+                break
+            images[size] = image
+        else:
+            for size in sizes:
+                self.icon_cache.get_image(self.resolved[(path, size)])  # Atualiza LRU e contadores
+            return images
+
+        if path not in self.pending:
+            self.pending.add(path)
+            self.pool.start(IconLoadTask(path, tuple(sizes), self.icon_cache, self.signals))
+        return None
+
+    def on_loaded(self, path, results):
+        """Recebe as imagens decodificadas na thread da interface"""
+        self.pending.discard(path)
+        images = {}
+        for size, key, image, from_cache, written in results:
+            if from_cache:
+                self.icon_cache.memory[key] = image
+                self.icon_cache.get_image(key)
+            else:
+                self.icon_cache.misses += 1
+                if written is not None:
+                    self.icon_cache.add_entry(key, written, image)
+                else:
+                    self.icon_cache.memory[key] = image
+            self.resolved[(path, size)] = key
+            images[size] = image
+        self.icon_loaded.emit(path, images)
+
+    def on_failed(self, path, source_key):
+        """Descarta o pedido; lembra dos arquivos sem ícone para não decodificá-los de novo"""
+        self.pending.discard(path)
+        if source_key:
+            self.icon_cache.mark_missing(source_key)
+        self.icon_failed.emit(path)
+
+    def wait_for_done(self, msecs=-1):
+        """Aguarda as decodificações pendentes (usado ao encerrar)"""
+        return self.pool.waitForDone(msecs)
@@ -0,0 +1,187 @@
+import math
+import hashlib
+from PyQt5 import QtCore, QtGui
+from icon_loader import IconLoader
+
+
+# Tamanho de referência em que os ícones gerados foram desenhados originalmente
+DESIGN_SIZE = 32
+
+
+class IconPipeline(QtCore.QObject):
+    """Pré-rasteriza os ícones nos tamanhos exatos em pixels de cada tela"""
+
+    # caminho do arquivo, ícone com todas as variantes de DPR
+    file_icon_ready = QtCore.pyqtSignal(str, QtGui.QIcon)
+    file_icon_failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, icon_cache, parent=None):
+        super().__init__(parent)
+        self.icon_cache = icon_cache
+
+        self.loader = IconLoader(icon_cache, self)
+        self.loader.icon_loaded.connect(self.on_file_loaded)
+        self.loader.icon_failed.connect(self.on_file_failed)
+
+        # Razões de pixel (DPR) de todas as telas conectadas
+        self.dprs = self.screen_dprs()
+
+        # Ícones prontos nesta sessão: (tipo, nome, tamanho lógico) -> QIcon
+        self.icons = {}
+
+        # caminho -> tamanho lógico dos ícones de arquivo aguardando decodificação
+        self.file_requests = {}
+
+    @staticmethod
+    def screen_dprs():
+        """Conjunto ordenado de DPRs das telas (1.0 se não houver telas)"""
+        dprs = {screen.devicePixelRatio()
+                for screen in QtGui.QGuiApplication.screens()}
+        return tuple(sorted(dprs)) or (1.0,)
+
+    @staticmethod
+    def device_size(logical_size, dpr):
+        """Tamanho em pixels do dispositivo para um tamanho lógico"""
+        return max(1, int(math.ceil(logical_size * dpr)))
+
+    def update_dprs(self):
+        """Descarta as variantes se os DPRs das telas mudaram; retorna True se mudou"""
+        dprs = self.screen_dprs()
+        if dprs == self.dprs:
+            return False
+        self.dprs = dprs
+        self.icons.clear()
+        self.file_requests.clear()
+        return True
+
+    def letter_icon(self, name, shape, logical_size=24):
+        """Ícone colorido com a primeira letra do nome ("circle" ou "square")"""
+        icon_id = (shape, name, logical_size)
+        icon = self.icons.get(icon_id)
+        if icon is None:
+            icon = self.build_icon(
+                logical_size, lambda painter: self.paint_letter(painter, name, shape))
+            self.icons[icon_id] = icon
+        return icon
+
+    def settings_icon(self, logical_size=20, color=None):
+        """Ícone de engrenagem do botão de configurações"""
+        color = QtGui.QColor(color) if color is not None else QtGui.QColor(200, 200, 200)
+        icon_id = ("gear", color.name(), logical_size)
+        icon = self.icons.get(icon_id)
+        if icon is None:
+            icon = self.build_icon(logical_size, lambda painter: self.paint_gear(painter, color))
+            self.icons[icon_id] = icon
+        return icon
+
+    def build_icon(self, logical_size, paint):
+        """Monta um QIcon com uma variante por DPR.
+
+        Desenhar é mais rápido que ler um PNG do disco: os ícones gerados só
+        ficam no cache em memória (self.icons), não no cache em disco.
+        """
+        icon = QtGui.QIcon()
+        for dpr in self.dprs:
+            size = self.device_size(logical_size, dpr)
+            image = QtGui.QImage(size, size, QtGui.QImage.Format_ARGB32_Premultiplied)
+            image.fill(QtCore.Qt.transparent)
+
+            painter = QtGui.QPainter(image)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            # Desenha no sistema de coordenadas original (32x32) já na escala final
+            painter.scale(size / DESIGN_SIZE, size / DESIGN_SIZE)
+            paint(painter)
+            painter.end()
+
+            icon.addPixmap(self.pixmap_for(image, logical_size))
+        return icon
+
+    @staticmethod
+    def pixmap_for(image, logical_size):
+        """Converte a imagem em QPixmap com o DPR correspondente ao tamanho lógico"""
+        pixmap = QtGui.QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(max(image.width(), image.height()) / logical_size)
+        return pixmap
+
+    @staticmethod
+    def paint_letter(painter, name, shape):
+        """Desenha o círculo/quadrado colorido com a inicial do nome"""
+        # Cor de fundo aleatória mas consistente baseada no nome
+        name_hash = int(hashlib.md5(name.encode()).hexdigest(), 16)
+        color = QtGui.QColor(name_hash % 200 + 55, (name_hash // 256) %
+                             200 + 55, (name_hash // 65536) % 200 + 55)
+
+        painter.setBrush(QtGui.QBrush(color))
+        painter.setPen(QtCore.Qt.NoPen)
+        if shape == "circle":
+            painter.drawEllipse(2, 2, 28, 28)
+        else:
+            painter.drawRect(2, 2, 28, 28)
+
+        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255)))
+        painter.setFont(QtGui.QFont("Arial", 14, QtGui.QFont.Bold))
+        painter.drawText(QtCore.QRect(0, 0, DESIGN_SIZE, DESIGN_SIZE),
+                         QtCore.Qt.AlignCenter, name[0].upper())
+
+    @staticmethod
+    def paint_gear(painter, color):
+        """Desenha uma engrenagem simples"""
+        painter.setPen(QtGui.QPen(color, 2))
+        painter.setBrush(QtCore.Qt.NoBrush)
+
+        painter.drawEllipse(8, 8, 16, 16)
+
+        # Desenha os "dentes" da engrenagem
+        for i in range(8):
+            angle = i * 45 * math.pi / 180
+            x1 = 16 + 8 * math.cos(angle)
+            y1 = 16 + 8 * math.sin(angle)
+            x2 = 16 + 12 * math.cos(angle)
+            y2 = 16 + 12 * math.sin(angle)
+            painter.drawLine(int(x1), int(y1), int(x2), int(y2))
+
+    def file_icon(self, path, logical_size=24):
+        """Retorna o ícone de um arquivo de imagem ou executável PE, se estiver pronto.
+
+        Caso contrário agenda a decodificação e retorna None; o sinal
+        file_icon_ready é emitido quando o ícone estiver completo.
+        """
+        icon_id = ("file", path, logical_size)
+        icon = self.icons.get(icon_id)
+        if icon is not None:
+            return icon
+
+        sizes = [self.device_size(logical_size, dpr) for dpr in self.dprs]
+        images = self.loader.request(path, sizes)
+        if images is None:
+            self.file_requests[path] = logical_size
+            return None
+
+        icon = self.icon_from_images(images, logical_size)
+        self.icons[icon_id] = icon
+        return icon
+
+    def icon_from_images(self, images, logical_size):
+        """Junta as variantes decodificadas em um único QIcon"""
+        icon = QtGui.QIcon()
+        for size in sorted(images):
+            icon.addPixmap(self.pixmap_for(images[size], logical_size))
+        return icon
+
+    def on_file_loaded(self, path, images):
+        """Monta o ícone com todas as variantes decodificadas e avisa a toolbar"""
+        logical_size = self.file_requests.pop(path, None)
+        if logical_size is None:
+            return
+        icon = self.icon_from_images(images, logical_size)
+        self.icons[("file", path, logical_size)] = icon
+        self.file_icon_ready.emit(path, icon)
+
+    def on_file_failed(self, path):
+        """Desiste do ícone do arquivo; a toolbar mantém o ícone gerado"""
+        if self.file_requests.pop(path, None) is not None:
+            self.file_icon_failed.emit(path)
+
+    def wait_for_done(self, msecs=-1):
+        """Aguarda as decodificações pendentes"""
+        return self.loader.wait_for_done(msecs)
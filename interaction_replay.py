@@ -0,0 +1,423 @@
+"""Gravação e reprodução de interações com a toolbar, com a latência de cada passo.
+
+Gravação (na toolbar em uso; o roteiro é salvo ao sair):
+    python floating_toolbar.py --record sessao.json
+
+Reprodução sem janela visível:
+    QT_QPA_PLATFORM=offscreen python interaction_replay.py sessao.json [--repeat 5] [--budget-ms 50]
+
+O roteiro guarda a configuração inicial e os passos: cliques em atalhos,
+aberturas de menus de categoria (e a opção escolhida), arrastos pela alça
+de movimento e as configurações aplicadas pelo diálogo. Na reprodução os
+atalhos executam um Python vazio, a menos que se use --real-launch.
+"""
+import os
+import sys
+import json
+import math
+import time
+import tempfile
+import argparse
+from collections import defaultdict
+from PyQt5 import QtWidgets, QtCore, QtGui
+
+VERSION = 1
+
+
+def config_patch(before, after):
+    """Diferença entre duas configurações: chaves de settings alteradas e seções trocadas"""
+    patch = {}
+    for key in before.keys() | after.keys():
+        if key == "settings":
+            settings = {name: value for name, value in after.get("settings", {}).items()
+                        if before.get("settings", {}).get(name) != value}
+            if settings:
+                patch["settings"] = settings
+        elif before.get(key) != after.get(key):
+            patch[key] = after.get(key)
+    return patch
+
+
+def apply_patch(config, patch):
+    """Nova configuração com o patch aplicado (a original não é alterada)"""
+    config = json.loads(json.dumps(config))
+    for key, value in patch.items():
+        if key == "settings":
+            config.setdefault("settings", {}).update(value)
+        elif value is None:
+            config.pop(key, None)
+        else:
+            config[key] = value
+    return config
+
+
+class Recorder(QtCore.QObject):
+    """Grava as interações do usuário com a toolbar em um roteiro compacto"""
+
+    def __init__(self, toolbar, parent=None):
+        super().__init__(parent)
+        self.toolbar = toolbar
+        self.started = time.monotonic()
+        self.initial_config = json.loads(json.dumps(toolbar.config))
+        self.last_config = json.loads(json.dumps(toolbar.config))
+        self.steps = []
+        self.drag = None  # arrasto em andamento
+        self.menu_step = None  # abertura de menu em andamento
+        self.watched_menus = set()
+
+    def start(self):
+        QtWidgets.QApplication.instance().installEventFilter(self)
+        self.toolbar.config_applied.connect(self.on_config_applied)
+
+    def stop(self):
+        QtWidgets.QApplication.instance().removeEventFilter(self)
+        self.toolbar.config_applied.disconnect(self.on_config_applied)
+
+    def now(self):
+        return int((time.monotonic() - self.started) * 1000)
+
+    def add(self, step):
+        step["t"] = self.now()
+        self.steps.append(step)
+
+    def shortcut_index(self, widget):
+        for index, btn in enumerate(self.toolbar.shortcut_buttons.values()):
+            if btn is widget:
+                return index
+        return -1
+
+    def category_of_menu(self, menu):
+        for key, btn in self.toolbar.category_buttons.items():
+            # Células da faixa criam o menu ao primeiro acesso: só as que já têm menu
+            if btn.menu_built and btn.menu() is menu:
+                return key
+        return None
+
+    def eventFilter(self, obj, event):
+        event_type = event.type()
+        if event_type == QtCore.QEvent.MouseButtonRelease and event.button() == QtCore.Qt.LeftButton:
+            if obj is self.toolbar.strip:
+                index = obj.index_at(event.pos())
+                if index >= 0 and obj.cells[index].kind == "shortcut":
+                    self.record_click(obj.cells[index])
+            elif isinstance(obj, QtWidgets.QPushButton) and obj.objectName() != "moveBtn":
+                self.record_click(obj)
+
+        if obj.objectName() == "moveBtn" and isinstance(obj, QtWidgets.QPushButton):
+            self.record_drag(event)
+
+        elif isinstance(obj, QtWidgets.QMenu) and event_type == QtCore.QEvent.Show:
+            category = self.category_of_menu(obj)
+            if category is not None:
+                self.menu_step = {"op": "menu", "category": category, "action": None}
+                self.add(self.menu_step)
+                if id(obj) not in self.watched_menus:
+                    self.watched_menus.add(id(obj))
+                    obj.triggered.connect(self.on_menu_triggered)
+        return False
+
+    def record_click(self, widget):
+        index = self.shortcut_index(widget)
+        if index >= 0:
+            name = self.toolbar.config["quick_shortcuts"][index]["name"]
+            self.add({"op": "click", "index": index, "name": name})
+
+    def record_drag(self, event):
+        event_type = event.type()
+        if event_type == QtCore.QEvent.MouseButtonPress and event.button() == QtCore.Qt.LeftButton:
+            self.drag = {"op": "drag", "start": self.now(), "origin": [event.globalX(), event.globalY()],
+                         "points": []}
+        elif event_type == QtCore.QEvent.MouseMove and self.drag is not None:
+            origin = self.drag["origin"]
+            self.drag["points"].append([self.now() - self.drag["start"],
+                                        event.globalX() - origin[0], event.globalY() - origin[1]])
+        elif event_type == QtCore.QEvent.MouseButtonRelease and self.drag is not None:
+            drag = self.drag
+            self.drag = None
+            del drag["start"], drag["origin"]
+            if drag["points"]:
+                self.add(drag)
+
+    def on_menu_triggered(self, action):
+        if self.menu_step is not None:
+            self.menu_step["action"] = action.text()
+            self.menu_step = None
+
+    def on_config_applied(self, config):
+        patch = config_patch(self.last_config, config)
+        self.last_config = json.loads(json.dumps(config))
+        if patch:
+            self.add({"op": "settings", "patch": patch})
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"version": VERSION, "config": self.initial_config, "steps": self.steps},
+                      f, separators=(",", ":"))
+        print(f"Roteiro gravado em {path} ({len(self.steps)} passos)")
+
+
+def harmless(config, real_launch=False):
+    """Configuração para reprodução: atalhos executam um Python vazio e nada pede confirmação"""
+    if "settings" in config:
+        config["settings"]["running_policy"] = "launch"
+    if real_launch:
+        return config
+
+    def neutralize(shortcuts):
+        for shortcut in shortcuts:
+            shortcut["args"] = ["-c", "", shortcut.get("name", "")]
+            shortcut["exe"] = sys.executable
+
+    neutralize(config.get("quick_shortcuts", []))
+    for category in config.get("categories", {}).values():
+        neutralize(category.get("shortcuts", []) if isinstance(category, dict) else category)
+    for workspace in config.get("workspaces", {}).values():
+        neutralize(workspace.get("shortcuts", []))
+    return config
+
+
+def flush(app):
+    """Processa tudo o que o passo gerou, inclusive pinturas e deleteLater"""
+    app.processEvents()
+    app.sendPostedEvents(None, 0)
+    app.processEvents()
+
+
+def send_mouse(widget, event_type, local_pos, buttons=QtCore.Qt.LeftButton, global_pos=None):
+    if global_pos is None:
+        global_pos = widget.mapToGlobal(local_pos)
+    button = QtCore.Qt.NoButton if event_type == QtCore.QEvent.MouseMove else QtCore.Qt.LeftButton
+    event = QtGui.QMouseEvent(event_type, QtCore.QPointF(local_pos), QtCore.QPointF(global_pos),
+                              button, buttons, QtCore.Qt.NoModifier)
+    QtWidgets.QApplication.sendEvent(widget, event)
+
+
+class Replayer:
+    """Reproduz um roteiro e mede a latência de cada passo (ms)"""
+
+    def __init__(self, app, toolbar, pace=False):
+        self.app = app
+        self.toolbar = toolbar
+        self.pace = pace
+        self.samples = defaultdict(list)  # operação -> latências
+        self.step_samples = defaultdict(list)  # índice do passo -> latências
+
+    def measure(self, op, step_index, function):
+        start = time.perf_counter()
+        function()
+        flush(self.app)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.samples[op].append(elapsed)
+        if step_index is not None:
+            self.step_samples[step_index].append(elapsed)
+        return elapsed
+
+    def shortcut_target(self, index):
+        """(widget, posição local) do atalho direto, paginando a faixa se preciso"""
+        widgets = list(self.toolbar.shortcut_buttons.values())
+        if not 0 <= index < len(widgets):
+            return None, None
+        widget = widgets[index]
+        strip = self.toolbar.strip
+        if strip is None:
+            return widget, widget.rect().center()
+        position = strip.cells.index(widget)
+        rect = strip.cell_rect(position)
+        while rect.isNull():
+            strip.scroll_page(1 if position >= strip.offset else -1)
+            rect = strip.cell_rect(position)
+        return strip, rect.center()
+
+    def click(self, index, step_index):
+        widget, pos = self.shortcut_target(index)
+        if widget is None:
+            print(f"Passo {step_index}: atalho {index} não existe mais")
+            return
+
+        def run():
+            send_mouse(widget, QtCore.QEvent.MouseButtonPress, pos)
+            send_mouse(widget, QtCore.QEvent.MouseButtonRelease, pos, QtCore.Qt.NoButton)
+        self.measure("click", step_index, run)
+
+    def menu(self, category, action_text, step_index):
+        btn = self.toolbar.category_buttons.get(category)
+        if btn is None:
+            print(f"Passo {step_index}: categoria {category} não existe mais")
+            return
+        menu = btn.menu()
+        timing = {}
+
+        class ShownFilter(QtCore.QObject):
+            def eventFilter(self, obj, event):
+                # Primeira pintura do menu: o que o usuário vê
+                if event.type() in (QtCore.QEvent.Show, QtCore.QEvent.Paint) and "shown" not in timing:
+                    if event.type() == QtCore.QEvent.Paint or not menu.isVisible():
+                        timing["shown"] = time.perf_counter()
+                        QtCore.QTimer.singleShot(0, choose)
+                return False
+
+        def choose():
+            if "shown" not in timing:
+                timing["shown"] = time.perf_counter()
+            action = next((a for a in menu.actions() if a.text() == action_text), None) \
+                if action_text else None
+            menu.hide()
+            if action is not None:
+                timing["action_start"] = time.perf_counter()
+                action.trigger()
+                timing["action_end"] = time.perf_counter()
+
+        watcher = ShownFilter()
+        menu.installEventFilter(watcher)
+        # Sem pintura (plataforma sem tela), o menu fecha mesmo assim
+        fallback = QtCore.QTimer()
+        fallback.setSingleShot(True)
+        fallback.timeout.connect(lambda: "shown" in timing or choose())
+        fallback.start(2000)
+
+        start = time.perf_counter()
+        if self.toolbar.strip is not None:
+            self.toolbar.on_strip_cell_clicked(btn, self.toolbar.mapToGlobal(QtCore.QPoint(0, 0)))
+            while menu.isVisible() or "shown" not in timing:
+                self.app.processEvents(QtCore.QEventLoop.WaitForMoreEvents)
+        else:
+            pos = btn.rect().center()
+            send_mouse(btn, QtCore.QEvent.MouseButtonPress, pos)  # exec do menu até choose()
+            send_mouse(btn, QtCore.QEvent.MouseButtonRelease, pos, QtCore.Qt.NoButton)
+        flush(self.app)
+        fallback.stop()
+        menu.removeEventFilter(watcher)
+
+        elapsed = (timing["shown"] - start) * 1000
+        self.samples["menu"].append(elapsed)
+        self.step_samples[step_index].append(elapsed)
+        if "action_start" in timing:
+            self.samples["menu_action"].append((timing["action_end"] - timing["action_start"]) * 1000)
+
+    def drag(self, points, step_index):
+        handle = self.toolbar.findChild(QtWidgets.QPushButton, "moveBtn")
+        pos = handle.rect().center()
+        origin = handle.mapToGlobal(pos)
+        send_mouse(handle, QtCore.QEvent.MouseButtonPress, pos, global_pos=origin)
+        flush(self.app)
+        start = time.monotonic()
+        moves = []
+        for offset_ms, dx, dy in points:
+            if self.pace:
+                delay = offset_ms / 1000 - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            target = origin + QtCore.QPoint(dx, dy)
+            moves.append(self.measure("drag_move", None, lambda t=target: send_mouse(
+                handle, QtCore.QEvent.MouseMove, handle.mapFromGlobal(t), global_pos=t)))
+        send_mouse(handle, QtCore.QEvent.MouseButtonRelease, pos, QtCore.Qt.NoButton,
+                   origin + QtCore.QPoint(points[-1][1], points[-1][2]))
+        flush(self.app)
+        self.step_samples[step_index].append(sum(moves) / len(moves))
+
+    def settings(self, patch, step_index, real_launch):
+        from floating_toolbar import ConfigDialog
+        holder = {}
+
+        def open_dialog():
+            holder["dialog"] = ConfigDialog(self.toolbar.config, self.toolbar)
+            holder["dialog"].show()
+        self.measure("settings_open", None, open_dialog)
+
+        dialog = holder["dialog"]
+        config = harmless(apply_patch(dialog.get_config(), patch), real_launch)
+        dialog.hide()
+        dialog.deleteLater()
+        self.measure("settings_apply", step_index, lambda: self.toolbar.apply_config(config))
+
+    def run(self, steps, real_launch=False):
+        previous_t = 0
+        for index, step in enumerate(steps):
+            if self.pace:
+                time.sleep(max(0, step["t"] - previous_t) / 1000)
+                previous_t = step["t"]
+            op = step["op"]
+            if op == "click":
+                self.click(step["index"], index)
+            elif op == "menu":
+                self.menu(step["category"], step.get("action"), index)
+            elif op == "drag":
+                self.drag(step["points"], index)
+            elif op == "settings":
+                self.settings(step["patch"], index, real_launch)
+
+
+def percentile(values, p):
+    """Percentil pelo método do posto mais próximo"""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(p / 100 * len(ordered))) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("script", help="roteiro gravado com --record")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pace", action="store_true", help="respeita os intervalos gravados")
+    parser.add_argument("--real-launch", action="store_true",
+                        help="executa os programas dos atalhos de verdade")
+    parser.add_argument("--budget-ms", type=float, help="falha se o p95 de alguma operação passar disso")
+    args = parser.parse_args()
+
+    with open(args.script, 'r', encoding='utf-8') as f:
+        script = json.load(f)
+    if script.get("version") != VERSION:
+        sys.exit(f"Versão de roteiro não suportada: {script.get('version')}")
+
+    app = QtWidgets.QApplication(sys.argv)
+    from floating_toolbar import FloatingToolbar
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        config_path = os.path.join(work_dir, "toolbar_config.json")
+        config = harmless(json.loads(json.dumps(script["config"])), args.real_launch)
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+
+        replayer = None
+        for _ in range(args.repeat):
+            # Cada repetição parte da configuração inicial, com a toolbar nova
+            toolbar = FloatingToolbar(config_path)
+            toolbar.show()
+            toolbar.icon_pipeline.wait_for_done()
+            flush(app)
+            if replayer is None:
+                replayer = Replayer(app, toolbar, args.pace)
+            replayer.toolbar = toolbar
+            replayer.run(script["steps"], args.real_launch)
+
+            toolbar.launcher.wait_for_done()
+            toolbar.prefetcher.wait_for_done()
+            if toolbar.launch_history is not None:
+                toolbar.launch_history.close()
+            toolbar.metrics.stop()
+            toolbar.close()
+            toolbar.deleteLater()
+            flush(app)
+            with open(config_path, 'w', encoding='utf-8') as f:
+                json.dump(config, f)
+
+    print(f"{'operação':<16} {'amostras':>9} {'p50 ms':>9} {'p95 ms':>9} {'máx ms':>9}")
+    failed = []
+    for op, values in sorted(replayer.samples.items()):
+        p95 = percentile(values, 95)
+        print(f"{op:<16} {len(values):>9} {percentile(values, 50):>9.2f} {p95:>9.2f} {max(values):>9.2f}")
+        if args.budget_ms is not None and p95 > args.budget_ms:
+            failed.append(op)
+
+    print(f"\n{'passo':>5} {'operação':<10} {'p50 ms':>9} {'p95 ms':>9}")
+    for index, step in enumerate(script["steps"]):
+        values = replayer.step_samples.get(index)
+        if values:
+            print(f"{index:>5} {step['op']:<10} {percentile(values, 50):>9.2f} {percentile(values, 95):>9.2f}")
+
+    if failed:
+        print(f"FALHOU: p95 acima de {args.budget_ms:g} ms em {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""Histórico de execuções em SQLite e relatório de latência.
+
+Uso do relatório:
+    python launch_history.py [--db launch_history.sqlite3] [--days 30] [--by shortcut|day]
+"""
+import os
+import sys
+import math
+import time
+import queue
+import hashlib
+import sqlite3
+import argparse
+import itertools
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS launches (
+    id INTEGER PRIMARY KEY,
+    shortcut TEXT NOT NULL,
+    shortcut_id TEXT NOT NULL,
+    exe TEXT NOT NULL,
+    started REAL NOT NULL,
+    day TEXT NOT NULL,
+    queue_ms REAL,
+    spawn_ms REAL,
+    latency_ms REAL,
+    first_output_ms REAL,
+    pid INTEGER,
+    error TEXT,
+    exit_code INTEGER,
+    runtime_s REAL
+);
+CREATE INDEX IF NOT EXISTS launches_shortcut_day_latency ON launches (shortcut_id, day, latency_ms);
+CREATE INDEX IF NOT EXISTS launches_day_latency ON launches (day, latency_ms);
+"""
+
+PERCENTILES = (50, 95, 99)
+
+
+def shortcut_id(exe, args):
+    """Identidade estável de um atalho: executável e argumentos (o nome pode mudar ou repetir)"""
+    raw = "\0".join([exe] + [str(arg) for arg in args])
+    return hashlib.sha1(raw.encode("utf-8", "surrogateescape")).hexdigest()[:16]
+
+
+def connect(db_path):
+    connection = sqlite3.connect(db_path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class LaunchHistory:
+    """Grava o histórico de execuções em uma thread própria, em lotes.
+
+    A thread da interface só enfileira as operações; a thread de gravação
+    espera a primeira, junta as que chegarem logo em seguida e grava
+    tudo em uma única transação.
+    """
+
+    BATCH_WAIT = 1.0  # segundos esperando mais operações para o mesmo lote
+    BATCH_SIZE = 500
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+        # Os ids são gerados aqui para que as atualizações (saída, término)
+        # possam ser enfileiradas antes de a inserção ser gravada
+        connection = connect(db_path)
+        last_id = connection.execute("SELECT max(id) FROM launches").fetchone()[0] or 0
+        connection.close()
+        self.ids = itertools.count(last_id + 1)
+
+        self.operations = queue.Queue()
+        self.writer = threading.Thread(target=self.write_loop, daemon=True)
+        self.writer.start()
+
+    def record_launch(self, shortcut, exe, args, queue_time, spawn_time, pid=None, error=None):
+        """Enfileira uma execução; retorna o id usado nas atualizações seguintes.
+
+        `shortcut` é o nome exibido; o agrupamento usa shortcut_id(exe, args).
+        """
+        launch_id = next(self.ids)
+        now = time.time()
+        queue_ms = queue_time * 1000
+        spawn_ms = spawn_time * 1000
+        self.operations.put((
+            "INSERT INTO launches (id, shortcut, shortcut_id, exe, started, day, queue_ms, spawn_ms, "
+            "latency_ms, pid, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (launch_id, shortcut, shortcut_id(exe, args), exe, now,
+             time.strftime("%Y-%m-%d", time.localtime(now)),
+             queue_ms, spawn_ms, queue_ms + spawn_ms, pid, error)))
+        return launch_id
+
+    def record_first_output(self, launch_id, delay):
+        self.operations.put(("UPDATE launches SET first_output_ms = ? WHERE id = ?",
+                             (delay * 1000, launch_id)))
+
+    def record_exit(self, launch_id, exit_code, runtime):
+        self.operations.put(("UPDATE launches SET exit_code = ?, runtime_s = ? WHERE id = ?",
+                             (exit_code, runtime, launch_id)))
+
+    def write_loop(self):
+        connection = connect(self.db_path)
+        running = True
+        while running:
+            batch = [self.operations.get()]
+            deadline = time.monotonic() + self.BATCH_WAIT
+            while batch[-1] is not None and len(batch) < self.BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.operations.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            # Pedido de encerramento (None): grava o que veio antes dele e termina
+            if None in batch:
+                batch = batch[:batch.index(None)]
+                running = False
+            try:
+                with connection:
+                    for sql, params in batch:
+                        connection.execute(sql, params)
+            except sqlite3.Error as e:
+                print(f"Erro ao gravar o histórico de execuções: {e}")
+        connection.close()
+
+    def close(self, timeout=5):
+        """Grava o que estiver pendente e encerra a thread de gravação"""
+        self.operations.put(None)
+        self.writer.join(timeout)
+
+
+def percentile(connection, where, params, count, p):
+    """Percentil pelo método do posto mais próximo, usando o índice para o OFFSET"""
+    rank = max(1, math.ceil(p / 100 * count)) - 1
+    row = connection.execute(
+        f"SELECT latency_ms FROM launches WHERE {where} ORDER BY latency_ms LIMIT 1 OFFSET ?",
+        params + (rank,)).fetchone()
+    return row[0] if row else None
+
+
+def report(db_path, days=30, by="shortcut"):
+    """Linhas do relatório de p50/p95/p99 da latência de execução"""
+    connection = connect(db_path)
+    since = time.strftime("%Y-%m-%d", time.localtime(time.time() - days * 86400))
+    column = "shortcut_id" if by == "shortcut" else "day"
+
+    # Agrupa pelo id do atalho; o rótulo é o nome da execução mais recente
+    # (com max(), o SQLite devolve as outras colunas da linha escolhida)
+    groups = connection.execute(
+        f"SELECT {column}, {'shortcut' if by == 'shortcut' else 'day'}, max(started), count(*) "
+        f"FROM launches WHERE day >= ? AND error IS NULL GROUP BY {column}",
+        (since,)).fetchall()
+    groups.sort(key=lambda group: (group[1], group[0]))
+
+    lines = [f"{by:<32} {'execuções':>10} " +
+             " ".join(f"{f'p{p} ms':>9}" for p in PERCENTILES)]
+    total = 0
+    for key, label, _, count in groups:
+        values = [percentile(connection, f"{column} = ? AND day >= ? AND error IS NULL",
+                             (key, since), count, p) for p in PERCENTILES]
+        lines.append(f"{label[:32]:<32} {count:>10} " + " ".join(f"{value:>9.2f}" for value in values))
+        total += count
+    if total:
+        values = [percentile(connection, "day >= ? AND error IS NULL", (since,), total, p)
+                  for p in PERCENTILES]
+        lines.append(f"{'(todos)':<32} {total:>10} " + " ".join(f"{value:>9.2f}" for value in values))
+    failures = connection.execute(
+        "SELECT count(*) FROM launches WHERE day >= ? AND error IS NOT NULL", (since,)).fetchone()[0]
+    lines.append(f"Falhas ao iniciar: {failures}")
+    connection.close()
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relatório de latência das execuções da toolbar")
+    parser.add_argument("--db", default=os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "launch_history.sqlite3"))
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--by", choices=["shortcut", "day"], default="shortcut")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        sys.exit(f"Histórico não encontrado: {args.db}")
+    for line in report(args.db, args.days, args.by):
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+import time
+import subprocess
+from collections import deque
+from PyQt5 import QtCore
+
+
+class LaunchRecord:
+    """Um pedido de execução e as medições de tempo associadas"""
+
+    __slots__ = ("exe", "args", "name", "requested", "queue_time", "spawn_time", "pid",
+                 "process", "error", "coalesced")
+
+    def __init__(self, exe, args, name=None):
+        self.exe = exe
+        self.args = list(args)
+        self.name = name or exe
+        self.requested = time.perf_counter()
+        self.queue_time = 0.0  # segundos entre o pedido e o início no worker
+        self.spawn_time = 0.0  # segundos gastos no Popen
+        self.pid = None
+        self.process = None
+        self.error = None
+        self.coalesced = 0  # pedidos idênticos absorvidos por este
+
+    @property
+    def key(self):
+        return (self.exe, tuple(self.args))
+
+
+def popen_spawner(exe, args):
+    return subprocess.Popen([exe] + list(args))
+
+
+class LaunchSignals(QtCore.QObject):
+    """Sinais emitidos pelas tarefas de execução (QRunnable não é QObject)"""
+
+    finished = QtCore.pyqtSignal(object)
+
+
+class LaunchTask(QtCore.QRunnable):
+    """Cria o processo fora da thread da interface"""
+
+    def __init__(self, record, spawner, signals):
+        super().__init__()
+        self.record = record
+        self.spawner = spawner
+        self.signals = signals
+
+    def run(self):
+        record = self.record
+        start = time.perf_counter()
+        record.queue_time = start - record.requested
+        try:
+            record.process = self.spawner(record.exe, record.args)
+            record.pid = record.process.pid
+        except Exception as e:
+            record.error = str(e)
+        record.spawn_time = time.perf_counter() - start
+        self.signals.finished.emit(record)
+
+
+class Launcher(QtCore.QObject):
+    """Executa os atalhos em um pool de workers e avisa o resultado por sinais.
+
+    Pedidos idênticos (mesmo executável e argumentos) ainda em andamento ou
+    dentro da janela de agrupamento são absorvidos pelo primeiro, evitando
+    duas cópias em um clique duplo.
+    """
+
+    launched = QtCore.pyqtSignal(object)
+    launch_failed = QtCore.pyqtSignal(object)
+
+    def __init__(self, coalesce_ms=500, spawner=None, parent=None):
+        super().__init__(parent)
+        self.coalesce_window = coalesce_ms / 1000
+
+        # Função (exe, args) -> objeto com pid e poll(); padrão: subprocess.Popen
+        self.spawner = spawner or popen_spawner
+
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+
+        # (exe, args) -> registro do último pedido aceito
+        self.recent = {}
+        # Chaves com o processo ainda sendo criado no worker
+        self.in_flight = set()
+
+        # Últimas execuções concluídas, para consulta e diagnóstico
+        self.history = deque(maxlen=200)
+
+        self.signals = LaunchSignals()
+        self.signals.finished.connect(self.on_finished)
+
+    def set_coalesce_ms(self, coalesce_ms):
+        self.coalesce_window = coalesce_ms / 1000
+
+    def launch(self, exe, args, name=None):
+        """Agenda a execução; retorna o registro, ou None se foi agrupada a um pedido recente"""
+        record = LaunchRecord(exe, args, name)
+        previous = self.recent.get(record.key)
+        if previous is not None and (record.key in self.in_flight or
+                                     record.requested - previous.requested < self.coalesce_window):
+            previous.coalesced += 1
+            return None
+
+        self.recent[record.key] = record
+        self.in_flight.add(record.key)
+        self.pool.start(LaunchTask(record, self.spawner, self.signals))
+        return record
+
+    def on_finished(self, record):
+        """Recebe o resultado na thread da interface"""
+        self.in_flight.discard(record.key)
+
+        # Descarta pedidos antigos que já saíram da janela de agrupamento
+        now = time.perf_counter()
+        for key in [key for key, item in self.recent.items()
+                    if key not in self.in_flight and now - item.requested >= self.coalesce_window]:
+            del self.recent[key]
+
+        self.history.append(record)
+        if record.error is None:
+            self.launched.emit(record)
+        else:
+            self.launch_failed.emit(record)
+
+    def wait_for_done(self, msecs=-1):
+        """Aguarda as execuções pendentes (usado ao encerrar)"""
+        return self.pool.waitForDone(msecs)
@@ -0,0 +1,254 @@
+"""Contabilidade de memória da toolbar: objetos do Qt, ícones, caches e alocações Python.
+
+Uso (mede N ciclos de edição das configurações sem janela visível):
+    QT_QPA_PLATFORM=offscreen PYTHONTRACEMALLOC=1 python memory_report.py [--config toolbar_config.json] [--rebuilds 20]
+
+Na toolbar em execução, "Diagnóstico de memória..." (botão direito no botão
+de configurações) mostra o relatório e a diferença desde o diagnóstico
+anterior. As alocações Python só aparecem com o tracemalloc ligado
+(PYTHONTRACEMALLOC=1).
+
+Os retratos medem a memória como está, sem malloc_trim: a devolução da
+memória livre ao sistema é uma etapa à parte ("Devolver memória livre",
+no mesmo menu, e o fim do relatório da linha de comando), com o antes e o
+depois informados.
+"""
+import os
+import gc
+import sys
+import ctypes
+import ctypes.util
+import shutil
+import tempfile
+import argparse
+import tracemalloc
+from collections import Counter
+from PyQt5 import QtWidgets, QtCore, sip
+from metrics import resident_memory
+
+
+def release_free_memory():
+    """Devolve ao sistema a memória livre retida pelo malloc da glibc (Linux).
+
+    Widgets destruídos a cada reconstrução deixam o heap fragmentado: sem
+    isso, a memória residente cresce após edições repetidas mesmo sem
+    vazamentos. Retorna False onde não há malloc_trim ou nada foi devolvido.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+        return bool(libc.malloc_trim(0))
+    except (OSError, AttributeError):
+        return False
+
+
+def trim_report():
+    """Devolve a memória livre ao sistema; linhas com a memória residente antes e depois"""
+    before = resident_memory()
+    released = release_free_memory()
+    after = resident_memory()
+    if before is None or after is None:
+        return ["malloc_trim: " + ("memória livre devolvida" if released else
+                                   "nada devolvido (ou indisponível nesta plataforma)")]
+    return [f"Memória residente antes do malloc_trim: {before / (1024 * 1024):.1f} MB",
+            f"Memória residente depois do malloc_trim: {after / (1024 * 1024):.1f} MB "
+            f"({(after - before) / (1024 * 1024):+.1f} MB)"]
+
+
+def icon_bytes(icon):
+    """Estimativa dos bytes das pixmaps de um QIcon (32 bits por pixel)"""
+    return sum(size.width() * size.height() * 4 for size in icon.availableSizes())
+
+
+def live_objects():
+    """Todos os QObjects vivos alcançáveis a partir das janelas e da aplicação"""
+    app = QtWidgets.QApplication.instance()
+    roots = [app] + [widget for widget in app.topLevelWidgets() if widget.parent() is None]
+    objects = []
+    for root in roots:
+        objects.append(root)
+        objects.extend(root.findChildren(QtCore.QObject))
+    return objects
+
+
+class MemorySnapshot:
+    """Retrato do uso de memória em um instante"""
+
+    def __init__(self, toolbar):
+        objects = live_objects()
+        self.objects = Counter(obj.metaObject().className() for obj in objects)
+
+        # Wrappers Python de objetos C++ já destruídos: algo ainda os referencia
+        wrappers = [obj for obj in gc.get_objects() if isinstance(obj, sip.simplewrapper)]
+        self.stale_wrappers = Counter(type(obj).__name__ for obj in wrappers if sip.isdeleted(obj))
+
+        # Ícones distintos (o mesmo QIcon pode estar em vários botões)
+        icons = {}
+        for icon in toolbar.icon_pipeline.icons.values():
+            icons[icon.cacheKey()] = icon
+        button_icons = {}
+        for obj in objects:
+            if isinstance(obj, QtWidgets.QAbstractButton) and not obj.icon().isNull():
+                button_icons[obj.icon().cacheKey()] = obj.icon()
+        icons.update(button_icons)
+        self.icon_bytes = sum(icon_bytes(icon) for icon in icons.values())
+        self.icon_count = len(icons)
+        self.image_bytes = sum(image.sizeInBytes() for image in toolbar.icon_cache.memory.values())
+
+        styled = [obj for obj in objects if isinstance(obj, QtWidgets.QWidget) and obj.styleSheet()]
+        self.stylesheets = len(styled)
+        self.stylesheet_chars = sum(len(widget.styleSheet()) for widget in styled)
+
+        self.caches = {
+            "icon_pipeline.icons": len(toolbar.icon_pipeline.icons),
+            "icon_cache.memory": len(toolbar.icon_cache.memory),
+            "icon_cache.entries": len(toolbar.icon_cache.entries),
+            "pending_icon_buttons": sum(len(buttons) for buttons in toolbar.pending_icon_buttons.values()),
+            "shortcut_buttons": len(toolbar.shortcut_buttons),
+            "category_buttons": len(toolbar.category_buttons),
+            "launcher.recent": len(toolbar.launcher.recent),
+            "launcher.history": len(toolbar.launcher.history),
+            "supervisor.running": len(toolbar.supervisor.running),
+            "supervisor.finished": len(toolbar.supervisor.finished),
+            "process_index.by_pid": len(toolbar.process_index.by_pid),
+            "resource_sampler.histories": len(toolbar.resource_sampler.histories),
+            "output_capture.bytes": sum(captured.buffer.size
+                                        for captured in toolbar.output_capture.processes),
+            "history_ids": len(toolbar.history_ids),
+        }
+
+        self.rss = resident_memory()
+        self.tracemalloc = None
+        if tracemalloc.is_tracing():
+            # Sem as alocações do próprio diagnóstico
+            del objects, wrappers, styled
+            self.tracemalloc = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)])
+
+    def report(self, top=15):
+        """Linhas do relatório deste retrato"""
+        lines = []
+        if self.rss is not None:
+            lines.append(f"Memória residente: {self.rss / (1024 * 1024):.1f} MB")
+        lines.append(f"QObjects vivos: {sum(self.objects.values())}")
+        for name, count in self.objects.most_common(top):
+            lines.append(f"  {count:>7}  {name}")
+        if self.stale_wrappers:
+            lines.append(f"Wrappers de objetos já destruídos: {sum(self.stale_wrappers.values())}")
+            for name, count in self.stale_wrappers.most_common(top):
+                lines.append(f"  {count:>7}  {name}")
+        lines.append(f"Ícones: {self.icon_count} ({self.icon_bytes / 1024:.0f} KB em pixmaps), "
+                     f"imagens do cache em memória: {self.image_bytes / 1024:.0f} KB")
+        lines.append(f"Folhas de estilo por widget: {self.stylesheets} ({self.stylesheet_chars} caracteres)")
+        lines.append("Caches:")
+        for name, size in self.caches.items():
+            lines.append(f"  {size:>7}  {name}")
+        if self.tracemalloc is not None:
+            lines.append("Maiores alocações Python:")
+            for stat in self.tracemalloc.statistics("lineno")[:top]:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size / 1024:>9.1f} KB {stat.count:>7}  "
+                             f"{os.path.basename(frame.filename)}:{frame.lineno}")
+        else:
+            lines.append("Alocações Python: tracemalloc desligado (use PYTHONTRACEMALLOC=1)")
+        return lines
+
+    def diff(self, before, top=15):
+        """Linhas com o que mudou desde o retrato `before`"""
+        lines = []
+        if self.rss is not None and before.rss is not None:
+            lines.append(f"Memória residente: {(self.rss - before.rss) / (1024 * 1024):+.1f} MB")
+        changes = Counter(self.objects)
+        changes.subtract(before.objects)
+        changed = [(name, delta) for name, delta in changes.items() if delta]
+        changed.sort(key=lambda item: abs(item[1]), reverse=True)
+        lines.append(f"QObjects vivos: {sum(self.objects.values()) - sum(before.objects.values()):+}")
+        for name, delta in changed[:top]:
+            lines.append(f"  {delta:>+7}  {name}")
+        stale = sum(self.stale_wrappers.values()) - sum(before.stale_wrappers.values())
+        if stale:
+            lines.append(f"Wrappers de objetos já destruídos: {stale:+}")
+        lines.append(f"Ícones: {self.icon_count - before.icon_count:+} "
+                     f"({(self.icon_bytes - before.icon_bytes) / 1024:+.0f} KB), imagens do cache: "
+                     f"{(self.image_bytes - before.image_bytes) / 1024:+.0f} KB")
+        lines.append(f"Folhas de estilo por widget: {self.stylesheets - before.stylesheets:+} "
+                     f"({self.stylesheet_chars - before.stylesheet_chars:+} caracteres)")
+        for name, size in self.caches.items():
+            delta = size - before.caches.get(name, 0)
+            if delta:
+                lines.append(f"  {delta:>+7}  {name}")
+        if self.tracemalloc is not None and before.tracemalloc is not None:
+            lines.append("Alocações Python que mais cresceram:")
+            for stat in self.tracemalloc.compare_to(before.tracemalloc, "lineno")[:top]:
+                if not stat.size_diff:
+                    break
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size_diff / 1024:>+9.1f} KB {stat.count_diff:>+7}  "
+                             f"{os.path.basename(frame.filename)}:{frame.lineno}")
+        return lines
+
+
+def flush(app):
+    """Processa os eventos pendentes, inclusive os deleteLater, e coleta o lixo"""
+    app.processEvents()
+    app.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+    app.processEvents()
+    gc.collect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default=os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "toolbar_config.json"))
+    parser.add_argument("--rebuilds", type=int, default=20, help="ciclos de edição das configurações")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv)
+
+    from floating_toolbar import FloatingToolbar, ConfigDialog
+
+    # Trabalha numa cópia: a configuração original (e o cache ao lado dela) não são tocados
+    with tempfile.TemporaryDirectory() as work_dir:
+        config_path = os.path.join(work_dir, "toolbar_config.json")
+        if os.path.exists(args.config):
+            shutil.copy(args.config, config_path)
+        toolbar = FloatingToolbar(config_path)
+        toolbar.show()
+        toolbar.icon_pipeline.wait_for_done()
+        flush(app)
+
+        def edit_settings(cycle):
+            """O mesmo caminho do botão de configurações, com todas as dicas alteradas"""
+            dialog = ConfigDialog(toolbar.config, toolbar)
+            config = dialog.get_config()
+            for shortcut in config["quick_shortcuts"]:
+                shortcut["tooltip"] = f"{shortcut.get('tooltip', '').split(' #')[0]} #{cycle}"
+            toolbar.config = config
+            toolbar.apply_theme()
+            toolbar.create_toolbar_buttons()
+            dialog.deleteLater()
+            toolbar.icon_pipeline.wait_for_done()
+            flush(app)
+
+        # O primeiro diálogo carrega fontes e estilos uma vez só: fica fora da comparação
+        edit_settings(0)
+        before = MemorySnapshot(toolbar)
+        for cycle in range(1, args.rebuilds + 1):
+            edit_settings(cycle)
+        after = MemorySnapshot(toolbar)
+        print("\n".join(after.report(args.top)))
+        print(f"\nDiferença após {args.rebuilds} ciclos de edição:")
+        print("\n".join(after.diff(before, args.top)))
+        print("\nDevolução da memória livre ao sistema:")
+        print("\n".join(trim_report()))
+
+        toolbar.launcher.wait_for_done()
+        toolbar.prefetcher.wait_for_done()
+        if toolbar.launch_history is not None:
+            toolbar.launch_history.close()
+
+
+if __name__ == '__main__':
+    main()
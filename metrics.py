@@ -0,0 +1,241 @@
+"""Métricas da toolbar no formato OpenMetrics, servidas em localhost ou socket Unix.
+
+A thread da interface só faz deque.append (atômico no CPython, sem locks)
+para registrar eventos. A thread do servidor esvazia a fila, agrega os
+valores e monta o texto de resposta.
+"""
+import os
+import time
+import threading
+import socketserver
+from collections import deque
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Limites dos histogramas em segundos
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# nome -> (tipo, ajuda)
+DEFINITIONS = {
+    "toolbar_launches": ("counter", "Execuções de atalhos por resultado"),
+    "toolbar_launch_latency_seconds": ("histogram", "Tempo até criar o processo (fila + criação)"),
+    "toolbar_config_load_seconds": ("histogram", "Duração da leitura da configuração"),
+    "toolbar_config_save_seconds": ("histogram", "Duração da gravação da configuração"),
+    "toolbar_rebuild_seconds": ("histogram", "Duração da atualização dos botões da toolbar"),
+    "toolbar_event_loop_lag_seconds": ("histogram", "Atraso do laço de eventos da interface"),
+    "toolbar_icon_cache_hit_ratio": ("gauge", "Proporção de acertos do cache de ícones"),
+    "toolbar_resident_memory_bytes": ("gauge", "Memória residente do processo da toolbar"),
+}
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels) + "}"
+
+
+def resident_memory():
+    """RSS do processo atual em bytes (None se não for possível medir)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+        # ru_maxrss é o pico (KB no Linux, bytes no macOS): melhor que nada
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return None
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+
+class Metrics:
+    """Registro de métricas; sem endereço configurado, todas as chamadas são ignoradas"""
+
+    def __init__(self, listen=""):
+        self.listen = listen
+        self.enabled = bool(listen)
+        self.events = deque()
+
+        # Estado agregado: só a thread do servidor mexe nele
+        self.counters = {}  # (nome, rótulos) -> valor
+        self.histograms = {}  # (nome, rótulos) -> Histogram
+        self.gauges = {}  # nome -> função lida na thread do servidor
+
+        self.server = None
+        self.thread = None
+
+    # Registro (thread da interface)
+
+    def inc(self, name, labels=()):
+        if self.enabled:
+            self.events.append((0, name, labels, 1))
+
+    def observe(self, name, value, labels=()):
+        if self.enabled:
+            self.events.append((1, name, labels, value))
+
+    def gauge(self, name, function):
+        """Valor lido na hora da coleta; a função deve ser segura fora da thread da interface"""
+        self.gauges[name] = function
+
+    # Servidor (thread própria)
+
+    def drain(self):
+        """Agrega os eventos enfileirados desde a última coleta"""
+        events = self.events
+        while events:
+            kind, name, labels, value = events.popleft()
+            key = (name, labels)
+            if kind == 0:
+                self.counters[key] = self.counters.get(key, 0) + value
+            else:
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram()
+                histogram.observe(value)
+
+    def render(self):
+        """Texto OpenMetrics com o estado atual"""
+        self.drain()
+        lines = []
+        for name, (kind, help_text) in DEFINITIONS.items():
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"# HELP {name} {escape(help_text)}")
+            if kind == "counter":
+                for (metric, labels), value in sorted(self.counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}_total{format_labels(labels)} {value}")
+            elif kind == "histogram":
+                for (metric, labels), histogram in sorted(self.histograms.items(),
+                                                          key=lambda item: item[0]):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+                        cumulative += count
+                        bucket_labels = labels + (("le", repr(bound)),)
+                        lines.append(f"{name}_bucket{format_labels(bucket_labels)} {cumulative}")
+                    lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} "
+                                 f"{histogram.count}")
+                    lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum}")
+            else:
+                function = self.gauges.get(name)
+                value = function() if function is not None else None
+                if value is not None:
+                    lines.append(f"{name} {value}")
+        lines.append("# EOF")
+        return ("\n".join(lines) + "\n").encode()
+
+    def start(self):
+        """Inicia o servidor em segundo plano (host:porta ou unix:/caminho)"""
+        if not self.enabled or self.thread is not None:
+            return
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.render()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Sem log a cada coleta
+
+        try:
+            if self.listen.startswith("unix:"):
+                path = self.listen[len("unix:"):]
+                if os.path.exists(path):
+                    os.remove(path)
+                self.server = UnixHTTPServer(path, Handler)
+            else:
+                host, _, port = self.listen.rpartition(":")
+                self.server = MetricsHTTPServer((host or "127.0.0.1", int(port)), Handler)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao iniciar o servidor de métricas em {self.listen}: {e}")
+            self.enabled = False
+            self.events.clear()
+            return
+
+        self.server.metrics = self
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(1.0,), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            if isinstance(self.server, UnixHTTPServer):
+                try:
+                    os.remove(self.server.server_address)
+                except OSError:
+                    pass
+            self.server = None
+            self.thread = None
+
+
+class MetricsHTTPServer(HTTPServer):
+    """Servidor de uma thread; esvazia a fila também entre as coletas (memória limitada)"""
+
+    def service_actions(self):
+        self.metrics.drain()
+
+
+class UnixHTTPServer(socketserver.UnixStreamServer):
+    """HTTP sobre socket Unix (o endereço do cliente não é uma tupla host/porta)"""
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("local", 0)
+
+    def service_actions(self):
+        self.metrics.drain()
+
+
+class EventLoopLagProbe:
+    """Mede o atraso do laço de eventos com um QTimer de intervalo fixo"""
+
+    def __init__(self, metrics, interval_ms=500, parent=None):
+        from PyQt5 import QtCore
+        self.metrics = metrics
+        self.interval = interval_ms / 1000
+        self.expected = None
+        self.timer = QtCore.QTimer(parent)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        self.expected = time.monotonic() + self.interval
+        self.timer.start()
+
+    def tick(self):
+        now = time.monotonic()
+        self.metrics.observe("toolbar_event_loop_lag_seconds", max(0.0, now - self.expected))
+        self.expected = now + self.interval
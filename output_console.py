@@ -0,0 +1,254 @@
+import time
+from collections import deque
+from PyQt5 import QtWidgets, QtCore, QtGui
+
+
+class OutputBuffer:
+    """Buffer circular de bytes com capacidade fixa: guarda só a saída mais recente"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.chunks = deque()
+        self.size = 0  # bytes guardados
+        self.total = 0  # bytes recebidos desde o início (posição do fim do buffer)
+
+    def append(self, data):
+        if not data:
+            return
+        self.total += len(data)
+        if len(data) >= self.capacity:
+            # Um bloco maior que o buffer substitui tudo
+            self.chunks.clear()
+            self.size = 0
+            data = data[-self.capacity:]
+        self.chunks.append(data)
+        self.size += len(data)
+
+        # Descarta os bytes mais antigos até caber na capacidade
+        while self.size > self.capacity:
+            excess = self.size - self.capacity
+            first = self.chunks[0]
+            if len(first) <= excess:
+                self.chunks.popleft()
+                self.size -= len(first)
+            else:
+                self.chunks[0] = first[excess:]
+                self.size -= excess
+
+    @property
+    def dropped(self):
+        """Bytes descartados por falta de espaço"""
+        return self.total - self.size
+
+    def data(self):
+        return b"".join(self.chunks)
+
+    def since(self, position):
+        """Bytes recebidos depois de `position` que ainda estão no buffer"""
+        needed = self.total - max(position, self.dropped)
+        if needed <= 0:
+            return b""
+        # Junta só os blocos do fim que contêm os bytes novos
+        parts = []
+        for chunk in reversed(self.chunks):
+            parts.append(chunk)
+            needed -= len(chunk)
+            if needed <= 0:
+                break
+        data = b"".join(reversed(parts))
+        return data[-needed:] if needed < 0 else data
+
+
+class CapturedProcess(QtCore.QObject):
+    """Processo criado com QProcess, com stdout e stderr lidos pelo laço de eventos do Qt.
+
+    Tem a mesma interface mínima de um Popen (pid e poll), para ser
+    acompanhado pelo supervisor.
+    """
+
+    started = QtCore.pyqtSignal(object)
+    output = QtCore.pyqtSignal(object)  # o próprio processo, quando chega saída nova
+    first_output = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(object, str)
+
+    def __init__(self, name, exe, args, buffer_bytes, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.exe = exe
+        self.args = list(args)
+        self.buffer = OutputBuffer(buffer_bytes)
+        self.start_time = time.time()
+        self.pid = None
+        self.returncode = None
+
+        # Medições: criação do processo e tempo até a primeira saída (segundos)
+        self.launch_clock = None
+        self.spawn_time = None
+        self.first_output_time = None
+
+        self.process = QtCore.QProcess(self)
+        self.process.setProcessChannelMode(QtCore.QProcess.MergedChannels)
+        self.process.started.connect(self.on_started)
+        self.process.readyReadStandardOutput.connect(self.on_ready_read)
+        self.process.finished.connect(self.on_finished)
+        self.process.errorOccurred.connect(self.on_error)
+
+    def start(self):
+        """Inicia o processo sem esperar: o resultado chega pelos sinais started/failed"""
+        self.launch_clock = time.perf_counter()
+        self.process.start(self.exe, self.args)
+
+    def on_started(self):
+        self.pid = self.process.processId()
+        self.spawn_time = time.perf_counter() - self.launch_clock
+        self.started.emit(self)
+
+    def on_ready_read(self):
+        # Lê tudo o que está disponível: o buffer interno do QProcess não cresce
+        data = bytes(self.process.readAllStandardOutput())
+        if data and self.first_output_time is None:
+            self.first_output_time = time.perf_counter() - self.launch_clock
+            self.first_output.emit(self)
+        self.buffer.append(data)
+        self.output.emit(self)
+
+    def on_finished(self, exit_code, exit_status):
+        self.on_ready_read()
+        if exit_status == QtCore.QProcess.CrashExit:
+            self.returncode = -1
+        else:
+            self.returncode = exit_code
+        self.buffer.append(f"\n[processo encerrado com código {self.returncode}]\n".encode())
+        self.output.emit(self)
+
+    def on_error(self, error):
+        if error == QtCore.QProcess.FailedToStart:
+            self.returncode = -1
+            self.failed.emit(self, self.process.errorString())
+
+    def running(self):
+        return self.returncode is None and self.pid is not None
+
+    def poll(self):
+        return self.returncode
+
+
+class OutputCapture(QtCore.QObject):
+    """Guarda os processos com saída capturada (os encerrados mais antigos são descartados)"""
+
+    process_added = QtCore.pyqtSignal(object)
+    process_output = QtCore.pyqtSignal(object)
+    process_started = QtCore.pyqtSignal(object)
+    process_first_output = QtCore.pyqtSignal(object)
+    process_failed = QtCore.pyqtSignal(object, str)
+
+    def __init__(self, buffer_bytes=256 * 1024, max_processes=20, parent=None):
+        super().__init__(parent)
+        self.buffer_bytes = buffer_bytes
+        self.max_processes = max_processes
+        self.processes = []
+
+    def start(self, name, exe, args):
+        """Cria o processo com a saída capturada (o início é informado por sinais)"""
+        captured = CapturedProcess(name, exe, args, self.buffer_bytes, self)
+        captured.output.connect(self.process_output)
+        captured.started.connect(self.process_started)
+        captured.first_output.connect(self.process_first_output)
+        captured.failed.connect(self.process_failed)
+
+        self.processes.append(captured)
+        self.discard_old()
+        self.process_added.emit(captured)
+        captured.start()
+        return captured
+
+    def discard_old(self):
+        """Limita a memória: descarta os processos encerrados mais antigos"""
+        excess = len(self.processes) - self.max_processes
+        for captured in list(self.processes):
+            if excess <= 0:
+                break
+            if captured.returncode is not None:
+                self.processes.remove(captured)
+                captured.deleteLater()
+                excess -= 1
+
+
+class OutputConsole(QtWidgets.QDialog):
+    """Janela com a saída dos processos capturados (criada só quando for aberta)"""
+
+    MAX_BLOCKS = 5000  # Linhas mantidas pelo widget de texto
+
+    def __init__(self, capture, parent=None):
+        super().__init__(parent)
+        self.capture = capture
+        self.setWindowTitle("Saída dos Processos")
+        self.resize(760, 420)
+
+        layout = QtWidgets.QHBoxLayout(self)
+        self.process_list = QtWidgets.QListWidget()
+        self.process_list.setMaximumWidth(220)
+        self.process_list.currentRowChanged.connect(self.show_selected)
+
+        self.text = QtWidgets.QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(self.MAX_BLOCKS)
+        self.text.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+
+        layout.addWidget(self.process_list)
+        layout.addWidget(self.text)
+
+        self.listed = []  # processos na ordem da lista
+        self.shown = None  # processo exibido
+        self.position = 0  # bytes do processo exibido já mostrados
+
+        # Processos muito falantes: junta a saída e atualiza o texto no máximo 10 vezes por segundo
+        self.flush_timer = QtCore.QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(100)
+        self.flush_timer.timeout.connect(self.flush)
+
+        capture.process_added.connect(self.refresh_list)
+        capture.process_output.connect(self.on_output)
+        self.refresh_list()
+
+    def refresh_list(self):
+        """Recria a lista de processos (mantendo a seleção)"""
+        selected = self.shown
+        self.listed = list(reversed(self.capture.processes))
+        self.process_list.blockSignals(True)
+        self.process_list.clear()
+        for captured in self.listed:
+            started = QtCore.QDateTime.fromSecsSinceEpoch(int(captured.start_time)).toString("HH:mm:ss")
+            self.process_list.addItem(f"{captured.name} ({started})")
+        self.process_list.blockSignals(False)
+        if selected in self.listed:
+            self.process_list.setCurrentRow(self.listed.index(selected))
+        elif self.listed:
+            self.process_list.setCurrentRow(0)
+
+    def show_selected(self, row):
+        """Mostra todo o conteúdo guardado do processo selecionado"""
+        self.shown = self.listed[row] if 0 <= row < len(self.listed) else None
+        self.text.clear()
+        self.position = 0
+        self.flush()
+
+    def on_output(self, captured):
+        if captured is self.shown and not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        """Acrescenta ao texto a saída nova do processo exibido"""
+        if self.shown is None:
+            return
+        buffer = self.shown.buffer
+        if self.position < buffer.dropped:
+            self.text.appendPlainText(f"[{buffer.dropped - self.position} bytes descartados]")
+        data = buffer.since(self.position)
+        self.position = buffer.total
+        if data:
+            cursor = self.text.textCursor()
+            cursor.movePosition(QtGui.QTextCursor.End)
+            cursor.insertText(data.decode("utf-8", "replace"))
+            self.text.setTextCursor(cursor)
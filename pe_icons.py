@@ -0,0 +1,122 @@
+import os
+import struct
+
+
+# Tipos de recurso do Windows
+RT_ICON = 3
+RT_GROUP_ICON = 14
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Extensões tratadas como executáveis PE
+PE_EXTENSIONS = (".exe", ".dll")
+
+
+def is_pe_path(path):
+    """Indica se o caminho aponta para um executável PE (pela extensão)"""
+    return os.path.splitext(path)[1].lower() in PE_EXTENSIONS
+
+
+def parse_group_icon(data):
+    """Lê as entradas de um recurso RT_GROUP_ICON (GRPICONDIR)"""
+    reserved, icon_type, count = struct.unpack_from("<HHH", data, 0)
+    if reserved != 0 or icon_type != 1:
+        return []
+
+    entries = []
+    for i in range(count):
+        offset = 6 + i * 14
+        if offset + 14 > len(data):
+            break
+        width, height, colors, _, planes, bit_count, size, icon_id = struct.unpack_from(
+            "<BBBBHHIH", data, offset)
+        entries.append({
+            # 0 no diretório significa 256 pixels
+            "width": width or 256,
+            "height": height or 256,
+            "colors": colors,
+            "planes": planes,
+            "bit_count": bit_count,
+            "size": size,
+            "id": icon_id
+        })
+    return entries
+
+
+def choose_best_entry(entries, target_size):
+    """Escolhe a menor entrada >= tamanho alvo (ou a maior disponível), com mais cores"""
+    if not entries:
+        return None
+
+    large_enough = [e for e in entries if e["width"] >= target_size]
+    if large_enough:
+        return min(large_enough, key=lambda e: (e["width"], -e["bit_count"]))
+    return max(entries, key=lambda e: (e["width"], e["bit_count"]))
+
+
+def build_ico(entry, image_data):
+    """Monta um arquivo .ico com uma única imagem a partir de um recurso RT_ICON"""
+    width = entry["width"] if entry["width"] < 256 else 0
+    height = entry["height"] if entry["height"] < 256 else 0
+    header = struct.pack("<HHH", 0, 1, 1)
+    directory = struct.pack("<BBBBHHII", width, height, entry["colors"], 0,
+                            entry["planes"], entry["bit_count"], len(image_data), 22)
+    return header + directory + image_data
+
+
+def extract_icon(exe_path, target_size):
+    """Extrai o melhor ícone do executável para o tamanho alvo.
+
+    Retorna uma tupla (dados, formato) com formato "png" ou "ico", ou None se o
+    executável não tiver ícones ou não puder ser lido.
+    """
+    try:
+        import pefile
+    except ImportError:
+        return None
+
+    try:
+        pe = pefile.PE(exe_path, fast_load=True)
+    except Exception:
+        return None
+
+    try:
+        pe.parse_data_directories(directories=[
+            pefile.DIRECTORY_ENTRY["IMAGE_DIRECTORY_ENTRY_RESOURCE"]])
+        if not hasattr(pe, "DIRECTORY_ENTRY_RESOURCE"):
+            return None
+
+        group_resources = []
+        icon_resources = {}
+        for resource_type in pe.DIRECTORY_ENTRY_RESOURCE.entries:
+            if resource_type.id not in (RT_ICON, RT_GROUP_ICON):
+                continue
+            for resource_id in resource_type.directory.entries:
+                # Cada id tem uma entrada por idioma; qualquer uma serve
+                for language in resource_id.directory.entries:
+                    data_entry = language.data.struct
+                    location = (data_entry.OffsetToData, data_entry.Size)
+                    if resource_type.id == RT_ICON:
+                        icon_resources[resource_id.id] = location
+                    else:
+                        group_resources.append(location)
+                    break
+
+        # O primeiro grupo é o ícone principal exibido pelo Explorer
+        for rva, size in group_resources:
+            entries = [e for e in parse_group_icon(pe.get_data(rva, size))
+                       if e["id"] in icon_resources]
+            entry = choose_best_entry(entries, target_size)
+            if entry is None:
+                continue
+
+            image_data = pe.get_data(*icon_resources[entry["id"]])
+            if image_data.startswith(PNG_SIGNATURE):
+                return image_data, "png"
+            return build_ico(entry, image_data), "ico"
+
+        return None
+    except Exception:
+        return None
+    finally:
+        pe.close()
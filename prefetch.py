@@ -0,0 +1,237 @@
+import os
+import json
+import time
+import statistics
+from collections import deque
+from PyQt5 import QtCore
+
+
+class UsageStats:
+    """Contadores de uso por atalho com decaimento exponencial (meia-vida em dias)"""
+
+    VERSION = 1
+
+    def __init__(self, path, half_life_days=3):
+        self.path = path
+        self.half_life = half_life_days * 24 * 3600
+        self.scores = {}  # chave do atalho -> [pontuação, horário da última atualização]
+        self.dirty = False
+        self.load()
+
+    @staticmethod
+    def key(exe, args):
+        return json.dumps([exe, list(args)])
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.scores = data["scores"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Erro ao carregar as estatísticas de uso: {e}")
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": self.VERSION, "scores": self.scores}, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except Exception as e:
+            print(f"Erro ao salvar as estatísticas de uso: {e}")
+
+    def decayed(self, key, now=None):
+        """Pontuação atual de um atalho, já com o decaimento aplicado"""
+        entry = self.scores.get(key)
+        if entry is None:
+            return 0.0
+        now = time.time() if now is None else now
+        score, updated = entry
+        return score * 0.5 ** (max(0.0, now - updated) / self.half_life)
+
+    def record(self, exe, args):
+        """Conta uma execução do atalho"""
+        key = self.key(exe, args)
+        now = time.time()
+        self.scores[key] = [self.decayed(key, now) + 1.0, now]
+        self.dirty = True
+
+    def top(self, shortcuts, count):
+        """Os `count` atalhos com maior pontuação entre os atalhos informados"""
+        now = time.time()
+        ranked = []
+        for shortcut in shortcuts:
+            score = self.decayed(self.key(shortcut["exe"], shortcut["args"]), now)
+            if score > 0:
+                ranked.append((score, shortcut))
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return [shortcut for _, shortcut in ranked[:count]]
+
+
+class PrefetchSignals(QtCore.QObject):
+    """Sinais da tarefa de pré-leitura (QRunnable não é QObject)"""
+
+    # lista de (caminho, bytes aquecidos)
+    warmed = QtCore.pyqtSignal(object)
+
+
+class PrefetchTask(QtCore.QRunnable):
+    """Traz arquivos para o cache de páginas do sistema, dentro de um orçamento de bytes"""
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, paths, budget_bytes, signals):
+        super().__init__()
+        self.paths = paths
+        self.budget = budget_bytes
+        self.signals = signals
+
+    def run(self):
+        results = []
+        remaining = self.budget
+        buffer = bytearray(self.CHUNK_SIZE)  # memória fixa, independente do tamanho dos arquivos
+        for path in self.paths:
+            if remaining <= 0:
+                break
+            try:
+                warmed = self.warm(path, remaining, buffer)
+            except OSError:
+                continue
+            remaining -= warmed
+            results.append((path, warmed))
+        self.signals.warmed.emit(results)
+
+    def warm(self, path, limit, buffer):
+        """Pede ao kernel para ler o arquivo antecipadamente; sem suporte, lê até o limite"""
+        with open(path, 'rb', buffering=0) as f:
+            size = min(os.fstat(f.fileno()).st_size, limit)
+            if hasattr(os, "posix_fadvise"):
+                # A leitura acontece em segundo plano no kernel, sem copiar para o processo
+                os.posix_fadvise(f.fileno(), 0, size, os.POSIX_FADV_WILLNEED)
+                return size
+            view = memoryview(buffer)
+            done = 0
+            while done < size:
+                read = f.readinto(view[:min(len(buffer), size - done)])
+                if not read:
+                    break
+                done += read
+            return done
+
+
+class Prefetcher(QtCore.QObject):
+    """Pré-aquece os executáveis dos atalhos mais prováveis quando a toolbar está ociosa.
+
+    Também mede o tempo até a criação do processo em execuções de arquivos
+    aquecidos e frios, para avaliar o ganho.
+    """
+
+    # Tempo em que um arquivo aquecido é considerado ainda no cache de páginas
+    WARM_TTL = 30 * 60
+
+    def __init__(self, usage, top_n=3, budget_mb=256, interval_s=120, parent=None):
+        super().__init__(parent)
+        self.usage = usage
+        self.interval = interval_s
+        self.top_n = top_n
+        self.budget_bytes = budget_mb * 1024 * 1024
+
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.running = False
+
+        # caminho -> horário do último aquecimento
+        self.warmed = {}
+
+        # Tempo até criar o processo (fila + Popen), em segundos
+        self.warm_times = deque(maxlen=500)
+        self.cold_times = deque(maxlen=500)
+
+        self.signals = PrefetchSignals()
+        self.signals.warmed.connect(self.on_warmed)
+
+        # Fonte dos atalhos candidatos e teste de ociosidade, definidos pela toolbar
+        self.shortcut_source = lambda: []
+        self.is_idle = lambda: True
+
+        # Sem intervalo fixo: a próxima passada é agendada só quando houver o que fazer
+        # (um arquivo esfriando ou o uso mudando), para não acordar a toolbar parada
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.prefetch)
+
+    def start(self, first_delay_ms=10000):
+        """Primeira pré-leitura logo após a inicialização"""
+        self.timer.start(first_delay_ms)
+
+    def schedule(self, delay_s):
+        """Agenda a próxima passada (a mais próxima prevalece)"""
+        delay_ms = int(max(delay_s, self.interval) * 1000)
+        if not self.timer.isActive() or self.timer.remainingTime() > delay_ms:
+            self.timer.start(delay_ms)
+
+    def schedule_expiry(self):
+        """Próxima passada quando o primeiro arquivo aquecido deixar de ser considerado quente"""
+        if self.warmed:
+            self.schedule(min(self.warmed.values()) + self.WARM_TTL - time.time())
+
+    def is_warm(self, path, now=None):
+        now = time.time() if now is None else now
+        warmed_at = self.warmed.get(path)
+        return warmed_at is not None and now - warmed_at < self.WARM_TTL
+
+    def prefetch(self):
+        """Agenda a pré-leitura dos atalhos mais prováveis que ainda não estão quentes"""
+        if self.running:
+            return
+        if not self.is_idle():
+            self.schedule(self.interval)
+            return
+        now = time.time()
+        paths = []
+        for shortcut in self.usage.top(self.shortcut_source(), self.top_n):
+            for path in [shortcut["exe"]] + list(shortcut.get("prefetch_files", [])):
+                if path not in paths and not self.is_warm(path, now):
+                    paths.append(path)
+        self.usage.save()
+        if not paths:
+            self.schedule_expiry()
+            return
+        self.running = True
+        self.pool.start(PrefetchTask(paths, self.budget_bytes, self.signals))
+
+    def on_warmed(self, results):
+        self.running = False
+        now = time.time()
+        for path, _ in results:
+            self.warmed[path] = now
+        self.schedule_expiry()
+
+    def record_launch(self, record):
+        """Conta o uso do atalho e separa o tempo de criação em aquecido ou frio"""
+        self.usage.record(record.exe, record.args)
+        if self.top_n > 0:
+            # A ordem dos mais usados pode ter mudado
+            self.schedule(self.interval)
+        spawn = record.queue_time + record.spawn_time
+        if self.is_warm(record.exe):
+            self.warm_times.append(spawn)
+        else:
+            self.cold_times.append(spawn)
+
+    def stats(self):
+        """Mediana do tempo até criar o processo (ms) para execuções aquecidas e frias"""
+        def summary(times):
+            return {
+                "launches": len(times),
+                "median_ms": statistics.median(times) * 1000 if times else None
+            }
+        return {"warm": summary(self.warm_times), "cold": summary(self.cold_times)}
+
+    def wait_for_done(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
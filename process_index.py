@@ -0,0 +1,116 @@
+import os
+import shutil
+
+
+class ProcessIndex:
+    """Índice dos processos em execução por (executável, argumentos), lido do /proc.
+
+    A atualização é incremental: a cada chamada só os pids novos têm o
+    cmdline lido, e os pids que sumiram são removidos. Dos pids indexados
+    desde a atualização anterior, o link exe é relido uma vez: se mudou, o
+    processo fez exec (ex.: visto entre o fork e o exec) e é indexado de
+    novo. A consulta de um atalho é uma busca em dicionário.
+    """
+
+    def __init__(self, proc_root="/proc"):
+        self.proc_root = proc_root
+        self.by_pid = {}  # pid -> (destino do link exe, chaves do processo)
+        self.by_key = {}  # (executável real, argumentos) -> pids
+        self.resolved = {}  # exe do atalho -> caminho real (evita resolver a cada consulta)
+        self.unconfirmed = set()  # pids indexados desde a última atualização (podem ainda fazer exec)
+
+    def supported(self):
+        return os.path.isdir(os.path.join(self.proc_root, "self"))
+
+    def shortcut_key(self, exe, args):
+        """Chave de busca de um atalho"""
+        path = self.resolved.get(exe)
+        if path is None:
+            found = exe if os.path.dirname(exe) else shutil.which(exe) or exe
+            path = self.resolved[exe] = os.path.realpath(found)
+        return (path, tuple(args))
+
+    def exe_target(self, pid):
+        """Destino do link exe, ou None (sem permissão ou processo encerrado)"""
+        try:
+            return os.readlink(os.path.join(self.proc_root, str(pid), "exe"))
+        except OSError:
+            return None  # Sem permissão para ler o link de processos de outros usuários
+
+    def process_keys(self, pid, exe):
+        """Chaves de um processo: pelo link exe e pelo argv[0] (scripts e outros usuários)"""
+        try:
+            with open(os.path.join(self.proc_root, str(pid), "cmdline"), 'rb') as f:
+                argv = f.read().split(b"\0")
+        except OSError:
+            return ()
+        if argv and argv[-1] == b"":
+            argv.pop()
+        if not argv:
+            return ()  # Thread do kernel ou processo em encerramento
+
+        argv = [os.fsdecode(arg) for arg in argv]
+        args = tuple(argv[1:])
+        keys = set()
+        if exe is not None:
+            keys.add((exe, args))
+        if os.path.isabs(argv[0]):
+            keys.add((os.path.realpath(argv[0]), args))
+        return tuple(keys)
+
+    def add_pid(self, pid, exe=None):
+        """Indexa um processo (ex.: recém-criado pela toolbar)"""
+        if pid in self.by_pid:
+            return
+        if exe is None:
+            exe = self.exe_target(pid)
+        keys = self.process_keys(pid, exe)
+        self.by_pid[pid] = (exe, keys)
+        self.unconfirmed.add(pid)
+        for key in keys:
+            self.by_key.setdefault(key, set()).add(pid)
+
+    def remove_pid(self, pid):
+        self.unconfirmed.discard(pid)
+        _, keys = self.by_pid.pop(pid, (None, ()))
+        for key in keys:
+            pids = self.by_key.get(key)
+            if pids is not None:
+                pids.discard(pid)
+                if not pids:
+                    del self.by_key[key]
+
+    def refresh(self):
+        """Atualiza o índice; retorna True se algum processo entrou ou saiu"""
+        try:
+            current = {int(name) for name in os.listdir(self.proc_root) if name.isdigit()}
+        except OSError:
+            return False
+        known = self.by_pid.keys()
+        gone = known - current
+        new = current - known
+        for pid in gone:
+            self.remove_pid(pid)
+
+        # Só os pids indexados na atualização anterior (ou adicionados depois
+        # dela) podem ter sido vistos antes do exec; os outros não são relidos
+        recent, self.unconfirmed = self.unconfirmed, set()
+        changed = []
+        for pid in recent:
+            target = self.exe_target(pid)
+            if target is not None and target != self.by_pid[pid][0]:
+                changed.append((pid, target))
+        for pid, target in changed:
+            self.remove_pid(pid)
+            self.add_pid(pid, target)
+
+        for pid in new:
+            self.add_pid(pid)
+        return bool(gone or new or changed)
+
+    def running_pids(self, exe, args):
+        """Pids em execução para o executável e os argumentos do atalho"""
+        return self.by_key.get(self.shortcut_key(exe, args), set())
+
+    def is_running(self, exe, args):
+        return bool(self.running_pids(exe, args))
@@ -0,0 +1,176 @@
+import os
+import time
+from collections import deque
+from PyQt5 import QtCore
+
+
+class ResourceHistory:
+    """Amostras recentes de CPU e memória de um processo e seus descendentes"""
+
+    __slots__ = ("cpu", "rss", "last_ticks", "last_time")
+
+    def __init__(self, size):
+        self.cpu = deque(maxlen=size)  # % de um núcleo
+        self.rss = deque(maxlen=size)  # bytes
+        self.last_ticks = None
+        self.last_time = None
+
+    def latest(self):
+        """(CPU %, RSS em bytes) da última amostra, ou None"""
+        if not self.rss:
+            return None
+        return (self.cpu[-1] if self.cpu else 0.0, self.rss[-1])
+
+
+class ResourceSampler(QtCore.QObject):
+    """Amostra CPU e memória dos processos supervisionados (Linux, via /proc).
+
+    Em cada intervalo, uma única passada lê stat e statm de cada processo
+    supervisionado e de todos os seus descendentes. O custo da própria
+    amostragem é medido: se passar do limite, o intervalo aumenta. A
+    amostragem só roda enquanto alguém pode ver o resultado (ponteiro sobre a
+    toolbar ou janela de processos aberta), para não acordar a CPU à toa.
+    """
+
+    # pid raiz -> ResourceHistory, emitido após cada passada
+    sampled = QtCore.pyqtSignal(object)
+
+    def __init__(self, supervisor, interval_ms=2000, history_size=60, max_cost_percent=1.0,
+                 proc_root="/proc", parent=None):
+        super().__init__(parent)
+        self.supervisor = supervisor
+        self.proc_root = proc_root
+        self.history_size = history_size
+        self.base_interval = interval_ms
+        self.max_interval = interval_ms * 8
+        self.max_cost = max_cost_percent / 100  # fração do intervalo gasta amostrando
+
+        self.clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self.page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+        # pid raiz -> histórico
+        self.histories = {}
+
+        # Custo da amostragem (tempo de CPU da thread da interface, em segundos)
+        self.last_cost = 0.0
+        self.costs = deque(maxlen=30)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.sample)
+        self.watched = False
+
+    def supported(self):
+        return os.path.isdir(os.path.join(self.proc_root, "self"))
+
+    def start(self):
+        """Liga a amostragem (só roda enquanto houver processos supervisionados e alguém olhando)"""
+        if self.watched and self.supported() and not self.timer.isActive():
+            self.timer.start()
+
+    def set_watched(self, watched):
+        """Retoma (com uma amostra imediata) ou pausa a amostragem"""
+        if watched == self.watched:
+            return
+        self.watched = watched
+        if not watched:
+            self.timer.stop()
+        elif self.supervisor.running and self.supported():
+            self.sample()
+            self.start()
+
+    def read_stat(self, pid):
+        """(ppid, utime + stime em ticks) de um processo"""
+        with open(f"{self.proc_root}/{pid}/stat", 'rb') as f:
+            data = f.read()
+        # O nome do processo pode conter espaços e parênteses: começa após o último ")"
+        fields = data[data.rindex(b")") + 2:].split()
+        return int(fields[1]), int(fields[11]) + int(fields[12])
+
+    def read_rss(self, pid):
+        with open(f"{self.proc_root}/{pid}/statm", 'rb') as f:
+            return int(f.read().split()[1]) * self.page_size
+
+    def scan(self):
+        """Uma leitura do stat de cada processo: (ppid -> pids filhos, pid -> ticks de CPU)"""
+        children = {}
+        ticks = {}
+        for name in os.listdir(self.proc_root):
+            if not name.isdigit():
+                continue
+            try:
+                ppid, cpu_ticks = self.read_stat(name)
+            except (OSError, ValueError, IndexError):
+                continue
+            pid = int(name)
+            children.setdefault(ppid, []).append(pid)
+            ticks[pid] = cpu_ticks
+        return children, ticks
+
+    def sample(self):
+        """Uma passada de amostragem para todos os processos supervisionados"""
+        roots = list(self.supervisor.running)
+        if not roots:
+            self.histories.clear()
+            self.timer.stop()
+            self.sampled.emit(self.histories)  # Limpa as dicas dos atalhos encerrados
+            return
+
+        start_cost = time.thread_time()
+        now = time.monotonic()
+
+        # A árvore de processos e os tempos de CPU vêm da mesma passada pelo /proc
+        children, process_ticks = self.scan()
+
+        for root in roots:
+            history = self.histories.get(root)
+            if history is None:
+                history = self.histories[root] = ResourceHistory(self.history_size)
+            ticks = 0
+            rss = 0
+            stack = [root]
+            while stack:
+                pid = stack.pop()
+                if pid not in process_ticks:
+                    continue
+                try:
+                    rss += self.read_rss(pid)
+                except (OSError, ValueError, IndexError):
+                    continue  # Terminou durante a leitura
+                ticks += process_ticks[pid]
+                stack.extend(children.get(pid, ()))
+
+            if history.last_ticks is not None:
+                elapsed = now - history.last_time
+                # Descendentes que terminaram levam seus ticks: nunca negativo
+                delta = max(0, ticks - history.last_ticks)
+                history.cpu.append(100.0 * delta / self.clock_ticks / elapsed if elapsed > 0 else 0.0)
+            history.rss.append(rss)
+            history.last_ticks = ticks
+            history.last_time = now
+
+        for pid in list(self.histories):
+            if pid not in self.supervisor.running:
+                del self.histories[pid]
+
+        self.last_cost = time.thread_time() - start_cost
+        self.costs.append(self.last_cost)
+        self.adjust_interval()
+        self.sampled.emit(self.histories)
+
+    def adjust_interval(self):
+        """Mantém o custo médio da amostragem abaixo do limite, espaçando as passadas"""
+        average = sum(self.costs) / len(self.costs)
+        interval = self.timer.interval()
+        if average > self.max_cost * interval / 1000 and interval < self.max_interval:
+            self.timer.setInterval(min(interval * 2, self.max_interval))
+        elif average < self.max_cost * self.base_interval / 4000 and interval > self.base_interval:
+            self.timer.setInterval(max(interval // 2, self.base_interval))
+
+    def stats(self):
+        """Custo da amostragem (ms) e intervalo atual"""
+        return {
+            "last_cost_ms": self.last_cost * 1000,
+            "average_cost_ms": sum(self.costs) / len(self.costs) * 1000 if self.costs else 0.0,
+            "interval_ms": self.timer.interval()
+        }
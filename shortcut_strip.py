@@ -0,0 +1,306 @@
+from PyQt5 import QtWidgets, QtCore, QtGui
+
+
+class StripCell:
+    """Uma célula da faixa: atalho direto ou categoria.
+
+    Expõe a mesma interface usada pela toolbar para atualizar os botões
+    (setIcon, setToolTip, menu), assim o mesmo código serve aos dois modos.
+    """
+
+    __slots__ = ("strip", "kind", "icon", "tooltip", "shortcut_data", "category_key",
+                 "fingerprint", "icon_source", "menu_built", "_menu", "index", "running")
+
+    def __init__(self, strip, kind):
+        self.strip = strip
+        self.kind = kind  # "shortcut" ou "category"
+        self.icon = QtGui.QIcon()
+        self.tooltip = ""
+        self.shortcut_data = None
+        self.category_key = None
+        self.fingerprint = None
+        self.icon_source = None
+        self.menu_built = False
+        self._menu = None
+        self.index = -1
+        self.running = False  # atalho com processo em execução
+
+    def setIcon(self, icon):
+        self.icon = icon
+        self.strip.update_cell(self)
+
+    def setToolTip(self, tooltip):
+        self.tooltip = tooltip
+
+    def menu(self):
+        """Menu da categoria, criado só quando for necessário"""
+        if self._menu is None:
+            self._menu = self.strip.menu_factory()
+        return self._menu
+
+    def release(self):
+        """Libera o menu da célula removida"""
+        if self._menu is not None:
+            self._menu.deleteLater()
+            self._menu = None
+
+
+class ShortcutStrip(QtWidgets.QWidget):
+    """Um único widget que desenha todos os atalhos da toolbar.
+
+    Substitui um QPushButton por atalho: desenha as células a partir dos
+    ícones em cache, faz o hit-test de cliques, passagem do ponteiro e dicas,
+    e pagina quando as células não cabem na largura disponível.
+    """
+
+    CELL_SIZE = 36
+    ICON_SIZE = 24
+    SPACING = 2
+    ARROW_WIDTH = 16
+    SEPARATOR_WIDTH = 5
+
+    # célula, posição global para abrir o menu
+    cell_clicked = QtCore.pyqtSignal(object, QtCore.QPoint)
+    cell_hovered = QtCore.pyqtSignal(object)
+
+    def __init__(self, menu_factory, parent=None):
+        super().__init__(parent)
+        self.menu_factory = menu_factory
+        self.cells = []
+        self.separator_index = 0  # índice da primeira célula após o separador
+        self.offset = 0  # primeira célula visível
+        self.max_width = 16777215
+        self.hover_index = -1
+        self.pressed_index = -1
+
+        self.setMouseTracking(True)
+        self.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+
+        self.cell_color = QtGui.QColor(70, 70, 70, 200)
+        self.hover_color = QtGui.QColor(90, 90, 90, 200)
+        self.pressed_color = QtGui.QColor(120, 120, 120, 200)
+        self.separator_color = QtGui.QColor(100, 100, 100, 150)
+        self.arrow_color = QtGui.QColor(200, 200, 200, 200)
+        self.running_color = QtGui.QColor(90, 170, 255)
+
+    def set_colors(self, colors):
+        """Aplica as cores do tema (dicionário de QColor por papel)"""
+        self.cell_color = colors["button"]
+        self.hover_color = colors["button_hover"]
+        self.pressed_color = colors["button_pressed"]
+        self.separator_color = colors["separator"]
+        self.arrow_color = colors["handle"]
+        self.running_color = colors["running"]
+        self.update()
+
+    def create_cell(self, kind):
+        """Cria uma célula ligada a esta faixa"""
+        return StripCell(self, kind)
+
+    def set_cells(self, cells, separator_index):
+        """Define as células exibidas (atalhos seguidos de categorias)"""
+        self.cells = cells
+        for index, cell in enumerate(cells):
+            cell.index = index
+        self.separator_index = separator_index
+        self.hover_index = -1
+        self.pressed_index = -1
+        self.offset = min(self.offset, max(0, len(cells) - self.visible_count()))
+        self.updateGeometry()
+        self.update()
+
+    def set_max_width(self, width):
+        """Largura máxima disponível; acima disso as células são paginadas"""
+        self.max_width = max(width, self.CELL_SIZE + 2 * self.ARROW_WIDTH)
+        self.offset = min(self.offset, max(0, len(self.cells) - self.visible_count()))
+        self.updateGeometry()
+        self.update()
+
+    def has_separator(self):
+        return 0 < self.separator_index < len(self.cells)
+
+    def content_width(self, count):
+        """Largura ocupada por um número de células"""
+        if count <= 0:
+            return 0
+        return count * self.CELL_SIZE + (count - 1) * self.SPACING
+
+    def is_paged(self):
+        """Indica se as células não cabem e precisam de paginação"""
+        extra = self.SEPARATOR_WIDTH if self.has_separator() else 0
+        return self.content_width(len(self.cells)) + extra > self.max_width
+
+    def visible_count(self):
+        """Quantidade de células que cabem na largura disponível"""
+        if not self.is_paged():
+            return len(self.cells)
+        available = self.max_width - 2 * self.ARROW_WIDTH - self.SEPARATOR_WIDTH
+        return max(1, (available + self.SPACING) // (self.CELL_SIZE + self.SPACING))
+
+    def sizeHint(self):
+        count = self.visible_count()
+        width = self.content_width(count)
+        if self.has_separator():
+            width += self.SEPARATOR_WIDTH
+        if self.is_paged():
+            width += 2 * self.ARROW_WIDTH
+        return QtCore.QSize(width, self.CELL_SIZE)
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def cell_rect(self, index):
+        """Retângulo de uma célula visível (ou vazio se estiver fora da página)"""
+        first = self.offset
+        if index < first or index >= first + self.visible_count():
+            return QtCore.QRect()
+        x = self.ARROW_WIDTH if self.is_paged() else 0
+        x += (index - first) * (self.CELL_SIZE + self.SPACING)
+        if self.has_separator() and first < self.separator_index <= index:
+            x += self.SEPARATOR_WIDTH
+        return QtCore.QRect(x, 0, self.CELL_SIZE, self.CELL_SIZE)
+
+    def index_at(self, pos):
+        """Hit-test: índice da célula sob a posição, ou -1"""
+        x = pos.x() - (self.ARROW_WIDTH if self.is_paged() else 0)
+        guess = self.offset + max(0, x) // (self.CELL_SIZE + self.SPACING)
+        # O separador desloca as células seguintes em menos de uma célula
+        for index in (guess - 1, guess):
+            if 0 <= index < len(self.cells) and self.cell_rect(index).contains(pos):
+                return index
+        return -1
+
+    def arrow_at(self, pos):
+        """-1 para a seta da esquerda, 1 para a da direita, 0 para nenhuma"""
+        if not self.is_paged():
+            return 0
+        if pos.x() < self.ARROW_WIDTH:
+            return -1
+        if pos.x() >= self.width() - self.ARROW_WIDTH:
+            return 1
+        return 0
+
+    def scroll_page(self, direction):
+        """Avança ou volta uma página de células"""
+        count = self.visible_count()
+        last_offset = max(0, len(self.cells) - count)
+        offset = min(max(self.offset + direction * count, 0), last_offset)
+        if offset != self.offset:
+            self.offset = offset
+            self.hover_index = -1
+            self.update()
+
+    def update_cell(self, cell):
+        """Redesenha só a área de uma célula"""
+        rect = self.cell_rect(cell.index)
+        if not rect.isNull():
+            self.update(rect)
+
+    def set_hover(self, index):
+        if index == self.hover_index:
+            return
+        previous = self.hover_index
+        self.hover_index = index
+        for changed in (previous, index):
+            if changed >= 0:
+                rect = self.cell_rect(changed)
+                if not rect.isNull():
+                    self.update(rect)
+        if index >= 0:
+            self.cell_hovered.emit(self.cells[index])
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(QtCore.Qt.NoPen)
+        exposed = event.rect()
+
+        count = self.visible_count()
+        for index in range(self.offset, min(self.offset + count, len(self.cells))):
+            rect = self.cell_rect(index)
+            if not rect.intersects(exposed):
+                continue
+            if index == self.pressed_index:
+                color = self.pressed_color
+            elif index == self.hover_index:
+                color = self.hover_color
+            else:
+                color = self.cell_color
+            painter.setBrush(color)
+            painter.drawRoundedRect(rect, 5, 5)
+
+            icon_rect = QtCore.QRect(0, 0, self.ICON_SIZE, self.ICON_SIZE)
+            icon_rect.moveCenter(rect.center())
+            self.cells[index].icon.paint(painter, icon_rect)
+
+            # Marca dos atalhos que já estão em execução
+            if self.cells[index].running:
+                painter.fillRect(QtCore.QRect(rect.left() + 8, rect.bottom() - 1,
+                                              rect.width() - 16, 2), self.running_color)
+
+        # Separador entre atalhos diretos e categorias
+        if self.has_separator() and self.offset < self.separator_index < self.offset + count:
+            x = self.cell_rect(self.separator_index).left() - (self.SEPARATOR_WIDTH + self.SPACING) // 2
+            painter.fillRect(QtCore.QRect(x, 4, 1, self.CELL_SIZE - 8), self.separator_color)
+
+        # Setas de paginação
+        if self.is_paged():
+            painter.setPen(self.arrow_color)
+            painter.drawText(QtCore.QRect(0, 0, self.ARROW_WIDTH, self.CELL_SIZE),
+                             QtCore.Qt.AlignCenter, "‹" if self.offset > 0 else "")
+            more = self.offset + count < len(self.cells)
+            painter.drawText(QtCore.QRect(self.width() - self.ARROW_WIDTH, 0,
+                                          self.ARROW_WIDTH, self.CELL_SIZE),
+                             QtCore.Qt.AlignCenter, "›" if more else "")
+
+        painter.end()
+
+    def event(self, event):
+        if event.type() == QtCore.QEvent.ToolTip:
+            index = self.index_at(event.pos())
+            if index >= 0 and self.cells[index].tooltip:
+                QtWidgets.QToolTip.showText(event.globalPos(), self.cells[index].tooltip,
+                                            self, self.cell_rect(index))
+            else:
+                QtWidgets.QToolTip.hideText()
+                event.ignore()
+            return True
+        return super().event(event)
+
+    def mouseMoveEvent(self, event):
+        self.set_hover(self.index_at(event.pos()))
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.set_hover(-1)
+        super().leaveEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() != QtCore.Qt.LeftButton:
+            super().mousePressEvent(event)
+            return
+        arrow = self.arrow_at(event.pos())
+        if arrow:
+            self.scroll_page(arrow)
+            return
+        self.pressed_index = self.index_at(event.pos())
+        if self.pressed_index >= 0:
+            self.update(self.cell_rect(self.pressed_index))
+
+    def mouseReleaseEvent(self, event):
+        if event.button() != QtCore.Qt.LeftButton or self.pressed_index < 0:
+            super().mouseReleaseEvent(event)
+            return
+        index = self.pressed_index
+        self.pressed_index = -1
+        self.update(self.cell_rect(index))
+        if self.index_at(event.pos()) == index:
+            rect = self.cell_rect(index)
+            self.cell_clicked.emit(self.cells[index], self.mapToGlobal(rect.bottomLeft()))
+
+    def wheelEvent(self, event):
+        if self.is_paged():
+            self.scroll_page(-1 if event.angleDelta().y() > 0 else 1)
+            event.accept()
+        else:
+            super().wheelEvent(event)
@@ -0,0 +1,204 @@
+"""Processo auxiliar que cria os processos dos atalhos (somente POSIX).
+
+O auxiliar é criado com fork no início da aplicação, antes de o Qt ser
+carregado, então tem um espaço de endereçamento pequeno. A toolbar envia os
+pedidos por um pipe (uma linha JSON por mensagem) e o auxiliar cria o
+processo com os.posix_spawn, respondendo com o pid. O auxiliar também
+recolhe os filhos e informa o código de saída de cada um.
+
+Mensagens da toolbar para o auxiliar:
+    {"id": 1, "exe": "/usr/bin/code", "args": ["/projeto"]}
+Mensagens do auxiliar para a toolbar:
+    {"id": 1, "pid": 1234, "error": null}
+    {"exit": 1234, "code": 0}
+"""
+import os
+import json
+import select
+import threading
+
+_client = None
+
+
+def supported():
+    return hasattr(os, "fork") and hasattr(os, "posix_spawn")
+
+
+def enabled_in(config_path):
+    """Lê settings.spawn_helper do arquivo de configuração sem carregar o Qt (ausente = desativado)"""
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return bool(json.load(f).get("settings", {}).get("spawn_helper", False))
+    except (OSError, ValueError, AttributeError):
+        return False
+
+
+def start():
+    """Cria o auxiliar; deve ser chamado antes de importar o Qt. Retorna o cliente ou None"""
+    global _client
+    if _client is not None or not supported():
+        return _client
+
+    # os.pipe cria descritores não herdáveis (O_CLOEXEC): os processos dos
+    # atalhos não herdam nada além de 0, 1 e 2, sem precisar fechar uma faixa de descritores
+    request_read, request_write = os.pipe()
+    response_read, response_write = os.pipe()
+    try:
+        pid = os.fork()
+    except OSError as e:
+        print(f"Erro ao iniciar o auxiliar de execução: {e}")
+        for fd in (request_read, request_write, response_read, response_write):
+            os.close(fd)
+        return None
+
+    if pid == 0:
+        os.close(request_write)
+        os.close(response_read)
+        try:
+            serve(request_read, response_write)
+        finally:
+            os._exit(0)
+
+    os.close(request_read)
+    os.close(response_write)
+    _client = SpawnHelperClient(pid, request_write, response_read)
+    return _client
+
+
+def client():
+    """Cliente do auxiliar em execução, ou None se ele não foi iniciado"""
+    return _client
+
+
+def serve(request_fd, response_fd):
+    """Laço principal do auxiliar"""
+    requests = os.fdopen(request_fd, 'rb', buffering=0)
+    children = set()
+    pending = b""
+
+    def send(message):
+        os.write(response_fd, (json.dumps(message) + "\n").encode())
+
+    def reap():
+        for pid in list(children):
+            try:
+                done, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                children.discard(pid)
+                continue
+            if done:
+                children.discard(pid)
+                send({"exit": pid, "code": os.waitstatus_to_exitcode(status)})
+
+    while True:
+        # Sem filhos vivos, espera o próximo pedido sem acordar
+        timeout = 0.5 if children else None
+        readable, _, _ = select.select([requests], [], [], timeout)
+        if readable:
+            data = requests.read(65536)
+            if not data:
+                break  # A toolbar fechou o pipe
+            pending += data
+            while b"\n" in pending:
+                line, pending = pending.split(b"\n", 1)
+                request = json.loads(line)
+                exe = request["exe"]
+                argv = [exe] + request["args"]
+                try:
+                    spawn = os.posix_spawn if os.path.dirname(exe) else os.posix_spawnp
+                    pid = spawn(exe, argv, os.environ)
+                    children.add(pid)
+                    send({"id": request["id"], "pid": pid, "error": None})
+                except OSError as e:
+                    send({"id": request["id"], "pid": None, "error": str(e)})
+        reap()
+
+
+class HelperProcess:
+    """Processo criado pelo auxiliar, com a mesma interface mínima de um Popen"""
+
+    def __init__(self, helper, pid):
+        self.helper = helper
+        self.pid = pid
+        self.returncode = None
+
+    def poll(self):
+        if self.returncode is None:
+            self.returncode = self.helper.take_exit_code(self.pid)
+        return self.returncode
+
+
+class SpawnHelperClient:
+    """Lado da toolbar: envia pedidos e recebe respostas em uma thread de leitura"""
+
+    def __init__(self, pid, request_fd, response_fd):
+        self.pid = pid
+        self.request_fd = request_fd
+        self.response_fd = response_fd
+        self.lock = threading.Lock()
+        self.next_id = 0
+        self.waiting = {}  # id do pedido -> [evento, resposta]
+        self.exit_codes = {}  # pid -> código de saída ainda não consultado
+        self.alive = True
+
+        self.reader = threading.Thread(target=self.read_responses, daemon=True)
+        self.reader.start()
+
+    def read_responses(self):
+        with os.fdopen(self.response_fd, 'rb') as responses:
+            for line in responses:
+                message = json.loads(line)
+                with self.lock:
+                    if "exit" in message:
+                        self.exit_codes[message["exit"]] = message["code"]
+                    else:
+                        slot = self.waiting.pop(message["id"], None)
+                        if slot is not None:
+                            slot[1] = message
+                            slot[0].set()
+        # Auxiliar encerrado: libera quem estiver esperando
+        with self.lock:
+            self.alive = False
+            for slot in self.waiting.values():
+                slot[0].set()
+            self.waiting.clear()
+
+    def spawn(self, exe, args, timeout=10):
+        """Cria um processo pelo auxiliar; levanta OSError em caso de falha"""
+        event = threading.Event()
+        slot = [event, None]
+        with self.lock:
+            if not self.alive:
+                raise OSError("auxiliar de execução encerrado")
+            self.next_id += 1
+            request_id = self.next_id
+            self.waiting[request_id] = slot
+            # A escrita fica dentro do lock para as linhas de threads diferentes não se misturarem
+            os.write(self.request_fd,
+                     (json.dumps({"id": request_id, "exe": exe, "args": list(args)}) + "\n").encode())
+
+        if not event.wait(timeout) or slot[1] is None:
+            with self.lock:
+                self.waiting.pop(request_id, None)
+            raise OSError("o auxiliar de execução não respondeu")
+        response = slot[1]
+        if response["error"] is not None:
+            raise OSError(response["error"])
+        return HelperProcess(self, response["pid"])
+
+    def take_exit_code(self, pid):
+        with self.lock:
+            return self.exit_codes.pop(pid, None)
+
+    def close(self):
+        """Fecha o pipe de pedidos; o auxiliar termina sozinho"""
+        global _client
+        if _client is self:
+            _client = None
+        if self.request_fd is not None:
+            os.close(self.request_fd)
+            self.request_fd = None
+        try:
+            os.waitpid(self.pid, 0)
+        except ChildProcessError:
+            pass
@@ -0,0 +1,122 @@
+import os
+import time
+from collections import deque
+from PyQt5 import QtCore
+
+
+class ChildProcess:
+    """Uma linha da tabela de processos iniciados pela toolbar"""
+
+    __slots__ = ("pid", "name", "exe", "args", "started", "start_clock", "exit_code", "runtime",
+                 "process")
+
+    def __init__(self, process, name, exe, args):
+        self.pid = process.pid
+        self.name = name
+        self.exe = exe
+        self.args = tuple(args)
+        self.started = time.time()  # horário de início (para exibição)
+        self.start_clock = time.monotonic()
+        self.exit_code = None
+        self.runtime = None  # segundos, preenchido quando o processo termina
+        self.process = process
+
+    def running(self):
+        return self.exit_code is None
+
+    def elapsed(self):
+        """Tempo de execução até agora (ou total, se já terminou)"""
+        if self.runtime is not None:
+            return self.runtime
+        return time.monotonic() - self.start_clock
+
+
+class ProcessSupervisor(QtCore.QObject):
+    """Guarda os processos iniciados pela toolbar e os recolhe quando terminam.
+
+    A varredura usa Popen.poll(), que faz waitpid(WNOHANG) no POSIX: o processo
+    que terminou é recolhido sem bloquear e não fica zumbi. No Linux, cada
+    processo ganha um pidfd vigiado pelo laço de eventos, que só acorda quando
+    ele termina; o timer fica para os processos sem pidfd e só roda enquanto
+    houver algum deles. A lista de encerrados é limitada.
+    """
+
+    # ChildProcess que acabou de terminar
+    process_exited = QtCore.pyqtSignal(object)
+
+    def __init__(self, sweep_ms=1000, history_size=100, parent=None):
+        super().__init__(parent)
+
+        # pid -> processos ainda em execução
+        self.running = {}
+
+        # Processos encerrados mais recentes
+        self.finished = deque(maxlen=history_size)
+
+        self.sweep_timer = QtCore.QTimer(self)
+        self.sweep_timer.setInterval(sweep_ms)
+        self.sweep_timer.timeout.connect(self.sweep)
+
+        # pid -> QSocketNotifier do pidfd (dispara uma vez, quando o processo termina)
+        self.notifiers = {}
+
+    def adopt(self, process, name, exe, args=()):
+        """Passa a supervisionar um processo recém-criado"""
+        child = ChildProcess(process, name, exe, args)
+        self.running[child.pid] = child
+        if not self.watch_exit(child.pid) and not self.sweep_timer.isActive():
+            self.sweep_timer.start()
+        return child
+
+    def watch_exit(self, pid):
+        """Vigia o término do processo por um pidfd (Linux 5.3+); False se não for possível"""
+        if not hasattr(os, "pidfd_open"):
+            return False
+        try:
+            fd = os.pidfd_open(pid)
+        except OSError:
+            return False
+        notifier = QtCore.QSocketNotifier(fd, QtCore.QSocketNotifier.Read, self)
+        notifier.activated.connect(lambda _, p=pid: self.on_exit_notified(p))
+        self.notifiers[pid] = notifier
+        return True
+
+    def on_exit_notified(self, pid):
+        # O pidfd continua legível depois do término: desliga antes de varrer
+        self.release_notifier(pid)
+        self.sweep()
+
+    def release_notifier(self, pid):
+        notifier = self.notifiers.pop(pid, None)
+        if notifier is not None:
+            notifier.setEnabled(False)
+            os.close(int(notifier.socket()))
+            notifier.deleteLater()
+
+    def sweep(self):
+        """Recolhe os processos que terminaram, sem bloquear"""
+        for pid, child in list(self.running.items()):
+            exit_code = child.process.poll()
+            if exit_code is None:
+                continue
+            child.exit_code = exit_code
+            child.runtime = time.monotonic() - child.start_clock
+            child.process = None  # libera o Popen (e seus descritores)
+            del self.running[pid]
+            self.release_notifier(pid)
+            self.finished.append(child)
+            self.process_exited.emit(child)
+
+        # O timer só é necessário para os processos sem pidfd vigiado (inclusive os
+        # que avisaram o término antes de o código de saída estar disponível)
+        if any(pid not in self.notifiers for pid in self.running):
+            if not self.sweep_timer.isActive():
+                self.sweep_timer.start()
+        else:
+            self.sweep_timer.stop()
+
+    def table(self):
+        """Processos em execução seguidos dos encerrados (mais recentes primeiro)"""
+        self.sweep()
+        running = sorted(self.running.values(), key=lambda child: child.started, reverse=True)
+        return running + list(reversed(self.finished))
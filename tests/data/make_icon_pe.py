@@ -0,0 +1,147 @@
+"""Gera icons.exe: um PE mínimo (sem código) só com recursos de ícone.
+
+O grupo RT_GROUP_ICON tem três tamanhos: 16 e 32 pixels em DIB de 32 bits
+(como nos .ico clássicos) e 256 pixels em PNG (como nos ícones do Vista em
+diante). Cada tamanho tem uma cor própria, para o teste saber qual foi lido.
+
+Uso: python tests/data/make_icon_pe.py
+"""
+import os
+import struct
+import zlib
+
+RT_ICON = 3
+RT_GROUP_ICON = 14
+LANGUAGE = 0x409
+
+SECTION_RVA = 0x1000
+FILE_ALIGNMENT = 0x200
+SECTION_ALIGNMENT = 0x1000
+
+# (id do RT_ICON, tamanho, cor BGRA, formato)
+ICONS = [
+    (1, 16, (0, 0, 255, 255), "dib"),
+    (2, 32, (0, 255, 0, 255), "dib"),
+    (3, 256, (255, 0, 0, 255), "png"),
+]
+
+
+def align(value, alignment):
+    return (value + alignment - 1) // alignment * alignment
+
+
+def dib_icon(size, bgra):
+    """Imagem de ícone no formato do .ico: BITMAPINFOHEADER (altura dobrada), pixels e máscara"""
+    header = struct.pack("<IiiHHIIiiII", 40, size, size * 2, 1, 32, 0, 0, 0, 0, 0, 0)
+    pixels = bytes(bgra) * (size * size)
+    mask = b"\x00" * (align(size, 32) // 8 * size)
+    return header + pixels + mask
+
+
+def png_icon(size, bgra):
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data +
+                struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    blue, green, red, alpha = bgra
+    row = b"\x00" + bytes((red, green, blue, alpha)) * size
+    return (b"\x89PNG\r\n\x1a\n" +
+            chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 6, 0, 0, 0)) +
+            chunk(b"IDAT", zlib.compress(row * size, 9)) +
+            chunk(b"IEND", b""))
+
+
+def group_icon(images):
+    data = struct.pack("<HHH", 0, 1, len(images))
+    for icon_id, size, _, image in images:
+        dimension = size if size < 256 else 0
+        data += struct.pack("<BBBBHHIH", dimension, dimension, 0, 0, 1, 32, len(image), icon_id)
+    return data
+
+
+def resource_section(resources):
+    """Seção .rsrc com a árvore tipo -> id -> idioma; `resources` é {tipo: {id: dados}}"""
+    directory_size = 16
+    entry_size = 8
+    types = sorted(resources)
+
+    # Diretórios primeiro, depois as entradas de dados e por fim os dados
+    layout = []
+    offset = directory_size + entry_size * len(types)
+    name_dirs = {}
+    for resource_type in types:
+        name_dirs[resource_type] = offset
+        offset += directory_size + entry_size * len(resources[resource_type])
+    language_dirs = {}
+    for resource_type in types:
+        for resource_id in sorted(resources[resource_type]):
+            language_dirs[resource_type, resource_id] = offset
+            offset += directory_size + entry_size
+    data_entries = {}
+    for key in language_dirs:
+        data_entries[key] = offset
+        offset += 16
+    data_offsets = {}
+    for key in language_dirs:
+        offset = align(offset, 8)
+        data_offsets[key] = offset
+        offset += len(resources[key[0]][key[1]])
+
+    section = bytearray(offset)
+
+    def directory(at, ids, targets, subdirectory=True):
+        struct.pack_into("<IIHHHH", section, at, 0, 0, 0, 0, 0, len(ids))
+        for i, (entry_id, target) in enumerate(zip(ids, targets)):
+            flag = 0x80000000 if subdirectory else 0
+            struct.pack_into("<II", section, at + directory_size + i * entry_size, entry_id, target | flag)
+
+    directory(0, types, [name_dirs[t] for t in types])
+    for resource_type in types:
+        ids = sorted(resources[resource_type])
+        directory(name_dirs[resource_type], ids, [language_dirs[resource_type, i] for i in ids])
+    for key, at in language_dirs.items():
+        directory(at, [LANGUAGE], [data_entries[key]], subdirectory=False)
+    for key, at in data_entries.items():
+        data = resources[key[0]][key[1]]
+        struct.pack_into("<IIII", section, at, SECTION_RVA + data_offsets[key], len(data), 0, 0)
+        section[data_offsets[key]:data_offsets[key] + len(data)] = data
+    return bytes(section)
+
+
+def build_pe(section):
+    raw_size = align(len(section), FILE_ALIGNMENT)
+    image_size = SECTION_RVA + align(len(section), SECTION_ALIGNMENT)
+
+    dos_header = b"MZ" + b"\x00" * 58 + struct.pack("<I", 0x40)
+    file_header = struct.pack("<HHIIIHH", 0x14C, 1, 0, 0, 0, 224, 0x0102)
+    optional_header = struct.pack(
+        "<HBBIIIIIIIIIHHHHHHIIIIHHIIIIII",
+        0x10B, 1, 0, 0, raw_size, 0, 0, 0, 0, 0x400000, SECTION_ALIGNMENT, FILE_ALIGNMENT,
+        4, 0, 0, 0, 4, 0, 0, image_size, FILE_ALIGNMENT, 0, 2, 0,
+        0x100000, 0x1000, 0x100000, 0x1000, 0, 16)
+    directories = [(0, 0)] * 16
+    directories[2] = (SECTION_RVA, len(section))  # IMAGE_DIRECTORY_ENTRY_RESOURCE
+    optional_header += b"".join(struct.pack("<II", *entry) for entry in directories)
+    section_header = struct.pack("<8sIIIIIIHHI", b".rsrc", len(section), SECTION_RVA, raw_size,
+                                 FILE_ALIGNMENT, 0, 0, 0, 0, 0x40000040)
+
+    headers = dos_header + b"PE\x00\x00" + file_header + optional_header + section_header
+    headers += b"\x00" * (FILE_ALIGNMENT - len(headers))
+    return headers + section + b"\x00" * (raw_size - len(section))
+
+
+def main():
+    images = [(icon_id, size, color, dib_icon(size, color) if kind == "dib" else png_icon(size, color))
+              for icon_id, size, color, kind in ICONS]
+    resources = {
+        RT_ICON: {icon_id: image for icon_id, _, _, image in images},
+        RT_GROUP_ICON: {1: group_icon(images)},
+    }
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons.exe")
+    with open(path, "wb") as output:
+        output.write(build_pe(resource_section(resources)))
+    print(f"Gravado {path}")
+
+
+if __name__ == '__main__':
+    main()
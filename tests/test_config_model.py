@@ -0,0 +1,113 @@
+import os
+import sys
+import json
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_model import ConfigModel, Shortcut  # noqa: E402
+
+
+def config():
+    """Arquivo editado à mão: os dois formatos, chaves desconhecidas, ausentes e fora de ordem"""
+    return {
+        "settings": {"theme": "dark"},
+        "quick_shortcuts": [
+            {"exe": "/usr/bin/code", "name": "Code", "args": ["/projeto"], "env": {"A": "1"}},
+            {"name": "Sem argumentos", "exe": "/bin/true"},
+        ],
+        "categories": {
+            "Antiga": [
+                {"name": "Godot", "exe": "/opt/godot", "args": ["--path", "/jogo"], "order": 2},
+            ],
+            "nova": {"shortcuts": [{"name": "Editor", "exe": "/bin/ed", "args": []}],
+                     "color": "#f00", "name": "Nova", "icon": "nova.png"},
+            "sem-nome": {"icon": "x.png"},
+            "dup-1": {"name": "Repetida", "shortcuts": []},
+            "dup-2": {"name": "Repetida", "shortcuts": []},
+        },
+        "workspaces": {"Jogo": {"shortcuts": []}},
+    }
+
+
+def dumped(data):
+    return json.dumps(data, ensure_ascii=False)
+
+
+class ConfigModelTest(unittest.TestCase):
+
+    def test_round_trip_is_identical(self):
+        original = config()
+        model = ConfigModel.from_config(original)
+        self.assertEqual(dumped(model.to_config(original)), dumped(config()))
+
+    def test_edit_keeps_unknown_keys_and_order(self):
+        original = config()
+        model = ConfigModel.from_config(original)
+        model.quick_shortcuts[0].update(name="VS Code", tooltip="", capture_output=False)
+        model.add_shortcut(model.category_named("Nova"), Shortcut("Novo", "/bin/novo", []))
+
+        result = model.to_config(original)
+        self.assertEqual(list(result["quick_shortcuts"][0]), ["exe", "name", "args", "env"])
+        self.assertEqual(result["quick_shortcuts"][0]["name"], "VS Code")
+        self.assertEqual(result["quick_shortcuts"][1], {"name": "Sem argumentos", "exe": "/bin/true"})
+        category = result["categories"]["nova"]
+        self.assertEqual(list(category), ["shortcuts", "color", "name", "icon"])
+        self.assertEqual([shortcut["name"] for shortcut in category["shortcuts"]], ["Editor", "Novo"])
+        self.assertEqual(result["categories"]["Antiga"][0]["order"], 2)
+
+    def test_missing_keys_stay_missing(self):
+        original = config()
+        model = ConfigModel.from_config(original)
+        self.assertEqual(model.category_named("sem-nome").name, "sem-nome")
+        result = model.to_config(original)
+        self.assertEqual(result["categories"]["sem-nome"], {"icon": "x.png"})
+
+    def test_rename_legacy_category(self):
+        original = config()
+        model = ConfigModel.from_config(original)
+        category = model.category_named("Antiga")
+        model.rename_category(category, "Jogos", "")
+
+        self.assertIsNone(model.category_named("Antiga"))
+        self.assertIs(model.category_named("Jogos"), category)
+        result = model.to_config(original)
+        # A chave (e a posição) não muda; o formato passa ao novo
+        self.assertEqual(list(result["categories"])[0], "Antiga")
+        self.assertEqual(result["categories"]["Antiga"], {
+            "name": "Jogos",
+            "shortcuts": [{"name": "Godot", "exe": "/opt/godot", "args": ["--path", "/jogo"], "order": 2}],
+        })
+
+    def test_duplicate_display_names(self):
+        model = ConfigModel.from_config(config())
+        self.assertEqual(model.by_name["Repetida"], ["dup-1", "dup-2"])
+        self.assertEqual(model.category_named("Repetida").key, "dup-1")
+
+        model.remove_category(model.categories["dup-1"])
+        self.assertEqual(model.category_named("Repetida").key, "dup-2")
+
+        model.rename_category(model.categories["dup-2"], "Única", "")
+        self.assertNotIn("Repetida", model.by_name)
+        self.assertEqual(model.by_name["Única"], ["dup-2"])
+
+    def test_new_category_is_written_in_full(self):
+        original = config()
+        model = ConfigModel.from_config(original)
+        category = model.add_category("Nova")
+        self.assertEqual(category.key, "Nova")
+        self.assertEqual(model.to_config(original)["categories"]["Nova"],
+                         {"name": "Nova", "icon": "", "shortcuts": []})
+
+    def test_ids_index_every_record(self):
+        model = ConfigModel.from_config(config())
+        category = model.category_named("Nova")
+        shortcut = category.shortcuts[0]
+        self.assertIs(model.by_id[category.id], category)
+        self.assertIs(model.by_id[shortcut.id], shortcut)
+        model.remove_category(category)
+        self.assertNotIn(shortcut.id, model.by_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtWidgets  # noqa: E402
+from idle_wakeups import audit_idle  # noqa: E402
+
+# Espera curta, mas depois dos timers de uma vez da inicialização (a primeira
+# pré-leitura, aos 10 s, e a gravação do índice de ícones)
+SETTLE_SECONDS = 12
+AUDIT_SECONDS = 10
+# Timer interno do QPixmapCache: envelhece as pixmaps da inicialização por
+# cerca de dois minutos e não é da toolbar
+QT_CACHE_TIMER = "QPMCache"
+
+
+class IdleWakeupsTest(unittest.TestCase):
+    """Toolbar parada: nenhum despertar, timer, pintura ou troca de estilo próprio"""
+
+    def test_idle_budget(self):
+        app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+        auditor = audit_idle(SETTLE_SECONDS, AUDIT_SECONDS)
+        report = "\n".join(auditor.report())
+
+        qt_cache = auditor.timers.pop(QT_CACHE_TIMER, 0)
+        self.assertEqual(dict(auditor.timers), {}, report)
+        self.assertEqual(dict(auditor.repaints), {}, report)
+        self.assertEqual(dict(auditor.restyles), {}, report)
+        self.assertLessEqual(auditor.wakeups - qt_cache, 0, report)
+
+
+if __name__ == '__main__':
+    unittest.main()
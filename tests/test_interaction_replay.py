@@ -0,0 +1,34 @@
+import os
+import sys
+import json
+import subprocess
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SESSION = os.path.join(ROOT, "tests", "data", "replay_session.json")
+# Folgado: pega travamentos (um passo que espera segundos), não variação de máquina
+BUDGET_MS = 2000
+
+
+class InteractionReplayTest(unittest.TestCase):
+    """Reproduz sem janela o roteiro gravado em tests/data (atalhos executam um Python vazio)"""
+
+    def test_replay_within_budget(self):
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+        result = subprocess.run(
+            [sys.executable, os.path.join(ROOT, "interaction_replay.py"), SESSION,
+             "--repeat", "1", "--budget-ms", str(BUDGET_MS)],
+            cwd=ROOT, env=env, capture_output=True, text=True, timeout=300)
+        output = result.stdout + result.stderr
+        self.assertEqual(result.returncode, 0, output)
+
+        # Todos os passos do roteiro foram reproduzidos e medidos
+        with open(SESSION, 'r', encoding='utf-8') as f:
+            steps = json.load(f)["steps"]
+        self.assertNotIn("não existe mais", output)
+        for index, step in enumerate(steps):
+            self.assertRegex(result.stdout, rf"(?m)^\s+{index} {step['op']}\s", output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import struct
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pe_icons  # noqa: E402
+
+try:
+    import pefile  # noqa: F401
+except ImportError:
+    pefile = None
+
+# Gerado por tests/data/make_icon_pe.py: grupo com 16 e 32 px (DIB) e 256 px (PNG)
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "icons.exe")
+
+
+def icon_size(data, kind):
+    """Largura da imagem extraída, lida do cabeçalho do .ico ou do PNG"""
+    if kind == "png":
+        return struct.unpack_from(">I", data, 16)[0]
+    width = struct.unpack_from("<B", data, 6)[0]
+    return width or 256
+
+
+@unittest.skipUnless(pefile, "requer pefile")
+class ExtractIconTest(unittest.TestCase):
+
+    def test_group_sizes(self):
+        pe = pefile.PE(SAMPLE, fast_load=True)
+        pe.parse_data_directories(directories=[
+            pefile.DIRECTORY_ENTRY["IMAGE_DIRECTORY_ENTRY_RESOURCE"]])
+        group = next(entry for entry in pe.DIRECTORY_ENTRY_RESOURCE.entries
+                     if entry.id == pe_icons.RT_GROUP_ICON)
+        data_entry = group.directory.entries[0].directory.entries[0].data.struct
+        entries = pe_icons.parse_group_icon(pe.get_data(data_entry.OffsetToData, data_entry.Size))
+        pe.close()
+        self.assertEqual([entry["width"] for entry in entries], [16, 32, 256])
+
+    def test_chosen_size(self):
+        # Menor tamanho >= alvo; acima do maior, o maior
+        for target, size, kind in [(16, 16, "ico"), (20, 32, "ico"), (32, 32, "ico"),
+                                   (48, 256, "png"), (256, 256, "png"), (512, 256, "png")]:
+            with self.subTest(target=target):
+                data, extracted_kind = pe_icons.extract_icon(SAMPLE, target)
+                self.assertEqual(extracted_kind, kind)
+                self.assertEqual(icon_size(data, kind), size)
+
+    def test_ico_has_single_image(self):
+        data, kind = pe_icons.extract_icon(SAMPLE, 32)
+        reserved, icon_type, count = struct.unpack_from("<HHH", data, 0)
+        image_size, image_offset = struct.unpack_from("<II", data, 14)
+        self.assertEqual((reserved, icon_type, count), (0, 1, 1))
+        self.assertEqual(image_offset + image_size, len(data))
+
+    def test_not_a_pe(self):
+        self.assertIsNone(pe_icons.extract_icon(__file__, 32))
+
+
+if __name__ == '__main__':
+    unittest.main()
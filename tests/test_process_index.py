@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import shutil
+import signal
+import subprocess
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from process_index import ProcessIndex  # noqa: E402
+
+SLEEP = shutil.which("sleep")
+
+
+@unittest.skipUnless(os.path.isdir("/proc/self") and SLEEP, "requer /proc e o comando sleep")
+class ProcessIndexTest(unittest.TestCase):
+    """Processos substitutos (sleep) no lugar dos programas dos atalhos"""
+
+    def wait_until(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def test_detects_started_and_finished_process(self):
+        index = ProcessIndex()
+        index.refresh()
+        self.assertFalse(index.is_running("sleep", ["40"]))
+
+        child = subprocess.Popen([SLEEP, "40"])
+        try:
+            self.assertTrue(self.wait_until(lambda: (index.refresh(), index.is_running("sleep", ["40"]))[1]))
+            self.assertIn(child.pid, index.running_pids(SLEEP, ["40"]))
+            # Mesmo executável com outros argumentos é outro atalho
+            self.assertFalse(index.is_running("sleep", ["99"]))
+        finally:
+            child.kill()
+            child.wait()
+
+        index.refresh()
+        self.assertFalse(index.is_running("sleep", ["40"]))
+        self.assertNotIn(child.pid, index.by_pid)
+
+    def test_reindexes_process_seen_before_exec(self):
+        index = ProcessIndex()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            # Filho: espera o sinal do pai e só então faz o exec
+            try:
+                os.close(write_fd)
+                os.read(read_fd, 1)
+                os.execv(SLEEP, [SLEEP, "41"])
+            finally:
+                os._exit(1)
+
+        os.close(read_fd)
+        try:
+            # Visto entre o fork e o exec: ainda com o executável e os argumentos do pai
+            index.refresh()
+            self.assertIn(pid, index.by_pid)
+            self.assertFalse(index.is_running("/bin/sleep", ["41"]))
+
+            os.write(write_fd, b"x")
+            exe = os.path.realpath(SLEEP)
+            self.assertTrue(self.wait_until(lambda: index.exe_target(pid) == exe))
+
+            self.assertTrue(index.refresh())
+            self.assertTrue(index.is_running(SLEEP, ["41"]))
+            self.assertEqual(index.running_pids(SLEEP, ["41"]), {pid})
+        finally:
+            os.close(write_fd)
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+        index.refresh()
+        self.assertFalse(index.is_running(SLEEP, ["41"]))
+
+    def test_rechecks_exe_only_of_recent_pids(self):
+        index = ProcessIndex()
+        index.refresh()
+        index.refresh()  # Confirma o exe dos pids vistos na primeira leitura
+
+        child = subprocess.Popen([SLEEP, "43"])
+        try:
+            index.add_pid(child.pid)
+            recent = set(index.unconfirmed)
+            confirmed = index.by_pid.keys() - recent
+            read = set()
+            exe_target = index.exe_target
+            index.exe_target = lambda pid: read.add(pid) or exe_target(pid)
+            index.refresh()
+            self.assertIn(child.pid, read)
+            self.assertFalse(read & confirmed)
+        finally:
+            child.kill()
+            child.wait()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtWidgets  # noqa: E402
+from floating_toolbar import FloatingToolbar  # noqa: E402
+
+SLEEP = shutil.which("sleep")
+
+
+@unittest.skipUnless(os.path.isdir("/proc/self") and SLEEP, "requer /proc e o comando sleep")
+class ResourceTooltipTest(unittest.TestCase):
+    """Atalho aberto pela toolbar (sleep no lugar do programa) com a amostragem ligada"""
+
+    def setUp(self):
+        self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+        # Exceções nos slots do Qt vão para o excepthook (sem ele, o PyQt aborta o processo)
+        self.errors = []
+        sys.excepthook = lambda *exc_info: self.errors.append(exc_info[1])
+        self.work_dir = tempfile.mkdtemp()
+        config_path = os.path.join(self.work_dir, "toolbar_config.json")
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({"quick_shortcuts": [{"name": "Dormir", "exe": SLEEP, "args": ["42"]}],
+                       "categories": {},
+                       "settings": {"autostart": False, "launch_history": False, "prefetch_top_n": 0}}, f)
+        self.toolbar = FloatingToolbar(config_path)
+        self.toolbar.show()
+
+    def tearDown(self):
+        sys.excepthook = sys.__excepthook__
+        for child in list(self.toolbar.supervisor.running.values()):
+            child.process.kill()
+            child.process.wait()
+        self.toolbar.resource_sampler.set_watched(False)
+        self.toolbar.launcher.wait_for_done()
+        self.toolbar.icon_pipeline.wait_for_done()
+        self.toolbar.deleteLater()
+        self.app.processEvents()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def wait_until(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                return False
+            self.app.processEvents()
+            time.sleep(0.01)
+        return True
+
+    def test_tooltip_shows_usage_of_running_shortcut(self):
+        btn = next(iter(self.toolbar.shortcut_buttons.values()))
+        btn.click()
+        self.assertTrue(self.wait_until(lambda: self.toolbar.supervisor.running))
+
+        self.toolbar.resource_sampler.set_watched(True)
+        self.app.processEvents()
+
+        self.assertEqual(self.errors, [])
+        self.assertIn("Memória", btn.toolTip())
+        self.assertTrue(btn.toolTip().startswith("Dormir"))
+
+
+if __name__ == '__main__':
+    unittest.main()
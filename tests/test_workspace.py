@@ -0,0 +1,83 @@
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtWidgets  # noqa: E402
+from floating_toolbar import FloatingToolbar  # noqa: E402
+
+SLEEP = shutil.which("sleep")
+SH = shutil.which("sh")
+
+
+@unittest.skipUnless(os.path.isdir("/proc/self") and SLEEP and SH, "requer /proc, sleep e sh")
+class WorkspaceRunTest(unittest.TestCase):
+    """Abertura em lote com processos substitutos (sleep e sh) no lugar dos programas"""
+
+    def setUp(self):
+        self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+        self.work_dir = tempfile.mkdtemp()
+        config_path = os.path.join(self.work_dir, "toolbar_config.json")
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({"quick_shortcuts": [], "categories": {},
+                       "settings": {"autostart": False, "launch_history": False, "prefetch_top_n": 0}}, f)
+        self.toolbar = FloatingToolbar(config_path)
+
+    def tearDown(self):
+        for child in list(self.toolbar.supervisor.running.values()):
+            if hasattr(child.process, "kill"):
+                child.process.kill()
+                child.process.wait()
+        for captured in self.toolbar.output_capture.processes:
+            captured.process.kill()
+            captured.process.waitForFinished()
+        self.toolbar.launcher.wait_for_done()
+        self.toolbar.icon_pipeline.wait_for_done()
+        self.toolbar.deleteLater()
+        self.app.processEvents()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def wait_until(self, condition, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                return False
+            self.app.processEvents()
+            time.sleep(0.005)
+        return True
+
+    def test_slots_held_until_settled(self):
+        shortcuts = [{"name": f"Dormir {i}", "exe": SLEEP, "args": [str(50 + i)]} for i in range(4)]
+        run = self.toolbar.launch_workspace("lote", shortcuts, concurrency=2, settle_ms=400)
+
+        self.assertTrue(self.wait_until(lambda: len(self.toolbar.supervisor.running) == 2))
+        # Os dois primeiros já foram criados, mas ainda ocupam as vagas
+        time.sleep(0.1)
+        self.app.processEvents()
+        self.assertEqual(len(self.toolbar.supervisor.running), 2)
+
+        self.assertTrue(self.wait_until(lambda: run.total_time is not None))
+        self.assertEqual(len(self.toolbar.supervisor.running), 4)
+        starts = [done for _, _, done in run.results]
+        self.assertGreaterEqual(starts[2] - starts[0], 0.3)
+
+    def test_capture_output_goes_to_output_console(self):
+        shortcuts = [{"name": "Eco", "exe": SH, "args": ["-c", "echo pronto; sleep 30"], "capture_output": True},
+                     {"name": "Dormir", "exe": SLEEP, "args": ["60"]}]
+        run = self.toolbar.launch_workspace("lote", shortcuts, concurrency=1, settle_ms=5000)
+
+        # A primeira saída libera a vaga antes do settle_ms: o segundo atalho começa logo
+        self.assertTrue(self.wait_until(lambda: len(run.results) == 2, timeout=4.0))
+        captured = [process for process in self.toolbar.output_capture.processes if process.name == "Eco"]
+        self.assertEqual(len(captured), 1)
+        self.assertTrue(self.wait_until(lambda: b"pronto" in captured[0].buffer.data()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+from functools import lru_cache
+from PyQt5 import QtWidgets, QtCore, QtGui
+
+
+# Cores de cada tema como (r, g, b, a)
+THEMES = {
+    "dark": {
+        "frame": (50, 50, 50, 255),
+        "border": (100, 100, 100, 200),
+        "button": (70, 70, 70, 200),
+        "button_hover": (90, 90, 90, 200),
+        "button_pressed": (120, 120, 120, 200),
+        "separator": (100, 100, 100, 150),
+        "menu": (60, 60, 60, 230),
+        "menu_text": (230, 230, 230, 255),
+        "menu_selected": (100, 100, 100, 200),
+        "handle": (200, 200, 200, 200),
+        "close": (170, 170, 170, 255),
+        "close_hover": (255, 77, 77, 255),
+        "gear": (200, 200, 200, 255),
+        "running": (90, 170, 255, 255)
+    },
+    "light": {
+        "frame": (235, 235, 235, 255),
+        "border": (160, 160, 160, 200),
+        "button": (255, 255, 255, 200),
+        "button_hover": (220, 220, 220, 220),
+        "button_pressed": (190, 190, 190, 220),
+        "separator": (150, 150, 150, 150),
+        "menu": (245, 245, 245, 240),
+        "menu_text": (30, 30, 30, 255),
+        "menu_selected": (200, 200, 200, 220),
+        "handle": (70, 70, 70, 200),
+        "close": (90, 90, 90, 255),
+        "close_hover": (255, 77, 77, 255),
+        "gear": (80, 80, 80, 255),
+        "running": (0, 110, 220, 255)
+    }
+}
+
+# Nomes exibidos no diálogo de configurações
+THEME_LABELS = {
+    "dark": "Escuro",
+    "light": "Claro"
+}
+
+DEFAULT_THEME = "dark"
+
+
+def theme_colors(theme_name):
+    """Cores do tema como QColor (temas desconhecidos usam o padrão)"""
+    theme = THEMES.get(theme_name, THEMES[DEFAULT_THEME])
+    return {role: QtGui.QColor(*rgba) for role, rgba in theme.items()}
+
+
+def rgba(color):
+    """Formata uma cor (r, g, b, a) para a folha de estilos"""
+    return f"rgba({color[0]}, {color[1]}, {color[2]}, {color[3]})"
+
+
+@lru_cache(maxsize=None)
+def compile_stylesheet(theme_name):
+    """Compila a folha de estilos da aplicação para um tema (uma vez por tema).
+
+    Os seletores ficam restritos à toolbar e aos menus de categoria para não
+    afetar os diálogos de configuração. O fundo da toolbar não faz parte da
+    folha: ele é pintado pelo OpacityFrame, assim mudar a opacidade não exige
+    reprocessar estilos.
+    """
+    theme = THEMES.get(theme_name, THEMES[DEFAULT_THEME])
+    return f"""
+        #toolbarFrame QPushButton {{
+            border: none;
+            border-radius: 5px;
+            padding: 5px;
+            background-color: {rgba(theme["button"])};
+        }}
+        #toolbarFrame QPushButton:hover {{
+            background-color: {rgba(theme["button_hover"])};
+        }}
+        #toolbarFrame QPushButton:pressed {{
+            background-color: {rgba(theme["button_pressed"])};
+        }}
+        #toolbarFrame QPushButton[running="true"] {{
+            border-bottom: 2px solid {rgba(theme["running"])};
+        }}
+        #toolbarFrame QPushButton#categoryButton::menu-indicator {{
+            width: 0px;
+            image: none;
+            subcontrol-position: right center;
+            subcontrol-origin: padding;
+            left: -2px;
+        }}
+        #toolbarFrame QFrame#toolbarSeparator {{
+            background-color: {rgba(theme["separator"])};
+        }}
+        #toolbarFrame #moveBtn {{
+            color: {rgba(theme["handle"])};
+            font-size: 16px;
+            font-weight: bold;
+        }}
+        #toolbarFrame #closeButton {{
+            background-color: transparent;
+            color: {rgba(theme["close"])};
+            font-weight: bold;
+            border: none;
+            padding: 0px;
+            min-width: 20px;
+            max-width: 20px;
+            min-height: 36px;
+            max-height: 36px;
+        }}
+        #toolbarFrame #closeButton:hover {{
+            background-color: {rgba(theme["close_hover"])};
+            color: white;
+            border-radius: 5px;
+        }}
+        QMenu#categoryMenu {{
+            background-color: {rgba(theme["menu"])};
+            border: 1px solid {rgba(theme["border"])};
+            border-radius: 5px;
+            padding: 5px;
+        }}
+        QMenu#categoryMenu::item {{
+            background-color: transparent;
+            padding: 5px 20px 5px 20px;
+            border-radius: 3px;
+            color: {rgba(theme["menu_text"])};
+        }}
+        QMenu#categoryMenu::item:selected {{
+            background-color: {rgba(theme["menu_selected"])};
+        }}
+        QMenu#categoryMenu::indicator {{
+            width: 0px;
+            height: 0px;
+        }}
+        QMenu#categoryMenu::right-arrow {{
+            width: 0px;
+            height: 0px;
+            padding: 0px;
+            margin: 0px;
+        }}
+    """
+
+
+def apply_theme(theme_name):
+    """Aplica a folha de estilos do tema na aplicação, se ainda não estiver aplicada"""
+    app = QtWidgets.QApplication.instance()
+    stylesheet = compile_stylesheet(theme_name)
+    # Folhas iguais: evita o reprocessamento de todos os widgets
+    if app.styleSheet() != stylesheet:
+        app.setStyleSheet(stylesheet)
+
+
+class OpacityFrame(QtWidgets.QFrame):
+    """Moldura arredondada que pinta o próprio fundo com a opacidade configurada.
+
+    A opacidade é uma propriedade Qt: alterá-la só repinta a moldura, sem
+    mexer em folhas de estilo nem repolir os widgets filhos.
+    """
+
+    def __init__(self, parent=None, radius=10):
+        super().__init__(parent)
+        self.radius = radius
+        self._opacity = 100
+        self.background = QtGui.QColor(50, 50, 50)
+        self.border = QtGui.QColor(100, 100, 100, 200)
+
+    def get_opacity(self):
+        return self._opacity
+
+    def set_opacity(self, opacity):
+        """Opacidade do fundo em porcentagem (0-100)"""
+        opacity = max(0, min(100, int(opacity)))
+        if opacity != self._opacity:
+            self._opacity = opacity
+            self.update()
+
+    opacity = QtCore.pyqtProperty(int, fget=get_opacity, fset=set_opacity)
+
+    def set_colors(self, background, border):
+        """Cores de fundo (sem alfa) e da borda"""
+        self.background = QtGui.QColor(background)
+        self.border = QtGui.QColor(border)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+
+        background = QtGui.QColor(self.background)
+        background.setAlpha(int(self._opacity * 255 / 100))
+        painter.setBrush(background)
+        painter.setPen(QtGui.QPen(self.border, 1))
+        painter.drawRoundedRect(QtCore.QRectF(self.rect()).adjusted(0.5, 0.5, -0.5, -0.5),
+                                self.radius, self.radius)
+        painter.end()
@@ -0,0 +1,175 @@
+"""Rastreamento dos trechos críticos da toolbar, exportado no formato trace_event do Chrome.
+
+Desligado, o custo é uma verificação de variável por chamada. Ligado
+(variável de ambiente TOOLBAR_TRACE ou opção --trace), os intervalos vão
+para um buffer circular pré-alocado e são gravados em JSON ao sair ou
+sob demanda; o arquivo abre em chrome://tracing ou no Perfetto.
+
+    TOOLBAR_TRACE=trace.json python floating_toolbar.py
+    python floating_toolbar.py --trace [trace.json]
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import functools
+from array import array
+
+DEFAULT_CAPACITY = 200000  # intervalos mantidos (os mais antigos são sobrescritos)
+EVENT_MIN_US = 100  # eventos do Qt mais rápidos que isso não são registrados
+
+enabled = False
+output_path = None
+
+# Buffer circular: colunas em arrays pré-alocados (sem objetos novos por intervalo)
+_names = []
+_args = []
+_starts = array('q')
+_durations = array('q')
+_threads = array('q')
+_next = 0
+_count = 0
+_origin = 0
+
+
+def enable(path=None, capacity=DEFAULT_CAPACITY):
+    """Liga o rastreamento; se `path` for dado, grava o arquivo ao sair"""
+    global enabled, output_path, _names, _args, _starts, _durations, _threads, _next, _count, _origin
+    _names = [None] * capacity
+    _args = [None] * capacity
+    _starts = array('q', bytes(8 * capacity))
+    _durations = array('q', bytes(8 * capacity))
+    _threads = array('q', bytes(8 * capacity))
+    _next = 0
+    _count = 0
+    _origin = time.perf_counter_ns()
+    output_path = path
+    enabled = True
+    if path:
+        atexit.register(dump)
+
+
+def enable_from_environment(argv=None):
+    """Liga o rastreamento por TOOLBAR_TRACE=<arquivo> ou --trace [<arquivo>] (removida de argv)"""
+    argv = sys.argv if argv is None else argv
+    default = os.path.join(os.path.dirname(os.path.abspath(__file__)), "toolbar_trace.json")
+    path = os.environ.get("TOOLBAR_TRACE", "").strip()
+    if path.lower() in ("", "0", "false", "no", "off"):
+        path = None
+    elif path.lower() in ("1", "true", "yes", "on"):
+        path = default
+    if "--trace" in argv:
+        index = argv.index("--trace")
+        del argv[index]
+        if index < len(argv) and not argv[index].startswith("-"):
+            path = argv.pop(index)
+        else:
+            path = path or default
+    if path:
+        enable(path)
+    return enabled
+
+
+def record(name, start_ns, end_ns, args=None):
+    """Guarda um intervalo já medido (relógio perf_counter_ns)"""
+    global _next, _count
+    index = _next
+    _names[index] = name
+    _args[index] = args
+    _starts[index] = start_ns - _origin
+    _durations[index] = end_ns - start_ns
+    _threads[index] = threading.get_ident()
+    _next = (index + 1) % len(_names)
+    if _count < len(_names):
+        _count += 1
+
+
+def traced(name=None):
+    """Decorador que mede cada chamada da função"""
+    def decorate(function):
+        label = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(label, start, time.perf_counter_ns())
+        return wrapper
+    return decorate
+
+
+def events():
+    """Intervalos guardados no formato trace_event (eventos completos, "ph": "X")"""
+    capacity = len(_names)
+    first = (_next - _count) % capacity if capacity else 0
+    pid = os.getpid()
+    result = []
+    for offset in range(_count):
+        index = (first + offset) % capacity
+        event = {
+            "name": _names[index],
+            "ph": "X",
+            "ts": _starts[index] / 1000,
+            "dur": _durations[index] / 1000,
+            "pid": pid,
+            "tid": _threads[index],
+        }
+        if _args[index]:
+            event["args"] = _args[index]
+        result.append(event)
+
+    # Nomes legíveis para as threads conhecidas
+    for thread in threading.enumerate():
+        result.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread.ident,
+                       "args": {"name": thread.name}})
+    return result
+
+
+def dump(path=None):
+    """Grava o rastreamento em JSON; retorna o caminho usado"""
+    path = path or output_path
+    if not enabled or not path:
+        return None
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events(), "displayTimeUnit": "ms"}, f)
+    except OSError as e:
+        print(f"Erro ao gravar o rastreamento: {e}")
+        return None
+    return path
+
+
+def tracing_application_class():
+    """Subclasse de QApplication que mede o despacho de cada evento do Qt.
+
+    Sobrescrever notify custa caro em Python, por isso a classe só é usada
+    com o rastreamento ligado.
+    """
+    from PyQt5 import QtWidgets, QtCore
+
+    event_names = {value: name for name, value in vars(QtCore.QEvent).items()
+                   if isinstance(value, QtCore.QEvent.Type)}
+    min_ns = EVENT_MIN_US * 1000
+
+    class TracingApplication(QtWidgets.QApplication):
+        def notify(self, receiver, event):
+            # O evento e o receptor podem ser destruídos no despacho (DeferredDelete):
+            # os dados são lidos antes
+            event_type = event.type()
+            receiver_class = type(receiver).__name__
+            start = time.perf_counter_ns()
+            try:
+                return super().notify(receiver, event)
+            finally:
+                end = time.perf_counter_ns()
+                if end - start >= min_ns:
+                    record("event:" + event_names.get(event_type, str(int(event_type))), start, end,
+                           {"receiver": receiver_class})
+
+    return TracingApplication
@@ -0,0 +1,107 @@
+import time
+from collections import Counter
+from PyQt5 import QtWidgets, QtCore
+
+# Eventos que, com a toolbar parada, indicam redesenho ou troca de estilo
+REPAINT_EVENTS = {QtCore.QEvent.Paint, QtCore.QEvent.UpdateRequest}
+RESTYLE_EVENTS = {QtCore.QEvent.StyleChange, QtCore.QEvent.PolishRequest, QtCore.QEvent.Polish,
+                  QtCore.QEvent.HoverEnter, QtCore.QEvent.HoverLeave, QtCore.QEvent.HoverMove,
+                  QtCore.QEvent.Enter, QtCore.QEvent.Leave}
+
+
+def describe(obj):
+    """Nome legível de quem recebeu o evento: o atributo do dono (ex. FloatingToolbar.running_timer)"""
+    try:
+        parent = obj.parent()
+    except RuntimeError:
+        return type(obj).__name__
+    if parent is not None:
+        for name, value in vars(parent).items():
+            if value is obj:
+                return f"{type(parent).__name__}.{name}"
+    # Objetos internos do Qt aparecem no Python como QObject: usa a classe C++
+    class_name = obj.metaObject().className()
+    name = obj.objectName()
+    if name:
+        return f"{class_name}#{name}"
+    if parent is not None:
+        return f"{class_name} em {parent.metaObject().className()}"
+    return class_name
+
+
+class WakeupAuditor(QtCore.QObject):
+    """Conta o que acorda o laço de eventos enquanto a toolbar está parada.
+
+    Os despertares vêm do sinal awake do QAbstractEventDispatcher; disparos
+    de timer, pinturas e trocas de estilo vêm de um filtro de eventos na
+    aplicação e são atribuídos ao objeto responsável. O filtro tem custo
+    por evento: só é instalado durante a auditoria.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.app = QtWidgets.QApplication.instance()
+        self.dispatcher = QtCore.QAbstractEventDispatcher.instance()
+        self.reset()
+        self.active = False
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.wakeups = 0
+        self.timers = Counter()
+        self.repaints = Counter()
+        self.restyles = Counter()
+
+    def start(self):
+        if self.active:
+            return
+        self.reset()
+        self.dispatcher.awake.connect(self.on_awake)
+        self.app.installEventFilter(self)
+        self.active = True
+
+    def stop(self):
+        if not self.active:
+            return
+        self.dispatcher.awake.disconnect(self.on_awake)
+        self.app.removeEventFilter(self)
+        self.active = False
+
+    def on_awake(self):
+        self.wakeups += 1
+
+    def eventFilter(self, obj, event):
+        event_type = event.type()
+        if event_type == QtCore.QEvent.Timer:
+            self.timers[describe(obj)] += 1
+        elif event_type in REPAINT_EVENTS:
+            self.repaints[describe(obj)] += 1
+        elif event_type in RESTYLE_EVENTS:
+            self.restyles[describe(obj)] += 1
+        return False
+
+    def minutes(self):
+        return max(time.monotonic() - self.started, 1e-6) / 60
+
+    def totals(self):
+        """Contagens por minuto desde o início da auditoria"""
+        minutes = self.minutes()
+        return {
+            "wakeups": self.wakeups / minutes,
+            "timers": sum(self.timers.values()) / minutes,
+            "repaints": sum(self.repaints.values()) / minutes,
+            "restyles": sum(self.restyles.values()) / minutes,
+        }
+
+    def report(self):
+        """Linhas do relatório: totais por minuto e os responsáveis"""
+        minutes = self.minutes()
+        totals = self.totals()
+        lines = [f"Auditoria de {minutes * 60:.0f} s: {totals['wakeups']:.1f} despertares/min, "
+                 f"{totals['timers']:.1f} timers/min, {totals['repaints']:.1f} pinturas/min, "
+                 f"{totals['restyles']:.1f} trocas de estilo/min"]
+        for title, counter in (("Timers", self.timers), ("Pinturas", self.repaints),
+                               ("Estilo/hover", self.restyles)):
+            for name, count in counter.most_common(10):
+                lines.append(f"  {title:<13} {count / minutes:8.1f}/min  {name}")
+        return lines
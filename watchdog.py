@@ -0,0 +1,126 @@
+import os
+import sys
+import time
+import threading
+import traceback
+from collections import deque
+from PyQt5 import QtCore
+
+# Frames deste diretório identificam o trecho da toolbar responsável pelo travamento
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Stall:
+    """Um travamento da thread da interface"""
+
+    __slots__ = ("started", "duration", "stack", "location")
+
+    def __init__(self, started, stack):
+        self.started = started  # horário (time.time) em que foi detectado
+        self.duration = None  # segundos, preenchido quando o laço de eventos volta
+        self.stack = stack  # traceback.StackSummary da thread da interface
+        self.location = self.culprit(stack)
+
+    @staticmethod
+    def culprit(stack):
+        """Frame mais interno do próprio projeto (ou o mais interno de todos)"""
+        for frame in reversed(stack):
+            if frame.filename.startswith(PROJECT_DIR) and not frame.filename.endswith("watchdog.py"):
+                return f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}"
+        if stack:
+            frame = stack[-1]
+            return f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}"
+        return "(desconhecido)"
+
+
+class StallWatchdog(QtCore.QObject):
+    """Detecta travamentos do laço de eventos da interface.
+
+    Um QTimer na thread da interface atualiza o horário do último batimento;
+    uma thread de vigia confere esse horário e, se o laço ficar parado mais
+    que o limite, copia a pilha Python da thread da interface com
+    sys._current_frames(). Quando o laço volta, o batimento seguinte fecha o
+    travamento com a duração total e atualiza o resumo dos piores trechos.
+    """
+
+    def __init__(self, threshold_ms=200, history_size=50, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.interval = max(0.025, self.threshold / 4)
+        self.main_thread = threading.main_thread().ident
+
+        # Escrito pela thread da interface, lido pela vigia (atribuições atômicas)
+        self.last_beat = time.monotonic()
+        # Escrito pela vigia, consumido pela thread da interface
+        self.pending = None
+
+        self.stalls = deque(maxlen=history_size)
+        self.offenders = {}  # local -> [travamentos, tempo total, pior duração]
+
+        self.heartbeat = QtCore.QTimer(self)
+        self.heartbeat.setInterval(int(self.interval * 1000))
+        self.heartbeat.timeout.connect(self.beat)
+
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.last_beat = time.monotonic()
+        self.heartbeat.start()
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.watch, name="StallWatchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.heartbeat.stop()
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(1)
+            self.thread = None
+
+    def beat(self):
+        """Batimento na thread da interface; fecha o travamento em andamento, se houver"""
+        now = time.monotonic()
+        stall = self.pending
+        if stall is not None:
+            self.pending = None
+            # O travamento começou em algum momento do intervalo após o último batimento
+            stall.duration = now - self.last_beat - self.interval / 2
+            self.finish(stall)
+        self.last_beat = now
+
+    def watch(self):
+        """Laço da thread de vigia"""
+        while not self.stopped.wait(self.interval):
+            if self.pending is not None:
+                continue  # Já registrado; espera o laço de eventos voltar
+            stalled = time.monotonic() - self.last_beat - self.interval
+            if stalled < self.threshold:
+                continue
+            frame = sys._current_frames().get(self.main_thread)
+            if frame is None:
+                continue
+            stall = Stall(time.time(), traceback.extract_stack(frame))
+            self.pending = stall
+            print(f"Interface travada há {stalled * 1000:.0f} ms em {stall.location}:\n"
+                  + "".join(stall.stack.format()), end="")
+
+    def finish(self, stall):
+        """Registra a duração final e atualiza o resumo"""
+        self.stalls.append(stall)
+        entry = self.offenders.setdefault(stall.location, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += stall.duration
+        entry[2] = max(entry[2], stall.duration)
+        print(f"Travamento de {stall.duration * 1000:.0f} ms em {stall.location}")
+        for line in self.summary(5):
+            print("  " + line)
+
+    def worst(self, count=10):
+        """Trechos com mais tempo travado: (local, travamentos, total, pior)"""
+        ranked = sorted(self.offenders.items(), key=lambda item: item[1][1], reverse=True)
+        return [(location, n, total, worst) for location, (n, total, worst) in ranked[:count]]
+
+    def summary(self, count=10):
+        return [f"{total * 1000:8.0f} ms em {n:3} travamento(s), pior {worst * 1000:.0f} ms: {location}"
+                for location, n, total, worst in self.worst(count)]
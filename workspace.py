@@ -0,0 +1,167 @@
+import time
+from PyQt5 import QtCore
+
+
+class WorkspaceRun(QtCore.QObject):
+    """Abre vários atalhos de uma vez, com limite de aberturas simultâneas.
+
+    No máximo `concurrency` atalhos ocupam uma vaga ao mesmo tempo. A vaga
+    não é liberada quando o processo é criado (isso leva milissegundos), e
+    sim quando ele assenta: primeira saída (atalhos com "capture_output"),
+    término, ou `settle_ms` depois de criado. Assim os programas não
+    disputam o disco ao carregar. `stagger_ms` dá um intervalo opcional
+    entre um início e o próximo. Atalhos com a chave "order" são abertos em
+    ordem crescente; os com "capture_output" passam pelo `output_capture`,
+    como num clique.
+    """
+
+    # A própria execução, quando todos os atalhos foram processados
+    finished = QtCore.pyqtSignal(object)
+
+    def __init__(self, name, shortcuts, launcher, output_capture, supervisor,
+                 concurrency=2, stagger_ms=0, settle_ms=1500, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.launcher = launcher
+        self.output_capture = output_capture
+        self.supervisor = supervisor
+        self.concurrency = max(1, concurrency)
+        self.settle_ms = settle_ms
+
+        # sorted é estável: sem "order", mantém a ordem da configuração
+        self.queue = sorted(shortcuts, key=lambda shortcut: shortcut.get("order", 0))
+        self.queue.reverse()  # pop() do fim é O(1)
+
+        self.active = {}  # registro do Launcher ou CapturedProcess -> atalho (vaga ocupada)
+        self.holds = {}  # processo criado -> timer de settle_ms
+        self.early_output = set()  # saída lida antes do aviso de início (a ordem não é garantida)
+        self.results = []  # (atalho, situação, início em segundos desde a abertura do lote)
+        self.start_clock = None
+        self.total_time = None
+
+        self.stagger_timer = QtCore.QTimer(self)
+        self.stagger_timer.setSingleShot(True)
+        self.stagger_timer.setInterval(stagger_ms)
+        self.stagger_timer.timeout.connect(self.pump)
+
+    def start(self):
+        self.start_clock = time.perf_counter()
+        self.launcher.launched.connect(self.on_launched)
+        self.launcher.launch_failed.connect(self.on_launch_failed)
+        self.supervisor.process_exited.connect(self.on_process_exited)
+        self.pump()
+
+    def pump(self):
+        """Inicia os próximos atalhos enquanto houver vaga"""
+        while self.queue and len(self.active) < self.concurrency:
+            if self.stagger_timer.isActive():
+                return
+            shortcut = self.queue.pop()
+            if shortcut.get("capture_output", False):
+                captured = self.output_capture.start(shortcut["name"], shortcut["exe"], shortcut["args"])
+                if captured.returncode is not None:
+                    # O QProcess pode avisar a falha ainda dentro do start
+                    self.results.append((shortcut, f"erro: {captured.process.errorString()}",
+                                         self.elapsed()))
+                    continue
+                captured.started.connect(self.on_captured_started)
+                captured.first_output.connect(self.on_captured_output)
+                captured.failed.connect(self.on_captured_failed)
+                self.active[captured] = shortcut
+            else:
+                record = self.launcher.launch(shortcut["exe"], shortcut["args"], shortcut["name"])
+                if record is None:
+                    # Já estava sendo aberto: agrupado pelo Launcher
+                    self.results.append((shortcut, "já estava abrindo", self.elapsed()))
+                    continue
+                self.active[record] = shortcut
+            if self.stagger_timer.interval() > 0 and self.queue:
+                self.stagger_timer.start()
+        self.check_finished()
+
+    def on_launched(self, record):
+        shortcut = self.active.get(record)
+        if shortcut is None:
+            return  # Execução de outro atalho
+        self.results.append((shortcut, f"pid {record.pid}, fila {record.queue_time * 1000:.1f} ms, "
+                                       f"criação {record.spawn_time * 1000:.1f} ms", self.elapsed()))
+        self.hold(record)
+
+    def on_launch_failed(self, record):
+        shortcut = self.active.get(record)
+        if shortcut is None:
+            return
+        self.results.append((shortcut, f"erro: {record.error}", self.elapsed()))
+        self.release(record)
+
+    def on_captured_started(self, captured):
+        shortcut = self.active.get(captured)
+        if shortcut is None:
+            return
+        self.results.append((shortcut, f"pid {captured.pid}, saída capturada, "
+                                       f"criação {captured.spawn_time * 1000:.1f} ms", self.elapsed()))
+        if captured in self.early_output:
+            self.early_output.discard(captured)
+            self.release(captured)
+        else:
+            self.hold(captured)
+
+    def on_captured_output(self, captured):
+        if captured in self.holds:
+            self.release(captured)
+        elif captured in self.active:
+            self.early_output.add(captured)
+
+    def on_captured_failed(self, captured, error):
+        shortcut = self.active.get(captured)
+        if shortcut is None:
+            return
+        self.results.append((shortcut, f"erro: {error}", self.elapsed()))
+        self.release(captured)
+
+    def on_process_exited(self, child):
+        for item in self.holds:
+            if item.pid == child.pid:
+                self.release(item)
+                return
+
+    def hold(self, item):
+        """Mantém a vaga do processo criado por até settle_ms"""
+        if self.settle_ms <= 0:
+            self.release(item)
+            return
+        timer = QtCore.QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self.release(item))
+        self.holds[item] = timer
+        timer.start(self.settle_ms)
+
+    def release(self, item):
+        """Libera a vaga (processo assentado ou falha) e inicia o próximo atalho"""
+        timer = self.holds.pop(item, None)
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+        if self.active.pop(item, None) is not None:
+            self.pump()
+
+    def check_finished(self):
+        if self.queue or self.active or self.total_time is not None:
+            return
+        self.total_time = self.elapsed()
+        self.launcher.launched.disconnect(self.on_launched)
+        self.launcher.launch_failed.disconnect(self.on_launch_failed)
+        self.supervisor.process_exited.disconnect(self.on_process_exited)
+        self.finished.emit(self)
+
+    def elapsed(self):
+        return time.perf_counter() - self.start_clock
+
+    def report(self):
+        """Resumo com o início de cada atalho e o tempo total (até o último assentar)"""
+        lines = [f"Espaço de trabalho '{self.name}':"]
+        for shortcut, status, done in self.results:
+            lines.append(f"  {shortcut['name']}: {done * 1000:.1f} ms ({status})")
+        if self.total_time is not None:
+            lines.append(f"  Total: {self.total_time * 1000:.1f} ms")
+        return "\n".join(lines)